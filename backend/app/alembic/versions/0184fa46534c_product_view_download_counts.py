@@ -0,0 +1,45 @@
+"""Write-behind view and download counters on products
+
+Revision ID: 0184fa46534c
+Revises: 28c5f229bb09
+Create Date: 2026-10-19 10:10:00.000000
+
+``products.view_count`` and ``products.download_count`` are flushed from
+``app.core.counters``.  There is no history to backfill them from, so they
+start at zero.  Columns are only added when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0184fa46534c'
+down_revision: Union[str, Sequence[str], None] = '28c5f229bb09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def new_columns() -> tuple:
+    return (
+        sa.Column('view_count', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('download_count', sa.Integer(), server_default='0', nullable=True),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('products')}
+
+    for column in new_columns():
+        if column.name not in columns:
+            op.add_column('products', column)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('products') as batch_op:
+        for column in reversed(new_columns()):
+            batch_op.drop_column(column.name)
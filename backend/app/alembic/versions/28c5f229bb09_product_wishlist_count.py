@@ -0,0 +1,42 @@
+"""Maintained wishlist counter on products
+
+Revision ID: 28c5f229bb09
+Revises: 7c3e9a1d5b42
+Create Date: 2026-10-19 10:00:00.000000
+
+``products.wishlist_count`` is kept up to date on wishlist add/remove.  It
+is backfilled from ``wishlists`` when that table already exists (it is
+created by ``create_all``).  The column is only added when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28c5f229bb09'
+down_revision: Union[str, Sequence[str], None] = '7c3e9a1d5b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('products')}
+
+    if 'wishlist_count' not in columns:
+        op.add_column('products', sa.Column('wishlist_count', sa.Integer(), server_default='0', nullable=True))
+
+    if inspector.has_table('wishlists'):
+        op.execute(
+            "UPDATE products SET wishlist_count = "
+            "(SELECT count(*) FROM wishlists WHERE wishlists.product_id = products.id)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('wishlist_count')
@@ -0,0 +1,40 @@
+"""Trending score on products
+
+Revision ID: 4f26d6c5c42f
+Revises: 0184fa46534c
+Create Date: 2026-10-19 10:20:00.000000
+
+``products.trending_score`` is updated incrementally by ``app.core.ranking``
+and indexed for the trending sort.  Scores start at zero and build up from
+new activity.  The column and index are only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f26d6c5c42f'
+down_revision: Union[str, Sequence[str], None] = '0184fa46534c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('products')}
+    indexes = {index['name'] for index in inspector.get_indexes('products')}
+
+    if 'trending_score' not in columns:
+        op.add_column('products', sa.Column('trending_score', sa.Float(), server_default='0', nullable=True))
+    if 'ix_products_trending_score' not in indexes:
+        op.create_index('ix_products_trending_score', 'products', ['trending_score'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_trending_score', table_name='products')
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('trending_score')
@@ -0,0 +1,92 @@
+"""Explicit seller application status with partial indexes
+
+Revision ID: 7c3e9a1d5b42
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+The application state used to be derived from ``role``, ``store_name`` and
+``is_seller_approved``.  It becomes a column of its own, backfilled from
+those derived states:
+
+- seller, approved                    -> approved
+- seller, not approved, store name    -> pending
+- seller, not approved, no store name -> rejected
+
+Applications rejected before this revision were wiped and their users
+reverted to buyers, so they cannot be told apart from users who never
+applied and stay NULL.  ``create_all`` may already have added the columns
+and indexes on a fresh database; they are only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1d5b42'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+status_enum = sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='sellerapplicationstatus')
+
+
+def new_columns() -> tuple:
+    return (
+        sa.Column('seller_application_status', status_enum, nullable=True),
+        sa.Column('seller_applied_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('seller_decided_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+PENDING = sa.text("seller_application_status = 'PENDING'")
+APPLIED = sa.text("seller_application_status IS NOT NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column['name'] for column in inspector.get_columns('users')}
+    indexes = {index['name'] for index in inspector.get_indexes('users')}
+
+    status_enum.create(bind, checkfirst=True)
+    for column in new_columns():
+        if column.name not in columns:
+            op.add_column('users', column)
+
+    op.execute(
+        "UPDATE users SET seller_application_status = 'APPROVED', seller_decided_at = updated_at "
+        "WHERE role = 'SELLER' AND is_seller_approved = true AND seller_application_status IS NULL"
+    )
+    op.execute(
+        "UPDATE users SET seller_application_status = 'PENDING', seller_applied_at = updated_at "
+        "WHERE role = 'SELLER' AND is_seller_approved = false AND store_name IS NOT NULL "
+        "AND seller_application_status IS NULL"
+    )
+    op.execute(
+        "UPDATE users SET seller_application_status = 'REJECTED', seller_decided_at = updated_at "
+        "WHERE role = 'SELLER' AND is_seller_approved = false AND store_name IS NULL "
+        "AND seller_application_status IS NULL"
+    )
+
+    if 'ix_users_seller_pending' not in indexes:
+        op.create_index(
+            'ix_users_seller_pending', 'users', ['seller_applied_at', 'id'],
+            postgresql_where=PENDING, sqlite_where=PENDING
+        )
+    if 'ix_users_seller_decided' not in indexes:
+        op.create_index(
+            'ix_users_seller_decided', 'users', ['seller_application_status', 'seller_decided_at'],
+            postgresql_where=APPLIED, sqlite_where=APPLIED
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_seller_decided', table_name='users')
+    op.drop_index('ix_users_seller_pending', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        for column in reversed(new_columns()):
+            batch_op.drop_column(column.name)
+    status_enum.drop(op.get_bind(), checkfirst=True)
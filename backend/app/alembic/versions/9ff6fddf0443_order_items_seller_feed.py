@@ -0,0 +1,58 @@
+"""Seller order feed: order item timestamps and a composite index
+
+Revision ID: 9ff6fddf0443
+Revises: 4f26d6c5c42f
+Create Date: 2026-10-19 10:30:00.000000
+
+Order items get a ``created_at`` copied from their order, so the seller
+order feed pages through one ``(seller_id, created_at, order_id)`` index.
+That index replaces the single-column ``seller_id`` one.  Existing rows are
+backfilled from ``orders.created_at``.  A database without ``order_items``
+gets the table with its final shape from ``create_all``; otherwise the
+column and index are only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9ff6fddf0443'
+down_revision: Union[str, Sequence[str], None] = '4f26d6c5c42f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('order_items'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('order_items')}
+    indexes = {index['name'] for index in inspector.get_indexes('order_items')}
+
+    if 'created_at' not in columns:
+        op.add_column('order_items', sa.Column('created_at', sa.DateTime(timezone=True), nullable=True))
+        op.execute(
+            "UPDATE order_items SET created_at = "
+            "(SELECT orders.created_at FROM orders WHERE orders.id = order_items.order_id)"
+        )
+        with op.batch_alter_table('order_items') as batch_op:
+            batch_op.alter_column(
+                'created_at', existing_type=sa.DateTime(timezone=True),
+                nullable=False, server_default=sa.func.now()
+            )
+
+    if 'ix_order_items_seller_created' not in indexes:
+        op.create_index('ix_order_items_seller_created', 'order_items', ['seller_id', 'created_at', 'order_id'])
+    if 'ix_order_items_seller_id' in indexes:
+        op.drop_index('ix_order_items_seller_id', table_name='order_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_order_items_seller_id', 'order_items', ['seller_id'])
+    op.drop_index('ix_order_items_seller_created', table_name='order_items')
+    with op.batch_alter_table('order_items') as batch_op:
+        batch_op.drop_column('created_at')
@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime, timezone
 
+from app.core import events, metrics
+from app.core.change_feed import PRODUCT, USER, publish_products, record_change
+from app.core.jobs import enqueue, enqueue_many, job_runner, queue_stats
 from app.core.database import get_db
-from app.models.user import User, UserRole
+from app.core.load_profiles import load_profile
+from app.models.product import Product, ProductStatus
+from app.models.user import SellerApplicationStatus, User, UserRole
+from app.schemas.product import ProductBulkStatusRequest, ProductBulkStatusResult
 from app.schemas.seller import (
     SellerApplicationResponse, 
     SellerApprovalRequest,
+    SellerApplicationStatus as SellerApplicationStatusSchema,
+    SellerBulkDecisionRequest,
+    SellerBulkDecisionResult,
     SellerProfile
 )
 from app.api.auth import get_current_user
+from app.api.sellers import application_response
+from app.core.responses import fast_response
+from app.core.suggest import rebuild_suggest_index, suggest_index
+from app.core.notifications import SELLER_DECISION_JOB
+from app.core.orphan_files import SWEEP_ORPHANS_JOB, sweep_orphan_files
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Rows one bulk moderation request changes at most; a filter matching more is sent again
+MODERATION_BATCH = 10_000
+
 def get_admin_user(current_user: User = Depends(get_current_user)):
     """Dependency to ensure user is admin"""
     if current_user.role != UserRole.ADMIN:
@@ -24,47 +43,31 @@ def get_admin_user(current_user: User = Depends(get_current_user)):
 
 @router.get("/sellers", response_model=List[SellerApplicationResponse])
 def list_seller_applications(
-    status: Optional[str] = Query(None, description="Filter by status: pending, approved, rejected"),
+    status: Optional[SellerApplicationStatusSchema] = Query(None, description="Filter by status: pending, approved, rejected"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List all seller applications (admin only)"""
+    """List seller applications, the pending queue oldest first (admin only)"""
     
-    query = db.query(User).filter(User.role == UserRole.SELLER)
+    query = db.query(User).options(*load_profile(User, "detail"))
     
-    if status:
-        if status == "pending":
-            query = query.filter(User.store_name.isnot(None), User.is_seller_approved == False)
-        elif status == "approved":
-            query = query.filter(User.is_seller_approved == True)
-        elif status == "rejected":
-            query = query.filter(User.store_name.is_(None))
+    # Each branch is a range scan of a partial index (ix_users_seller_pending / ix_users_seller_decided)
+    if status == SellerApplicationStatusSchema.PENDING:
+        query = query.filter(
+            User.seller_application_status == SellerApplicationStatus.PENDING
+        ).order_by(User.seller_applied_at, User.id)
+    elif status is not None:
+        query = query.filter(
+            User.seller_application_status == SellerApplicationStatus(status.value)
+        ).order_by(User.seller_decided_at.desc())
+    else:
+        query = query.filter(User.seller_application_status.isnot(None)).order_by(User.id)
     
     sellers = query.offset(skip).limit(limit).all()
     
-    result = []
-    for seller in sellers:
-        app_status = "pending"
-        if seller.is_seller_approved:
-            app_status = "approved"
-        elif seller.store_name is None:
-            app_status = "rejected"
-        
-        result.append(SellerApplicationResponse(
-            id=seller.id,
-            email=seller.email,
-            store_name=seller.store_name or "",
-            seller_bio=seller.seller_bio or "",
-            seller_address=seller.seller_address or "",
-            seller_tax_id=seller.seller_tax_id,
-            status=app_status,
-            created_at=seller.created_at,
-            updated_at=seller.updated_at
-        ))
-    
-    return result
+    return fast_response([application_response(seller) for seller in sellers], List[SellerApplicationResponse])
 
 @router.patch("/sellers/{user_id}/approve", response_model=SellerApplicationResponse)
 def approve_reject_seller(
@@ -75,28 +78,25 @@ def approve_reject_seller(
 ):
     """Approve or reject a seller application (admin only)"""
     
-    seller = db.query(User).filter(User.id == user_id).first()
+    seller = db.query(User).options(*load_profile(User, "detail")).filter(User.id == user_id).first()
     if not seller:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Seller not found"
         )
     
-    if seller.role != UserRole.SELLER:
+    if seller.seller_application_status is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is not a seller applicant"
         )
     
     if approval.status == "approved":
+        seller.role = UserRole.SELLER
         seller.is_seller_approved = True
         seller.seller_verified = True  # Auto-verify for now
     elif approval.status == "rejected":
-        # Clear seller application data
-        seller.store_name = None
-        seller.seller_bio = None
-        seller.seller_address = None
-        seller.seller_tax_id = None
+        # The application details are kept for the record
         seller.is_seller_approved = False
         seller.role = UserRole.BUYER  # Revert to buyer
     else:
@@ -104,26 +104,148 @@ def approve_reject_seller(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid status. Must be 'approved' or 'rejected'"
         )
+    seller.seller_application_status = SellerApplicationStatus(approval.status.value)
+    seller.seller_decided_at = datetime.now(timezone.utc)
+    
+    # Notify the applicant from a background job, committed with the decision
+    enqueue(db, SELLER_DECISION_JOB, {
+        "user_id": seller.id,
+        "email": seller.email,
+        "decision": approval.status.value,
+        "store_name": seller.store_name,
+    })
+    record_change(db, USER, seller.id)
     
     db.commit()
     db.refresh(seller)
+    events.publish(events.USER_CHANGED, user_ids=[seller.id])
     
-    # Determine final status
-    final_status = approval.status
-    if approval.status == "rejected":
-        final_status = "rejected"
+    return SellerApplicationResponse(**application_response(seller))
+
+def check_bulk_target(ids: Optional[List[int]], filter) -> None:
+    """A bulk action takes an id list or a filter, not both"""
+    if (ids is None) == (filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give either a list of ids or a filter"
+        )
+    if ids is not None and len(ids) > MODERATION_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MODERATION_BATCH} ids per request"
+        )
+
+@router.post("/sellers/bulk-decision", response_model=SellerBulkDecisionResult)
+def bulk_decide_sellers(
+    request: SellerBulkDecisionRequest,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Approve or reject many pending seller applications in one transaction (admin only)"""
+    check_bulk_target(request.user_ids, request.filter)
+    if request.status == SellerApplicationStatusSchema.PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid status. Must be 'approved' or 'rejected'"
+        )
     
-    return SellerApplicationResponse(
-        id=seller.id,
-        email=seller.email,
-        store_name=seller.store_name or "",
-        seller_bio=seller.seller_bio or "",
-        seller_address=seller.seller_address or "",
-        seller_tax_id=seller.seller_tax_id,
-        status=final_status,
-        created_at=seller.created_at,
-        updated_at=seller.updated_at
+    query = db.query(User.id, User.email, User.store_name).filter(
+        User.seller_application_status == SellerApplicationStatus.PENDING
     )
+    if request.user_ids is not None:
+        query = query.filter(User.id.in_(request.user_ids))
+    else:
+        if request.filter.applied_after is not None:
+            query = query.filter(User.seller_applied_at >= request.filter.applied_after)
+        if request.filter.applied_before is not None:
+            query = query.filter(User.seller_applied_at < request.filter.applied_before)
+    rows = query.order_by(
+        User.seller_applied_at, User.id
+    ).limit(MODERATION_BATCH + 1).with_for_update().all()
+    has_more = len(rows) > MODERATION_BATCH
+    rows = rows[:MODERATION_BATCH]
+    user_ids = [row.id for row in rows]
+    
+    if user_ids:
+        if request.status == SellerApplicationStatusSchema.APPROVED:
+            values = {
+                User.role: UserRole.SELLER,
+                User.is_seller_approved: True,
+                User.seller_verified: True  # Auto-verify for now
+            }
+        else:
+            # Revert to buyer; the application details are kept for the record
+            values = {
+                User.is_seller_approved: False,
+                User.role: UserRole.BUYER
+            }
+        values[User.seller_application_status] = SellerApplicationStatus(request.status.value)
+        values[User.seller_decided_at] = func.now()
+        db.query(User).filter(User.id.in_(user_ids)).update(values, synchronize_session=False)
+        enqueue_many(db, SELLER_DECISION_JOB, [
+            {
+                "user_id": row.id,
+                "email": row.email,
+                "decision": request.status.value,
+                "store_name": row.store_name,
+            }
+            for row in rows
+        ])
+        record_change(db, USER, *user_ids)
+    db.commit()
+    if user_ids:
+        events.publish(events.USER_CHANGED, user_ids=user_ids)
+    
+    return {
+        "updated": len(user_ids),
+        "user_ids": user_ids,
+        "skipped": sorted(set(request.user_ids or ()) - set(user_ids)),
+        "has_more": has_more
+    }
+
+@router.post("/products/bulk-status", response_model=ProductBulkStatusResult)
+def bulk_set_product_status(
+    request: ProductBulkStatusRequest,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Change the status of many products in one transaction, e.g. suspend a seller's listings (admin only)"""
+    check_bulk_target(request.product_ids, request.filter)
+    new_status = ProductStatus(request.status.value)
+    
+    query = db.query(Product.id).filter(Product.status != new_status)
+    if request.product_ids is not None:
+        query = query.filter(Product.id.in_(request.product_ids))
+    else:
+        if request.filter.seller_id is not None:
+            query = query.filter(Product.seller_id == request.filter.seller_id)
+        if request.filter.category_id is not None:
+            query = query.filter(Product.category_id == request.filter.category_id)
+        if request.filter.status is not None:
+            query = query.filter(Product.status == ProductStatus(request.filter.status.value))
+    product_ids = [
+        product_id for product_id, in
+        query.order_by(Product.id).limit(MODERATION_BATCH + 1).with_for_update().all()
+    ]
+    has_more = len(product_ids) > MODERATION_BATCH
+    product_ids = product_ids[:MODERATION_BATCH]
+    
+    if product_ids:
+        db.query(Product).filter(Product.id.in_(product_ids)).update(
+            {Product.status: new_status}, synchronize_session=False
+        )
+        record_change(db, PRODUCT, *product_ids)
+    db.commit()
+    if product_ids:
+        # One reload for the whole batch; caches and indexes drop or pick up the products
+        publish_products(product_ids)
+    
+    return {
+        "updated": len(product_ids),
+        "product_ids": product_ids,
+        "skipped": sorted(set(request.product_ids or ()) - set(product_ids)),
+        "has_more": has_more
+    }
 
 @router.get("/sellers/{user_id}", response_model=SellerProfile)
 def get_seller_details(
@@ -133,7 +255,7 @@ def get_seller_details(
 ):
     """Get detailed seller information (admin only)"""
     
-    seller = db.query(User).filter(
+    seller = db.query(User).options(*load_profile(User, "detail")).filter(
         User.id == user_id,
         User.role == UserRole.SELLER
     ).first()
@@ -160,3 +282,34 @@ def get_seller_details(
         seller_rating=seller.seller_rating,
         created_at=seller.created_at
     )
+
+@router.get("/metrics")
+def get_metrics(current_user: User = Depends(get_admin_user)):
+    """In-process metrics of this worker (admin only)"""
+    return metrics.snapshot()
+
+@router.post("/suggest/rebuild")
+def rebuild_suggestions(current_user: User = Depends(get_admin_user)):
+    """Rebuild this worker's typeahead index from the database (admin only)"""
+    rebuild_suggest_index()
+    return {"entries": len(suggest_index)}
+
+@router.post("/uploads/sweep")
+def sweep_uploads(
+    response: Response,
+    dry_run: bool = Query(True, description="Only report what would be deleted"),
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Report upload files no longer referenced by anything, or queue their deletion (admin only)"""
+    if dry_run:
+        return sweep_orphan_files(dry_run=True)
+    queued = enqueue(db, SWEEP_ORPHANS_JOB)
+    db.commit()
+    response.status_code = status.HTTP_202_ACCEPTED
+    return {"job_id": queued.id}
+
+@router.get("/jobs")
+def get_jobs(current_user: User = Depends(get_admin_user), db: Session = Depends(get_db)):
+    """Background job queues: depth and oldest waiting job, plus this worker's throughput (admin only)"""
+    return {"queues": queue_stats(db), "worker": job_runner.metrics()}
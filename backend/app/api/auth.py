@@ -1,18 +1,34 @@
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from datetime import datetime, timedelta, timezone
+import math
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models.user import User, UserRole
+from app.core.kvstore import create_store
+from app.core.load_profiles import load_profile
+from app.core.rate_limit import rate_limit
+from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
+
+# Account lockout after repeated failed logins
+MAX_LOGIN_ATTEMPTS = 5
+LOCKOUT_MINUTES = 15
+
+# Failed logins for emails without an account, locked out exactly like real
+# ones so the 429 doesn't reveal which emails are registered
+unknown_login_failures = create_store("login-failures", maxsize=100_000, ttl=24 * 3600)
+UNKNOWN_USER_HASH = pwd_context.hash("unknown-user")
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -27,7 +43,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def load_current_user(token: str, db: Session, profile: str = "auth"):
+    """User of a bearer token, loaded with the given load profile"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -40,7 +57,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         if user_id is None:
             raise credentials_exception
             
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).options(*load_profile(User, profile)).filter(User.id == user_id).first()
         if user is None:
             raise credentials_exception
             
@@ -48,7 +65,70 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
-@router.post("/register", response_model=UserResponse)
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return load_current_user(token, db)
+
+def get_current_user_detail(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    """Current user with every column loaded, for endpoints reading profile details"""
+    return load_current_user(token, db, profile="detail")
+
+def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme), db: Session = Depends(get_db)):
+    """Current user when a valid bearer token is sent, None otherwise
+
+    A stale or invalid token is treated as anonymous: public endpoints must
+    keep working for clients that still hold an expired token.
+    """
+    if token is None:
+        return None
+    try:
+        return load_current_user(token, db)
+    except HTTPException:
+        return None
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes from the database as UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def login_locked_until(db_user: Optional[User], email: str) -> Optional[datetime]:
+    """End of the lockout for this login, from the account or the unknown-email store"""
+    if db_user is not None:
+        return as_utc(db_user.locked_until) if db_user.locked_until else None
+    record = unknown_login_failures.get(email)
+    if record and record.get("locked_until"):
+        return datetime.fromtimestamp(record["locked_until"], tz=timezone.utc)
+    return None
+
+def record_failed_login(db: Session, db_user: Optional[User], email: str, now: datetime):
+    """Count a failed login, locking it after MAX_LOGIN_ATTEMPTS in a row"""
+    locked_until = now + timedelta(minutes=LOCKOUT_MINUTES)
+    if db_user is None:
+        record = unknown_login_failures.get(email) or {}
+        attempts = record.get("attempts", 0) + 1
+        if attempts >= MAX_LOGIN_ATTEMPTS:
+            record = {"attempts": 0, "locked_until": locked_until.timestamp()}
+        else:
+            record = {"attempts": attempts}
+        unknown_login_failures.set(email, record)
+        return
+    
+    # Incremented in SQL so concurrent failures are all counted
+    attempts = db.execute(
+        update(User)
+        .where(User.id == db_user.id)
+        .values(login_attempts=func.coalesce(User.login_attempts, 0) + 1)
+        .returning(User.login_attempts)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    if attempts >= MAX_LOGIN_ATTEMPTS:
+        db.execute(
+            update(User)
+            .where(User.id == db_user.id, User.login_attempts >= MAX_LOGIN_ATTEMPTS)
+            .values(login_attempts=0, locked_until=locked_until)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(rate_limit("auth"))])
 def register(user: UserCreate, db: Session = Depends(get_db)):
     # Check if user already exists
     db_user = db.query(User).filter(User.email == user.email).first()
@@ -77,12 +157,30 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     
     return db_user
 
-@router.post("/login", response_model=Token)
-def login(user: UserCreate, db: Session = Depends(get_db)):
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit("auth"))])
+def login(
+    user: UserCreate,
+    cart_token: Optional[str] = Header(None, alias="X-Cart-Token"),
+    db: Session = Depends(get_db)
+):
     # Authenticate user
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = db.query(User).options(*load_profile(User, "auth")).filter(User.email == user.email).first()
+    now = datetime.now(timezone.utc)
     
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    # Locked logins are rejected before paying for a bcrypt check
+    locked_until = login_locked_until(db_user, user.email)
+    if locked_until and locked_until > now:
+        retry_after = (locked_until - now).total_seconds()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Account temporarily locked after too many failed login attempts",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+    
+    # Unknown emails still pay for a bcrypt check so timing doesn't reveal them
+    password_ok = verify_password(user.password, db_user.hashed_password if db_user else UNKNOWN_USER_HASH)
+    if not db_user or not password_ok:
+        record_failed_login(db, db_user, user.email, now)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -94,10 +192,20 @@ def login(user: UserCreate, db: Session = Depends(get_db)):
             detail="Inactive user"
         )
     
+    db_user.login_attempts = 0
+    db_user.locked_until = None
+    db_user.last_login = now
+    db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": db_user.id, "role": db_user.role},
         expires_delta=access_token_expires
     )
     
+    # Carry the anonymous cart over to the account
+    if cart_token:
+        from app.api.cart import merge_anonymous_cart
+        merge_anonymous_cart(cart_token, db_user.id)
+    
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -0,0 +1,166 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.core.database import get_db
+from app.core.kvstore import create_store
+from app.models.user import User
+from app.schemas.cart import CartItemAdd, CartItemUpdate, CartResponse
+from app.api.auth import get_optional_user
+from app.api.products import load_product_responses
+
+router = APIRouter(prefix="/cart", tags=["cart"])
+
+CART_TTL = 30 * 24 * 60 * 60  # Idle carts expire after 30 days
+MAX_CART_ITEMS = 200
+
+# Carts are {"items": {"<product_id>": quantity}}; dict keys give O(1) add/remove
+cart_store = create_store("cart", maxsize=200_000, ttl=CART_TTL)
+
+def user_cart_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def anonymous_cart_key(cart_token: str) -> str:
+    return f"anon:{cart_token}"
+
+def get_cart_key(
+    cart_token: Optional[str] = Header(None, alias="X-Cart-Token"),
+    current_user: Optional[User] = Depends(get_optional_user)
+) -> str:
+    """Dependency resolving the cart of the user, or of the anonymous cart token"""
+    if current_user is not None:
+        return user_cart_key(current_user.id)
+    if not cart_token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Log in or send an X-Cart-Token header"
+        )
+    return anonymous_cart_key(cart_token)
+
+def load_cart(key: str) -> dict:
+    return cart_store.get(key) or {"items": {}}
+
+def save_cart(key: str, cart: dict):
+    if cart["items"]:
+        cart_store.set(key, cart)
+    else:
+        cart_store.delete(key)
+
+def merge_anonymous_cart(cart_token: str, user_id: int):
+    """Fold an anonymous cart into the user's cart (quantities are added)"""
+    anonymous_key = anonymous_cart_key(cart_token)
+    anonymous = cart_store.get(anonymous_key)
+    if not anonymous:
+        return
+    
+    key = user_cart_key(user_id)
+    cart = load_cart(key)
+    for product_id, quantity in anonymous["items"].items():
+        cart["items"][product_id] = cart["items"].get(product_id, 0) + quantity
+    
+    save_cart(key, cart)
+    cart_store.delete(anonymous_key)
+
+def price_cart(db: Session, cart: dict) -> CartResponse:
+    """Reprice and stock-check every line with one batched product lookup"""
+    quantities = {int(product_id): quantity for product_id, quantity in cart["items"].items()}
+    products = load_product_responses(db, list(quantities))
+    
+    items = []
+    total = 0.0
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
+        in_stock = product is not None and (
+            product.stock_quantity == -1 or product.stock_quantity >= quantity
+        )
+        subtotal = product.price * quantity if product is not None else 0.0
+        if in_stock:
+            total += subtotal
+        
+        items.append({
+            "product_id": product_id,
+            "quantity": quantity,
+            "title": product.title if product else None,
+            "thumbnail_url": product.thumbnail_url if product else None,
+            "unit_price": product.price if product else None,
+            "subtotal": subtotal,
+            "available": product is not None,
+            "in_stock": in_stock
+        })
+    
+    return CartResponse(
+        items=items,
+        item_count=sum(quantities.values()),
+        total=round(total, 2)
+    )
+
+@router.get("/", response_model=CartResponse)
+def get_cart(
+    cart_key: str = Depends(get_cart_key),
+    db: Session = Depends(get_db)
+):
+    """Get the cart with current prices and stock"""
+    return price_cart(db, load_cart(cart_key))
+
+@router.post("/items", response_model=CartResponse)
+def add_cart_item(
+    item: CartItemAdd,
+    cart_key: str = Depends(get_cart_key),
+    db: Session = Depends(get_db)
+):
+    """Add a product to the cart, increasing the quantity if already present"""
+    cart = load_cart(cart_key)
+    product_id = str(item.product_id)
+    
+    if product_id not in cart["items"] and len(cart["items"]) >= MAX_CART_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A cart can hold at most {MAX_CART_ITEMS} products"
+        )
+    
+    cart["items"][product_id] = cart["items"].get(product_id, 0) + item.quantity
+    save_cart(cart_key, cart)
+    
+    return price_cart(db, cart)
+
+@router.put("/items/{product_id}", response_model=CartResponse)
+def update_cart_item(
+    product_id: int,
+    item: CartItemUpdate,
+    cart_key: str = Depends(get_cart_key),
+    db: Session = Depends(get_db)
+):
+    """Set the quantity of a cart line (0 removes it)"""
+    cart = load_cart(cart_key)
+    
+    if item.quantity == 0:
+        cart["items"].pop(str(product_id), None)
+    else:
+        if str(product_id) not in cart["items"] and len(cart["items"]) >= MAX_CART_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A cart can hold at most {MAX_CART_ITEMS} products"
+            )
+        cart["items"][str(product_id)] = item.quantity
+    
+    save_cart(cart_key, cart)
+    return price_cart(db, cart)
+
+@router.delete("/items/{product_id}", response_model=CartResponse)
+def remove_cart_item(
+    product_id: int,
+    cart_key: str = Depends(get_cart_key),
+    db: Session = Depends(get_db)
+):
+    """Remove a product from the cart"""
+    cart = load_cart(cart_key)
+    cart["items"].pop(str(product_id), None)
+    save_cart(cart_key, cart)
+    
+    return price_cart(db, cart)
+
+@router.delete("/")
+def clear_cart(cart_key: str = Depends(get_cart_key)):
+    """Empty the cart"""
+    cart_store.delete(cart_key)
+    return {"message": "Cart cleared"}
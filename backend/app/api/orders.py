@@ -1,15 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 
+from app.core import events
+from app.core.counters import counters
 from app.core.database import get_db
-from app.models.order import Order, OrderStatus
+from app.core.replicas import get_read_db
+from app.core.load_profiles import load_profile
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
 from app.models.user import User
 from app.schemas.order import OrderCreate, OrderResponse, OrderUpdate
 from app.api.auth import get_current_user
+from app.core.responses import fast_response
+from app.utils.fieldsets import FIELDS_DESCRIPTION, parse_fields, load_only_options, sparse_response
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+# Item columns an order response needs; product_name is a snapshot, so no product join
+ORDER_ITEM_COLUMNS = (
+    OrderItem.id,
+    OrderItem.order_id,
+    OrderItem.product_id,
+    OrderItem.product_name,
+    OrderItem.product_price,
+    OrderItem.quantity,
+)
+
+def order_read_options(selected, always=()) -> list:
+    """Loader options for reading orders: requested columns, items in one extra query"""
+    options = load_only_options(Order, selected, always)
+    if selected is None or "items" in selected:
+        options.append(selectinload(Order.items).load_only(*ORDER_ITEM_COLUMNS))
+    return options
+
+def order_row(order: Order, selected=None) -> dict:
+    """An order (only the ``selected`` fields) as plain data for ``OrderResponse``"""
+    fields = OrderResponse.model_fields if selected is None else selected
+    row = {name: getattr(order, name) for name in fields if name not in ("status", "items")}
+    if "status" in fields:
+        row["status"] = order.status.value
+    if "items" in fields:
+        row["items"] = [
+            {
+                "id": item.id,
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "price": item.product_price,
+                "quantity": item.quantity,
+            }
+            for item in order.items
+        ]
+    return row
+
 @router.post("/", response_model=OrderResponse)
 def create_order(
     order: OrderCreate,
@@ -33,8 +76,9 @@ def create_order(
     
     # Add order items
     for item_data in order.items:
-        from app.models.product import Product
-        product = db.query(Product).filter(Product.id == item_data.product_id).first()
+        product = db.query(Product).options(
+            *load_profile(Product, "listing")
+        ).filter(Product.id == item_data.product_id).first()
         
         if not product:
             raise HTTPException(
@@ -43,16 +87,16 @@ def create_order(
             )
         
         # Create order item
-        from app.models.order import OrderItem
         order_item = OrderItem(
             order_id=db_order.id,
             product_id=item_data.product_id,
             seller_id=product.seller_id,
-            product_name=product.name,
+            product_name=product.title,
             product_price=product.price,
             quantity=item_data.quantity,
             subtotal=item_data.price * item_data.quantity,
-            total=item_data.price * item_data.quantity
+            total=item_data.price * item_data.quantity,
+            created_at=db_order.created_at
         )
         
         db.add(order_item)
@@ -60,25 +104,47 @@ def create_order(
     db.commit()
     db.refresh(db_order)
     
-    return db_order
+    # Sales counters are batched instead of locking hot product rows here
+    for item_data in order.items:
+        counters.incr(Product, "sold_count", item_data.product_id, item_data.quantity)
+    events.publish(
+        events.ORDER_PLACED,
+        items=[(item_data.product_id, item_data.quantity) for item_data in order.items]
+    )
+    
+    return fast_response(order_row(db_order), OrderResponse)
 
 @router.get("/", response_model=List[OrderResponse])
 def get_user_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=0, le=100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    orders = db.query(Order).filter(Order.user_id == current_user.id).offset(skip).limit(limit).all()
-    return orders
+    selected = parse_fields(fields, OrderResponse)
+    
+    orders = db.query(Order).options(
+        *order_read_options(selected)
+    ).filter(Order.user_id == current_user.id).offset(skip).limit(limit).all()
+    
+    rows = [order_row(order, selected) for order in orders]
+    if selected is not None:
+        return sparse_response(rows, OrderResponse, selected)
+    return fast_response(rows, List[OrderResponse])
 
 @router.get("/{order_id}", response_model=OrderResponse)
 def get_order(
     order_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    selected = parse_fields(fields, OrderResponse)
+    
+    order = db.query(Order).options(
+        *order_read_options(selected, always=["user_id"])
+    ).filter(Order.id == order_id).first()
     
     if not order:
         raise HTTPException(
@@ -93,7 +159,10 @@ def get_order(
             detail="You can only view your own orders"
         )
     
-    return order
+    row = order_row(order, selected)
+    if selected is not None:
+        return sparse_response(row, OrderResponse, selected)
+    return fast_response(row, OrderResponse)
 
 @router.put("/{order_id}", response_model=OrderResponse)
 def update_order(
@@ -126,7 +195,7 @@ def update_order(
     db.commit()
     db.refresh(order)
     
-    return order
+    return fast_response(order_row(order), OrderResponse)
 
 @router.delete("/{order_id}")
 def cancel_order(
@@ -1,61 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List, Optional
-import os
-import uuid
-from pathlib import Path
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import FrozenSet, List, Optional
+from datetime import datetime, timezone
 
+from app.core import events
+from app.core.cache import product_cache
+from app.core.change_feed import PRODUCT, record_change
+from app.core.counters import counters
 from app.core.database import get_db
-from app.models.product import Product
+from app.core.replicas import get_read_db
+from app.core.responses import fast_response
+from app.core.catalog_index import catalog_index
+from app.core.load_profiles import load_profile
+from app.core.recommendations import RELATED_PRODUCTS_LIMIT, recommender, query_related
+from app.core.suggest import MAX_SUGGESTIONS, suggest_index, query_suggestions
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, Category
+from app.models.review import Review
 from app.models.user import User, UserRole
 from app.schemas.product import (
-    ProductCreate, 
     ProductResponse, 
-    ProductUpdate, 
+    SellerProductResponse,
     ProductList,
+    ProductBatchResponse,
+    SignedDownloadURLs,
+    Suggestion,
     ProductFileUpload
 )
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_optional_user
 from app.core.permissions import get_approved_seller, check_product_ownership
+from app.core.rate_limit import rate_limit
+from app.core.signing import sign_url, download_expiry
+from app.core.uploads import claim_upload, delete_upload
+from app.utils.fieldsets import FIELDS_DESCRIPTION, parse_fields, load_only_options, sparse_response
+from app.utils.storage import validate_file, save_media_file, save_product_file
 
 router = APIRouter(prefix="/products", tags=["products"])
 
-# File upload configuration
-UPLOAD_DIR = Path("uploads/products")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+MAX_BATCH_IDS = 500
 
-ALLOWED_FILE_TYPES = {
-    "application/pdf": "pdf",
-    "application/zip": "zip", 
-    "video/mp4": "mp4",
-    "image/jpeg": "jpg",
-    "image/png": "png"
-}
-
-MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
-
-def validate_file(file: UploadFile) -> bool:
-    """Validate file type and size"""
-    if file.size and file.size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File size exceeds 100MB limit"
-        )
-    
-    if file.content_type not in ALLOWED_FILE_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type {file.content_type} not allowed. Allowed types: {list(ALLOWED_FILE_TYPES.keys())}"
-        )
-    
-    return True
-
-def generate_unique_filename(original_filename: str) -> str:
-    """Generate unique filename using UUID"""
-    file_extension = os.path.splitext(original_filename)[1]
-    return f"{uuid.uuid4()}{file_extension}"
-
-@router.post("/", response_model=ProductResponse)
+@router.post("/", response_model=SellerProductResponse, dependencies=[Depends(rate_limit("upload"))])
 async def create_product(
     title: str = Form(...),
     description: str = Form(...),
@@ -70,44 +55,42 @@ async def create_product(
     is_featured: bool = Form(False),
     stock_quantity: int = Form(-1),
     download_limit: int = Form(0),
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    upload_id: Optional[str] = Form(None, description="Finalized resumable upload (/uploads) to use as the file"),
     thumbnail: Optional[UploadFile] = File(None),
     current_user: User = Depends(get_approved_seller),
     db: Session = Depends(get_db)
 ):
     """Create a new product (approved sellers only)"""
     
-    # Validate main file
-    validate_file(file)
-    
-    # Generate unique filename
-    file_extension = ALLOWED_FILE_TYPES.get(file.content_type, 'bin')
-    unique_filename = generate_unique_filename(file.filename or "file")
-    file_path = UPLOAD_DIR / unique_filename
+    # ``status`` is shadowed by the form field here, hence the literal codes
+    # Validate every input before any file is written or an upload is claimed
+    if upload_id is None and file is None:
+        raise HTTPException(status_code=400, detail="Send the product file or an upload_id")
+    if upload_id is None:
+        validate_file(file)
+    if thumbnail and thumbnail.content_type not in ["image/jpeg", "image/png"]:
+        raise HTTPException(status_code=400, detail="Thumbnail must be JPG or PNG")
     
-    # Save main file
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # The main file is sent inline or was uploaded in chunks beforehand; a
+    # claimed upload is only deleted once the product is committed
+    if upload_id is not None:
+        stored = await run_in_threadpool(claim_upload, upload_id, current_user.id)
+    else:
+        # Save main file under a unique name
+        content = await file.read()
+        stored = {
+            "file_url": save_product_file(file.filename or "file", content),
+            "file_name": file.filename,
+            "file_size": len(content),
+            "file_type": file.content_type
+        }
     
     # Handle thumbnail if provided
     thumbnail_path = None
-    thumbnail_name = None
     if thumbnail:
-        if thumbnail.content_type not in ["image/jpeg", "image/png"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Thumbnail must be JPG or PNG"
-            )
-        
-        thumbnail_filename = generate_unique_filename(thumbnail.filename or "thumb")
-        thumbnail_file_path = UPLOAD_DIR / thumbnail_filename
         thumbnail_content = await thumbnail.read()
-        with open(thumbnail_file_path, "wb") as f:
-            f.write(thumbnail_content)
-        
-        thumbnail_path = f"/static/uploads/products/{thumbnail_filename}"
-        thumbnail_name = thumbnail.filename
+        thumbnail_path = save_media_file(thumbnail.filename or "thumb", thumbnail_content)
     
     # Create product
     db_product = Product(
@@ -124,53 +107,164 @@ async def create_product(
         is_featured=is_featured,
         stock_quantity=stock_quantity,
         download_limit=download_limit,
-        file_url=f"/static/uploads/products/{unique_filename}",
-        file_name=file.filename,
-        file_size=len(content),
-        file_type=file.content_type,
+        file_url=stored["file_url"],
+        file_name=stored["file_name"],
+        file_size=stored["file_size"],
+        file_type=stored["file_type"],
         thumbnail_url=thumbnail_path,
-        thumbnail_name=thumbnail_name,
         seller_id=current_user.id
     )
     
     db.add(db_product)
+    db.flush()
+    record_change(db, PRODUCT, db_product.id)
     db.commit()
+    if upload_id is not None:
+        await run_in_threadpool(delete_upload, upload_id)
     db.refresh(db_product)
+    events.publish(events.PRODUCT_CHANGED, product=db_product)
     
     return db_product
 
-@router.get("/me", response_model=List[ProductResponse])
+@router.get("/me", response_model=List[SellerProductResponse])
 def get_my_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_approved_seller),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get current seller's products"""
-    products = db.query(Product).filter(
+    selected = parse_fields(fields, SellerProductResponse)
+    
+    products = db.query(Product).options(
+        *(load_only_options(Product, selected) or load_profile(Product, "detail"))
+    ).filter(
         Product.seller_id == current_user.id
     ).offset(skip).limit(limit).all()
     
-    return products
+    if selected is not None:
+        return sparse_response(products, SellerProductResponse, selected)
+    return fast_response(products, List[SellerProductResponse])
+
+# How each public listing field is read from a product
+PRODUCT_LIST_VALUES = {
+    "id": lambda product: product.id,
+    "title": lambda product: product.title,
+    "short_description": lambda product: product.short_description,
+    "price": lambda product: product.price,
+    "compare_at_price": lambda product: product.compare_at_price,
+    "thumbnail_url": lambda product: product.thumbnail_url,
+    "seller_name": lambda product: product.seller.store_name or product.seller.username,
+    "seller_rating": lambda product: product.seller.seller_rating,
+    "sold_count": lambda product: product.sold_count,
+    "wishlist_count": lambda product: product.wishlist_count or 0,
+    "average_rating": lambda product: product.average_rating,
+    "review_count": lambda product: product.review_count,
+    "is_featured": lambda product: product.is_featured,
+    "created_at": lambda product: product.created_at,
+    "is_wishlisted": lambda product: None,  # Filled in per user by the listing
+}
+
+SELLER_LIST_FIELDS = {"seller_name", "seller_rating"}
+REVIEW_LIST_FIELDS = {"average_rating", "review_count"}
+
+def to_product_list(product: Product, fields: Optional[FrozenSet[str]] = None) -> dict:
+    """Public listing values for a product (all fields, or only the requested ones)"""
+    names = PRODUCT_LIST_VALUES.keys() if fields is None else fields
+    return {name: PRODUCT_LIST_VALUES[name](product) for name in names}
+
+def listing_load_options(fields: Optional[FrozenSet[str]] = None) -> list:
+    """Columns and relationships needed to build listing rows"""
+    options = load_only_options(Product, fields) or load_profile(Product, "listing")
+    if fields is None or fields & SELLER_LIST_FIELDS:
+        options.append(
+            joinedload(Product.seller).load_only(User.store_name, User.username, User.seller_rating)
+        )
+    if fields is None or fields & REVIEW_LIST_FIELDS:
+        # Ratings of the whole page in one query instead of one per product
+        options.append(selectinload(Product.reviews).load_only(Review.product_id, Review.rating))
+    return options
+
+def hydrate_products(
+    db: Session,
+    product_ids: List[int],
+    options: list = (),
+    listed_only: bool = False
+) -> List[Product]:
+    """Load products by id in one query, preserving the order of ``product_ids``"""
+    if not product_ids:
+        return []
+    
+    query = db.query(Product).options(*options).filter(Product.id.in_(product_ids))
+    if listed_only:
+        query = query.filter(Product.is_active == True, Product.status == "active")
+    products = query.all()
+    by_id = {product.id: product for product in products}
+    return [by_id[product_id] for product_id in product_ids if product_id in by_id]
 
-@router.get("/", response_model=List[ProductList])
+@router.get("/", response_model=List[ProductList], dependencies=[Depends(rate_limit("search", only_with_param="search"))])
 def get_public_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    sort_by: str = Query("created_at", pattern="^(created_at|price|sold_count|rating)$"),
+    sort_by: str = Query("created_at", pattern="^(created_at|price|sold_count|rating|trending)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get public product listings"""
-    query = db.query(Product).filter(
+    selected = parse_fields(fields, ProductList)
+    options = listing_load_options(selected)
+    
+    # Served from the in-memory catalog snapshot when it is loaded;
+    # free-text search still needs the database
+    if catalog_index.ready and not search:
+        page_ids = catalog_index.query(
+            category=category,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            skip=skip,
+            limit=limit
+        )
+        products = hydrate_products(db, page_ids, options)
+    else:
+        products = query_public_products(db, options, category, search, sort_by, sort_order, skip, limit)
+    
+    # Rows are validated once for the whole page and encoded straight to bytes
+    rows = [to_product_list(product, selected) for product in products]
+    
+    # Flag the whole page with the user's wishlist membership in one lookup
+    if current_user is not None and (selected is None or "is_wishlisted" in selected):
+        from app.api.wishlist import wishlist_product_ids
+        wishlisted = wishlist_product_ids(db, current_user.id)
+        for product, row in zip(products, rows):
+            row["is_wishlisted"] = product.id in wishlisted
+    
+    if selected is not None:
+        return sparse_response(rows, ProductList, selected)
+    return fast_response(rows, List[ProductList])
+
+def query_public_products(
+    db: Session,
+    options: list,
+    category: Optional[str],
+    search: Optional[str],
+    sort_by: str,
+    sort_order: str,
+    skip: int,
+    limit: int
+) -> List[Product]:
+    """Filter, sort and page the public listing in SQL"""
+    query = db.query(Product).options(*options).filter(
         Product.is_active == True,
         Product.status == "active"
     )
     
     if category:
-        query = query.filter(Product.category == category)
+        query = query.filter(Product.category.has(Category.name == category))
     
     if search:
         query = query.filter(
@@ -186,49 +280,106 @@ def get_public_products(
     elif sort_by == "sold_count":
         order_column = Product.sold_count
     elif sort_by == "rating":
-        order_column = Product.average_rating
+        order_column = Product.average_rating_sql()
+    elif sort_by == "trending":
+        order_column = Product.trending_score
     else:
         order_column = Product.created_at
     
+    # Product id breaks ties so pages are stable (and match the catalog index)
     if sort_order == "desc":
-        query = query.order_by(order_column.desc())
+        query = query.order_by(order_column.desc(), Product.id.desc())
     else:
-        query = query.order_by(order_column.asc())
-    
-    products = query.offset(skip).limit(limit).all()
-    
-    # Convert to ProductList schema
-    result = []
-    for product in products:
-        result.append(ProductList(
-            id=product.id,
-            title=product.title,
-            short_description=product.short_description,
-            price=product.price,
-            compare_at_price=product.compare_at_price,
-            thumbnail_url=product.thumbnail_url,
-            seller_name=product.seller.store_name or product.seller.username,
-            seller_rating=product.seller.seller_rating,
-            sold_count=product.sold_count,
-            average_rating=product.average_rating,
-            review_count=product.review_count,
-            is_featured=product.is_featured,
-            created_at=product.created_at
-        ))
-    
-    return result
+        query = query.order_by(order_column.asc(), Product.id.asc())
+    
+    return query.offset(skip).limit(limit).all()
+
+def parse_product_ids(ids: str) -> List[int]:
+    """Parse a comma-separated id list, dropping duplicates but keeping order"""
+    try:
+        product_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    
+    product_ids = list(dict.fromkeys(product_ids))
+    if len(product_ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} ids per request"
+        )
+    return product_ids
+
+def load_product_responses(db: Session, product_ids: List[int]) -> dict:
+    """Active products by id as ProductResponse, from the cache or one IN query"""
+    found = product_cache.get_many(product_ids)
+    misses = [product_id for product_id in product_ids if product_id not in found]
+    
+    if misses:
+        products = db.query(Product).options(
+            *load_profile(Product, "detail"),
+            selectinload(Product.reviews)
+        ).filter(
+            Product.id.in_(misses),
+            Product.is_active == True,
+            Product.status == "active"
+        ).all()
+        for product in products:
+            found[product.id] = product_cache.set(
+                product.id,
+                ProductResponse.model_validate(product, from_attributes=True)
+            )
+    
+    return found
+
+@router.get("/batch", response_model=ProductBatchResponse)
+def get_products_batch(
+    ids: str = Query(..., description="Comma-separated product ids"),
+    db: Session = Depends(get_read_db)
+):
+    """Get several products in request order, reporting ids that were not found"""
+    product_ids = parse_product_ids(ids)
+    found = load_product_responses(db, product_ids)
+    
+    return fast_response({
+        "products": [found[product_id] for product_id in product_ids if product_id in found],
+        "missing": [product_id for product_id in product_ids if product_id not in found]
+    }, ProductBatchResponse)
+
+@router.get("/suggest", response_model=List[Suggestion], dependencies=[Depends(rate_limit("search"))])
+def suggest_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(MAX_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+    db: Session = Depends(get_read_db)
+):
+    """Typeahead suggestions for titles, tags and store names, most popular first"""
+    if suggest_index.ready:
+        suggestions = suggest_index.suggest(q, limit)
+    else:
+        suggestions = query_suggestions(db, q, limit)
+    return fast_response(suggestions, List[Suggestion])
 
 @router.get("/{product_id}", response_model=ProductResponse)
 def get_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db)
 ):
     """Get single product details"""
-    product = db.query(Product).filter(
-        Product.id == product_id,
-        Product.is_active == True,
-        Product.status == "active"
-    ).first()
+    selected = parse_fields(fields, ProductResponse)
+    
+    if selected is None:
+        product = load_product_responses(db, [product_id]).get(product_id)
+    else:
+        product = db.query(Product).options(
+            *load_only_options(Product, selected)
+        ).filter(
+            Product.id == product_id,
+            Product.is_active == True,
+            Product.status == "active"
+        ).first()
     
     if not product:
         raise HTTPException(
@@ -236,9 +387,85 @@ def get_product(
             detail="Product not found"
         )
     
+    counters.incr(Product, "view_count", product_id)
+    events.publish(events.PRODUCT_VIEWED, product_id=product_id)
+    
+    if selected is not None:
+        return sparse_response(product, ProductResponse, selected)
     return product
 
-@router.put("/{product_id}", response_model=ProductResponse)
+@router.get("/{product_id}/related", response_model=List[ProductList])
+def get_related_products(
+    product_id: int,
+    limit: int = Query(10, ge=1, le=RELATED_PRODUCTS_LIMIT),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db)
+):
+    """Get products customers also bought with this one"""
+    selected = parse_fields(fields, ProductList)
+    
+    # Precomputed neighbours are a single lookup; SQL is the fallback
+    # while the recommender is not loaded
+    if recommender.ready:
+        related_ids = recommender.related(product_id)
+    else:
+        related_ids = query_related(db, product_id)
+    
+    products = hydrate_products(db, related_ids, listing_load_options(selected), listed_only=True)
+    rows = [to_product_list(product, selected) for product in products[:limit]]
+    
+    if selected is not None:
+        return sparse_response(rows, ProductList, selected)
+    return fast_response(rows, List[ProductList])
+
+def has_purchased(db: Session, user_id: int, product_id: int) -> bool:
+    """Whether the user has a non-cancelled order containing the product"""
+    return db.query(OrderItem.id).join(Order).filter(
+        Order.user_id == user_id,
+        Order.status != OrderStatus.CANCELLED,
+        OrderItem.product_id == product_id
+    ).first() is not None
+
+@router.get("/{product_id}/download-urls", response_model=SignedDownloadURLs)
+def get_download_urls(
+    product_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get short-lived signed URLs for a product's files"""
+    product = db.query(Product).options(
+        *load_only_options(Product, ["seller_id", "file_url", "preview_url", "sample_file_url", "is_active", "status"])
+    ).filter(Product.id == product_id).first()
+    
+    is_owner = product is not None and product.seller_id == current_user.id
+    if not product or not (is_owner or (product.is_active and product.status == "active")):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    expires = download_expiry()
+    
+    def signed(url: Optional[str]) -> Optional[str]:
+        return sign_url(url, current_user.id, product.id, expires) if url else None
+    
+    can_download = (
+        is_owner
+        or current_user.role == UserRole.ADMIN
+        or has_purchased(db, current_user.id, product.id)
+    )
+    
+    if can_download and product.file_url:
+        counters.incr(Product, "download_count", product.id)
+    
+    return SignedDownloadURLs(
+        file_url=signed(product.file_url) if can_download else None,
+        preview_url=signed(product.preview_url),
+        sample_file_url=signed(product.sample_file_url),
+        expires_at=datetime.fromtimestamp(expires, tz=timezone.utc)
+    )
+
+@router.put("/{product_id}", response_model=SellerProductResponse)
 async def update_product(
     product_id: int,
     title: Optional[str] = Form(None),
@@ -261,6 +488,11 @@ async def update_product(
 ):
     """Update product (owner only)"""
     
+    # The ownership check loaded only id and seller_id; fill in the rest in one query
+    product = db.query(Product).options(
+        *load_profile(Product, "detail")
+    ).filter(Product.id == product.id).one()
+    
     # Update text fields
     if title is not None:
         product.title = title
@@ -293,22 +525,10 @@ async def update_product(
     if file:
         validate_file(file)
         
-        # Delete old file
-        if product.file_url and product.file_name:
-            old_file_path = Path("uploads") / product.file_url.replace("/static/uploads/", "")
-            if old_file_path.exists():
-                old_file_path.unlink()
-        
-        # Save new file
-        file_extension = ALLOWED_FILE_TYPES.get(file.content_type, 'bin')
-        unique_filename = generate_unique_filename(file.filename or "file")
-        file_path = UPLOAD_DIR / unique_filename
-        
+        # Save new file; the replaced one is left to the orphan sweeper, so
+        # a failed commit below never loses the file still in use
         content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        product.file_url = f"/static/uploads/products/{unique_filename}"
+        product.file_url = save_product_file(file.filename or "file", content)
         product.file_name = file.filename
         product.file_size = len(content)
         product.file_type = file.content_type
@@ -321,24 +541,14 @@ async def update_product(
                 detail="Thumbnail must be JPG or PNG"
             )
         
-        # Delete old thumbnail
-        if product.thumbnail_url and product.thumbnail_name:
-            old_thumb_path = Path("uploads") / product.thumbnail_url.replace("/static/uploads/", "")
-            if old_thumb_path.exists():
-                old_thumb_path.unlink()
-        
-        # Save new thumbnail
-        thumbnail_filename = generate_unique_filename(thumbnail.filename or "thumb")
-        thumbnail_file_path = UPLOAD_DIR / thumbnail_filename
+        # Save new thumbnail (the old one is swept once unreferenced)
         thumbnail_content = await thumbnail.read()
-        with open(thumbnail_file_path, "wb") as f:
-            f.write(thumbnail_content)
-        
-        product.thumbnail_url = f"/static/uploads/products/{thumbnail_filename}"
-        product.thumbnail_name = thumbnail.filename
+        product.thumbnail_url = save_media_file(thumbnail.filename or "thumb", thumbnail_content)
     
+    record_change(db, PRODUCT, product.id)
     db.commit()
     db.refresh(product)
+    events.publish(events.PRODUCT_CHANGED, product=product)
     
     return product
 
@@ -353,11 +563,13 @@ def delete_product(
     # Soft delete
     product.is_active = False
     product.status = "archived"
+    record_change(db, PRODUCT, product.id)
     db.commit()
+    events.publish(events.PRODUCT_CHANGED, product=product)
     
     return {"message": "Product deleted successfully"}
 
-@router.post("/upload", response_model=ProductFileUpload)
+@router.post("/upload", response_model=ProductFileUpload, dependencies=[Depends(rate_limit("upload"))])
 async def upload_product_file(
     file: UploadFile = File(...),
     current_user: User = Depends(get_approved_seller)
@@ -366,17 +578,11 @@ async def upload_product_file(
     
     validate_file(file)
     
-    # Generate unique filename
-    unique_filename = generate_unique_filename(file.filename or "file")
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # Save file
+    # Save file; it is swept if no product refers to it within the grace period
     content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
     
     return ProductFileUpload(
-        file_url=f"/static/uploads/products/{unique_filename}",
+        file_url=save_product_file(file.filename or "file", content),
         file_name=file.filename,
         file_size=len(content),
         file_type=file.content_type
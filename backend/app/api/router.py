@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api import auth, users, products, orders, sellers, admin
+from app.api import auth, users, products, uploads, orders, sellers, admin, cart, wishlist
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -13,6 +13,15 @@ api_router.include_router(users.router, tags=["Users"])
 # Product endpoints
 api_router.include_router(products.router, tags=["Products"])
 
+# Resumable upload endpoints
+api_router.include_router(uploads.router, tags=["Uploads"])
+
+# Cart endpoints
+api_router.include_router(cart.router, tags=["Cart"])
+
+# Wishlist endpoints
+api_router.include_router(wishlist.router, tags=["Wishlist"])
+
 # Order endpoints
 api_router.include_router(orders.router, tags=["Orders"])
 
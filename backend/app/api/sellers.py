@@ -1,23 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from pydantic import ValidationError
+from sqlalchemy import case, func, tuple_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime, timezone
+import base64
+import binascii
+import csv
+import io
 
 from app.core.database import get_db
-from app.models.user import User, UserRole
+from app.core.permissions import get_approved_seller
+from app.core.replicas import get_read_db
+from app.core.responses import fast_response
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.user import SellerApplicationStatus, User, UserRole
+from app.schemas.order import (
+    MAX_FULFILLMENT_ROWS,
+    OrderStatus as OrderStatusSchema,
+    SellerFulfillmentReport,
+    SellerFulfillmentRequest,
+    SellerFulfillmentUpdate,
+    SellerOrderCounts,
+    SellerOrderPage,
+    SellerOrderResponse
+)
 from app.schemas.seller import (
     SellerApplication, 
     SellerApplicationResponse, 
-    SellerApprovalRequest,
     SellerProfile
 )
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user_detail
 
 router = APIRouter(prefix="/sellers", tags=["sellers"])
 
+def application_response(user: User) -> dict:
+    """A user's seller application as ``SellerApplicationResponse`` data"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "store_name": user.store_name or "",
+        "seller_bio": user.seller_bio or "",
+        "seller_address": user.seller_address or "",
+        "seller_tax_id": user.seller_tax_id,
+        "status": user.seller_application_status.value,
+        "applied_at": user.seller_applied_at,
+        "decided_at": user.seller_decided_at,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at
+    }
+
+# Statuses a seller may move an order to, by its current status
+FULFILLMENT_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.CONFIRMED, OrderStatus.CANCELLED},
+    OrderStatus.CONFIRMED: {OrderStatus.SHIPPED, OrderStatus.CANCELLED},
+    OrderStatus.SHIPPED: {OrderStatus.DELIVERED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+FULFILLMENT_CSV_MAX_BYTES = 2 * 1024 * 1024
+FULFILLMENT_CSV_COLUMNS = ("order_id", "status", "tracking_number")
+TRACKING_UPDATE_CHUNK = 500  # Orders per CASE update of tracking numbers
+
 @router.post("/apply", response_model=SellerApplicationResponse)
 def apply_as_seller(
     application: SellerApplication,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_detail),
     db: Session = Depends(get_db)
 ):
     """Apply to become a seller"""
@@ -29,14 +77,14 @@ def apply_as_seller(
             detail="You are already registered as a seller"
         )
     
-    if current_user.is_seller_approved:
+    if current_user.seller_application_status == SellerApplicationStatus.APPROVED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Your seller application has already been approved"
         )
     
-    # Check if user already has a pending application
-    if current_user.store_name:  # Simple check - if store_name exists, application exists
+    # A rejected applicant may apply again
+    if current_user.seller_application_status == SellerApplicationStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have a pending seller application"
@@ -56,56 +104,33 @@ def apply_as_seller(
     current_user.seller_address = application.seller_address
     current_user.seller_tax_id = application.seller_tax_id
     current_user.is_seller_approved = False  # Explicitly set to False
+    current_user.seller_application_status = SellerApplicationStatus.PENDING
+    current_user.seller_applied_at = datetime.now(timezone.utc)
+    current_user.seller_decided_at = None
     
     db.commit()
     db.refresh(current_user)
     
-    return SellerApplicationResponse(
-        id=current_user.id,
-        email=current_user.email,
-        store_name=current_user.store_name,
-        seller_bio=current_user.seller_bio,
-        seller_address=current_user.seller_address,
-        seller_tax_id=current_user.seller_tax_id,
-        status="pending",
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at
-    )
+    return SellerApplicationResponse(**application_response(current_user))
 
 @router.get("/application-status", response_model=SellerApplicationResponse)
 def get_application_status(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_detail),
     db: Session = Depends(get_db)
 ):
     """Get current user's seller application status"""
     
-    if current_user.role != UserRole.SELLER:
+    if current_user.seller_application_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No seller application found"
         )
     
-    status = "pending"
-    if current_user.is_seller_approved:
-        status = "approved"
-    elif current_user.store_name is None:
-        status = "rejected"
-    
-    return SellerApplicationResponse(
-        id=current_user.id,
-        email=current_user.email,
-        store_name=current_user.store_name or "",
-        seller_bio=current_user.seller_bio or "",
-        seller_address=current_user.seller_address or "",
-        seller_tax_id=current_user.seller_tax_id,
-        status=status,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at
-    )
+    return SellerApplicationResponse(**application_response(current_user))
 
 @router.get("/profile", response_model=SellerProfile)
 def get_seller_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_detail),
     db: Session = Depends(get_db)
 ):
     """Get seller profile (approved sellers only)"""
@@ -132,3 +157,293 @@ def get_seller_profile(
         seller_rating=current_user.seller_rating,
         created_at=current_user.created_at
     )
+
+def encode_cursor(created_at: datetime, order_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{order_id}".encode()).decode()
+
+def decode_cursor(cursor: str):
+    """Opaque ``next_cursor`` -> (created_at, order_id) of the last order already returned"""
+    try:
+        created_at, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def load_seller_orders(db: Session, seller_id: int, order_ids: List[int]) -> List[dict]:
+    """The seller's slice of the given orders, items included, in one query"""
+    rows = db.query(
+        OrderItem.order_id,
+        OrderItem.id,
+        OrderItem.product_id,
+        OrderItem.product_name,
+        OrderItem.product_price,
+        OrderItem.quantity,
+        OrderItem.total,
+        Order.status,
+        Order.user_id,
+        Order.shipping_address,
+        Order.tracking_number,
+        Order.created_at,
+        func.coalesce(User.full_name, User.username).label("buyer_name")
+    ).join(
+        Order, Order.id == OrderItem.order_id
+    ).join(
+        User, User.id == Order.user_id
+    ).filter(
+        OrderItem.seller_id == seller_id,
+        OrderItem.order_id.in_(order_ids)
+    ).order_by(OrderItem.id).all()
+    
+    orders = {}
+    for row in rows:
+        order = orders.get(row.order_id)
+        if order is None:
+            order = orders[row.order_id] = {
+                "id": row.order_id,
+                "status": row.status.value,
+                "buyer_id": row.user_id,
+                "buyer_name": row.buyer_name,
+                "shipping_address": row.shipping_address,
+                "tracking_number": row.tracking_number,
+                "created_at": row.created_at,
+                "seller_total": 0.0,
+                "items": [],
+            }
+        order["seller_total"] += row.total
+        order["items"].append({
+            "id": row.id,
+            "product_id": row.product_id,
+            "product_name": row.product_name,
+            "product_price": row.product_price,
+            "quantity": row.quantity,
+            "total": row.total,
+        })
+    return [orders[order_id] for order_id in order_ids if order_id in orders]
+
+def parse_fulfillment_csv(content: bytes) -> list:
+    """``(row number, SellerFulfillmentUpdate or error message)`` for each data row of a CSV"""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The CSV file must be UTF-8 encoded"
+        )
+    
+    reader = csv.DictReader(io.StringIO(text))
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    if "order_id" not in reader.fieldnames or not {"status", "tracking_number"} & set(reader.fieldnames):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The CSV needs a header with order_id and status and/or tracking_number columns"
+        )
+    
+    rows = []
+    for row_number, record in enumerate(reader, 1):
+        if row_number > MAX_FULFILLMENT_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_FULFILLMENT_ROWS} orders per import"
+            )
+        values = {
+            name: value.strip() or None
+            for name, value in record.items()
+            if name in FULFILLMENT_CSV_COLUMNS and value is not None
+        }
+        if values.get("status"):
+            values["status"] = values["status"].lower()
+        try:
+            rows.append((row_number, SellerFulfillmentUpdate(**values)))
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            rows.append((row_number, f"{'.'.join(map(str, error['loc']))}: {error['msg']}"))
+    return rows
+
+def apply_fulfillment(db: Session, seller_id: int, rows: list) -> dict:
+    """Check and apply ``(row number, update or error)`` pairs as one batch; per-row report"""
+    results = []
+    updates = {}  # order_id -> (result, update)
+    for row_number, update in rows:
+        if isinstance(update, str):
+            results.append({"row": row_number, "updated": False, "error": update})
+            continue
+        result = {"row": row_number, "order_id": update.order_id, "updated": False}
+        results.append(result)
+        if update.status is None and update.tracking_number is None:
+            result["error"] = "Nothing to update: give a status or a tracking number"
+        elif update.order_id in updates:
+            result["error"] = "The order appears more than once in the batch"
+        else:
+            updates[update.order_id] = (result, update)
+    
+    # Ownership and current status of the whole batch in one query; rows stay locked until commit
+    current = {}
+    if updates:
+        rows = db.query(
+            Order.id,
+            Order.status,
+            Order.tracking_number,
+            Order.items.any(OrderItem.seller_id != seller_id).label("shared")
+        ).filter(
+            Order.id.in_(list(updates)),
+            Order.items.any(OrderItem.seller_id == seller_id)
+        ).with_for_update(of=Order).all()
+        current = {row.id: row for row in rows}
+    
+    by_status = {}  # new status -> order ids
+    tracking = {}  # order id -> tracking number
+    for order_id, (result, update) in updates.items():
+        order = current.get(order_id)
+        if order is None:
+            result["error"] = "Order not found"
+            continue
+        # The status and tracking number belong to the whole order
+        if order.shared:
+            result["error"] = "The order also contains other sellers' items"
+            continue
+        old_status = order.status
+        new_status = OrderStatus(update.status.value) if update.status else old_status
+        result["status"] = old_status.value
+        if new_status != old_status and new_status not in FULFILLMENT_TRANSITIONS[old_status]:
+            result["error"] = f"Cannot change a {old_status.value} order to {new_status.value}"
+            continue
+        # Rows already in the requested state are reported, not rewritten
+        if new_status != old_status:
+            by_status.setdefault(new_status, []).append(order_id)
+        if update.tracking_number is not None and update.tracking_number != order.tracking_number:
+            tracking[order_id] = update.tracking_number
+        result["status"] = new_status.value
+        result["updated"] = new_status != old_status or order_id in tracking
+    
+    # Set-based: one UPDATE per target status, tracking numbers by CASE in chunks
+    for new_status, order_ids in by_status.items():
+        db.query(Order).filter(Order.id.in_(order_ids)).update(
+            {Order.status: new_status}, synchronize_session=False
+        )
+    tracked = list(tracking)
+    for start in range(0, len(tracked), TRACKING_UPDATE_CHUNK):
+        chunk = {order_id: tracking[order_id] for order_id in tracked[start:start + TRACKING_UPDATE_CHUNK]}
+        db.query(Order).filter(Order.id.in_(list(chunk))).update(
+            {Order.tracking_number: case(chunk, value=Order.id)}, synchronize_session=False
+        )
+    db.commit()
+    
+    updated = sum(1 for result in results if result["updated"])
+    failed = sum(1 for result in results if "error" in result)
+    return {"updated": updated, "failed": failed, "results": results}
+
+@router.get("/orders", response_model=SellerOrderPage)
+def get_seller_orders(
+    status_filter: Optional[OrderStatusSchema] = Query(None, alias="status"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_approved_seller),
+    db: Session = Depends(get_read_db)
+):
+    """Orders containing the seller's products, newest first (approved sellers only)"""
+    
+    # One range scan of ix_order_items_seller_created per page, whatever the page number
+    page = db.query(OrderItem.created_at, OrderItem.order_id).filter(
+        OrderItem.seller_id == current_user.id
+    )
+    if status_filter is not None:
+        page = page.join(Order, Order.id == OrderItem.order_id).filter(
+            Order.status == OrderStatus(status_filter.value)
+        )
+    if cursor:
+        page = page.filter(
+            tuple_(OrderItem.created_at, OrderItem.order_id) < tuple_(*decode_cursor(cursor))
+        )
+    keys = page.group_by(
+        OrderItem.created_at, OrderItem.order_id
+    ).order_by(
+        OrderItem.created_at.desc(), OrderItem.order_id.desc()
+    ).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(keys) > limit:
+        keys = keys[:limit]
+        next_cursor = encode_cursor(*keys[-1])
+    
+    orders = load_seller_orders(db, current_user.id, [key.order_id for key in keys]) if keys else []
+    return fast_response({"orders": orders, "next_cursor": next_cursor}, SellerOrderPage)
+
+@router.get("/orders/counts", response_model=SellerOrderCounts)
+def get_seller_order_counts(
+    current_user: User = Depends(get_approved_seller),
+    db: Session = Depends(get_read_db)
+):
+    """Number of the seller's orders and revenue by status, for the dashboard"""
+    rows = db.query(
+        Order.status,
+        func.count(func.distinct(OrderItem.order_id)),
+        func.coalesce(func.sum(OrderItem.total), 0.0)
+    ).join(
+        Order, Order.id == OrderItem.order_id
+    ).filter(
+        OrderItem.seller_id == current_user.id
+    ).group_by(Order.status).all()
+    
+    by_status = {order_status.value: {"orders": 0, "revenue": 0.0} for order_status in OrderStatus}
+    for order_status, orders, revenue in rows:
+        by_status[order_status.value] = {"orders": orders, "revenue": round(revenue, 2)}
+    return {
+        "total": sum(counts["orders"] for counts in by_status.values()),
+        "by_status": by_status
+    }
+
+@router.get("/orders/{order_id}", response_model=SellerOrderResponse)
+def get_seller_order(
+    order_id: int,
+    current_user: User = Depends(get_approved_seller),
+    db: Session = Depends(get_read_db)
+):
+    """One order with the seller's items (approved sellers only)"""
+    orders = load_seller_orders(db, current_user.id, [order_id])
+    if not orders:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    return orders[0]
+
+@router.post("/orders/fulfillment", response_model=SellerFulfillmentReport)
+def bulk_update_orders(
+    request: SellerFulfillmentRequest,
+    current_user: User = Depends(get_approved_seller),
+    db: Session = Depends(get_db)
+):
+    """Change the status and/or tracking number of many orders at once (approved sellers only)
+    
+    Only orders whose items all belong to the seller can be changed.  Rows are
+    checked and applied independently: each gets a result, and rows that fail
+    (unknown or shared order, disallowed status change) do not block the rest.
+    """
+    report = apply_fulfillment(db, current_user.id, list(enumerate(request.updates, 1)))
+    return fast_response(report, SellerFulfillmentReport)
+
+@router.post("/orders/fulfillment/csv", response_model=SellerFulfillmentReport)
+def import_fulfillment_csv(
+    file: UploadFile = File(..., description="CSV with order_id, status and/or tracking_number columns"),
+    current_user: User = Depends(get_approved_seller),
+    db: Session = Depends(get_db)
+):
+    """Bulk fulfillment from a CSV export, e.g. tracking numbers from a shipping provider"""
+    content = file.file.read(FULFILLMENT_CSV_MAX_BYTES + 1)
+    if len(content) > FULFILLMENT_CSV_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"The CSV file is larger than {FULFILLMENT_CSV_MAX_BYTES // (1024 * 1024)}MB"
+        )
+    
+    rows = parse_fulfillment_csv(content)
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The CSV file has no orders"
+        )
+    report = apply_fulfillment(db, current_user.id, rows)
+    return fast_response(report, SellerFulfillmentReport)
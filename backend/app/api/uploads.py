@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+import base64
+import binascii
+
+from app.core.rate_limit import rate_limit
+from app.core.permissions import get_approved_seller
+from app.core.uploads import (
+    MAX_CHUNK_SIZE,
+    create_upload,
+    load_upload,
+    chunk_length,
+    write_chunk,
+    upload_status,
+    finalize_upload,
+    delete_upload
+)
+from app.models.user import User
+from app.schemas.upload import UploadCreate, UploadResponse
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+def parse_checksum(header: Optional[str]) -> Optional[str]:
+    """``Upload-Checksum: sha256 <base64 digest>`` (as in tus) -> hex digest"""
+    if header is None:
+        return None
+    algorithm, _, value = header.strip().partition(" ")
+    if algorithm.lower() != "sha256":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only sha256 checksums are supported"
+        )
+    try:
+        return base64.b64decode(value.strip(), validate=True).hex()
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload-Checksum must be 'sha256 <base64 digest>'"
+        )
+
+async def read_chunk(request: Request, limit: int) -> bytes:
+    """Request body, refusing to buffer more than ``limit`` bytes"""
+    data = bytearray()
+    async for piece in request.stream():
+        data += piece
+        if len(data) > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Chunk larger than {limit} bytes"
+            )
+    return bytes(data)
+
+@router.post("/", response_model=UploadResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("upload"))])
+def start_upload(
+    upload: UploadCreate,
+    response: Response,
+    current_user: User = Depends(get_approved_seller)
+):
+    """Start a resumable upload (approved sellers only)"""
+    created = create_upload(
+        current_user.id,
+        upload.file_name,
+        upload.file_type,
+        upload.file_size,
+        upload.chunk_size
+    )
+    response.headers["Location"] = f"/api/v1/uploads/{created['id']}"
+    return upload_status(created)
+
+@router.get("/{upload_id}", response_model=UploadResponse)
+def get_upload(
+    upload_id: str,
+    current_user: User = Depends(get_approved_seller)
+):
+    """Progress of an upload, including the chunks still missing"""
+    return upload_status(load_upload(upload_id, current_user.id))
+
+@router.head("/{upload_id}")
+def get_upload_offset(
+    upload_id: str,
+    current_user: User = Depends(get_approved_seller)
+):
+    """tus-style offset query: where to resume a sequential upload"""
+    progress = upload_status(load_upload(upload_id, current_user.id))
+    return Response(headers={
+        "Upload-Offset": str(progress["offset"]),
+        "Upload-Length": str(progress["file_size"]),
+        "Cache-Control": "no-store"
+    })
+
+@router.patch("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    upload_checksum: Optional[str] = Header(None, alias="Upload-Checksum"),
+    current_user: User = Depends(get_approved_seller)
+):
+    """Store the chunk starting at Upload-Offset; chunks may arrive in any order"""
+    upload = await run_in_threadpool(load_upload, upload_id, current_user.id)
+    checksum = parse_checksum(upload_checksum)
+    data = await read_chunk(request, min(chunk_length(upload, upload_offset), MAX_CHUNK_SIZE))
+
+    await run_in_threadpool(write_chunk, upload, upload_offset, data, checksum)
+    progress = await run_in_threadpool(upload_status, upload)
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(progress["offset"])}
+    )
+
+@router.post("/{upload_id}/finalize", response_model=UploadResponse)
+def complete_upload(
+    upload_id: str,
+    current_user: User = Depends(get_approved_seller)
+):
+    """Assemble the upload; pass its id as upload_id when creating the product"""
+    upload = load_upload(upload_id, current_user.id)
+    finalize_upload(upload)
+    return upload_status(upload)
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_upload(
+    upload_id: str,
+    current_user: User = Depends(get_approved_seller)
+):
+    """Abort an upload and discard what was received"""
+    load_upload(upload_id, current_user.id)
+    delete_upload(upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
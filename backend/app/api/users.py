@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.core.database import get_db
-from app.models.user import User, UserRole
+from app.core.load_profiles import load_profile
+from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 from app.api.auth import get_current_user
+from app.core.responses import fast_response
+from app.utils.fieldsets import FIELDS_DESCRIPTION, parse_fields, load_only_options, sparse_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: User = Depends(get_current_user)
+):
+    selected = parse_fields(fields, UserResponse)
+    if selected is not None:
+        return sparse_response(current_user, UserResponse, selected)
     return current_user
 
 @router.put("/me", response_model=UserResponse)
@@ -35,7 +44,15 @@ def update_current_user(
 def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=0, le=100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
\ No newline at end of file
+    selected = parse_fields(fields, UserResponse)
+    
+    users = db.query(User).options(
+        *(load_only_options(User, selected) or load_profile(User, "listing"))
+    ).offset(skip).limit(limit).all()
+    
+    if selected is not None:
+        return sparse_response(users, UserResponse, selected)
+    return fast_response(users, List[UserResponse])
\ No newline at end of file
@@ -0,0 +1,124 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import FrozenSet, List
+
+from app.core import events
+from app.core.cache import TTLCache
+from app.core.change_feed import WISHLIST, record_change
+from app.core.database import get_db
+from app.core.replicas import get_read_db
+from app.core.responses import fast_response
+from app.models.product import Product
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.schemas.product import ProductList
+from app.schemas.wishlist import WishlistItemResponse
+from app.api.auth import get_current_user
+from app.api.products import to_product_list, listing_load_options, hydrate_products
+
+router = APIRouter(prefix="/wishlist", tags=["wishlist"])
+
+# Product ids on each user's wishlist, used to flag listing pages
+wishlist_cache = TTLCache(maxsize=50_000, ttl=600.0)
+events.subscribe(events.WISHLIST_CHANGED, lambda user_id: wishlist_cache.delete(user_id))
+
+def wishlist_product_ids(db: Session, user_id: int) -> FrozenSet[int]:
+    """Ids of the products a user has wishlisted (one query, then cached)"""
+    product_ids = wishlist_cache.get(user_id)
+    if product_ids is None:
+        rows = db.query(Wishlist.product_id).filter(Wishlist.user_id == user_id).all()
+        product_ids = wishlist_cache.set(user_id, frozenset(row.product_id for row in rows))
+    return product_ids
+
+def change_wishlist_count(db: Session, product_id: int, delta: int):
+    """Adjust the denormalized counter in SQL so concurrent updates don't race"""
+    db.query(Product).filter(Product.id == product_id).update(
+        {Product.wishlist_count: Product.wishlist_count + delta},
+        synchronize_session=False
+    )
+
+@router.get("/", response_model=List[ProductList])
+def get_wishlist(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get the current user's wishlisted products, newest first"""
+    rows = db.query(Wishlist.product_id).filter(
+        Wishlist.user_id == current_user.id
+    ).order_by(Wishlist.created_at.desc(), Wishlist.id.desc()).all()
+    
+    products = hydrate_products(db, [row.product_id for row in rows], listing_load_options())
+    result = []
+    for product in products:
+        row = to_product_list(product)
+        row["is_wishlisted"] = True
+        result.append(row)
+    
+    return fast_response(result, List[ProductList])
+
+@router.post("/{product_id}", response_model=WishlistItemResponse)
+def add_to_wishlist(
+    product_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Add a product to the current user's wishlist"""
+    product = db.query(Product.id).filter(
+        Product.id == product_id,
+        Product.is_active == True,
+        Product.status == "active"
+    ).first()
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    item = db.query(Wishlist).filter(
+        Wishlist.user_id == current_user.id,
+        Wishlist.product_id == product_id
+    ).first()
+    
+    if not item:
+        item = Wishlist(user_id=current_user.id, product_id=product_id)
+        db.add(item)
+        change_wishlist_count(db, product_id, 1)
+        record_change(db, WISHLIST, current_user.id)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Added concurrently by another request
+            db.rollback()
+            item = db.query(Wishlist).filter(
+                Wishlist.user_id == current_user.id,
+                Wishlist.product_id == product_id
+            ).first()
+        events.publish(events.WISHLIST_CHANGED, user_id=current_user.id)
+    
+    wishlist_count = db.query(Product.wishlist_count).filter(Product.id == product_id).scalar()
+    return WishlistItemResponse(
+        product_id=product_id,
+        wishlist_count=wishlist_count or 0,
+        created_at=item.created_at
+    )
+
+@router.delete("/{product_id}")
+def remove_from_wishlist(
+    product_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Remove a product from the current user's wishlist"""
+    deleted = db.query(Wishlist).filter(
+        Wishlist.user_id == current_user.id,
+        Wishlist.product_id == product_id
+    ).delete(synchronize_session=False)
+    
+    if deleted:
+        change_wishlist_count(db, product_id, -deleted)
+        record_change(db, WISHLIST, current_user.id)
+    db.commit()
+    events.publish(events.WISHLIST_CHANGED, user_id=current_user.id)
+    
+    return {"message": "Product removed from wishlist"}
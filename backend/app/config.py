@@ -0,0 +1,34 @@
+"""
+Application settings, read from the environment (and a ``.env`` file).
+
+Only what every deployment needs is declared here.  Optional tuning knobs
+are read where they are used with ``getattr(settings, NAME, default)``, so a
+deployment sets them by adding attributes to ``Settings``.
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _list(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Settings:
+    def __init__(self, environ=os.environ):
+        secret_key = environ.get("SECRET_KEY")
+        if not secret_key:
+            raise RuntimeError("SECRET_KEY must be set (environment or .env)")
+        self.SECRET_KEY = secret_key
+        self.ALGORITHM = environ.get("ALGORITHM", "HS256")
+        self.ACCESS_TOKEN_EXPIRE_MINUTES = int(environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+        self.BACKEND_CORS_ORIGINS = _list(environ.get("BACKEND_CORS_ORIGINS", "http://localhost:5173"))
+
+        self.DATABASE_URL = environ.get("DATABASE_URL", "sqlite:///./app.db")
+        self.DATABASE_REPLICA_URLS = _list(environ.get("DATABASE_REPLICA_URLS", ""))
+        self.SHARED_KV_URL = environ.get("SHARED_KV_URL") or None
+
+
+settings = Settings()
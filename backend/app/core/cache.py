@@ -0,0 +1,102 @@
+"""
+Small in-process caches.
+
+``TTLCache`` is a thread-safe LRU map whose entries also expire after a
+fixed time-to-live.  It is shared by the endpoints that keep hot,
+read-mostly data in memory.
+"""
+from collections import OrderedDict
+import threading
+import time
+
+from app.core import events
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[1] < time.monotonic():
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_many(self, keys) -> dict:
+        """Cached values for the keys that are present"""
+        found = {}
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                found[key] = value
+        return found
+
+    def set(self, key, value, ttl: float = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def add(self, key, value, ttl: float = None) -> bool:
+        """Set ``key`` only if it is absent or expired; True if it was set"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] >= now:
+                return False
+            self._data[key] = (value, now + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate) -> int:
+        """Drop entries whose value matches ``predicate``; O(n), for rare bulk invalidations"""
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Serialized ProductResponse objects of active products, keyed by product id
+product_cache = TTLCache(maxsize=10_000, ttl=300.0)
+events.subscribe(events.PRODUCT_CHANGED, lambda product: product_cache.delete(product.id))
+
+
+def _evict_sellers(user_ids):
+    """Responses embed the seller's name and rating: one pass over the cache per batch"""
+    sellers = set(user_ids)
+    product_cache.delete_where(lambda response: response.seller_id in sellers)
+
+
+events.subscribe(events.USER_CHANGED, _evict_sellers)
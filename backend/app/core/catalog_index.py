@@ -0,0 +1,236 @@
+"""
+Columnar in-memory snapshot of the public catalog.
+
+The active catalog (``status=active`` and ``is_active``) is small enough to
+keep in RAM as a handful of NumPy arrays.  Filtering, sorting and paging
+for the public listing are then vectorized operations over those arrays,
+and only the rows of the requested page are hydrated from the database.
+
+Products are upserted on ``PRODUCT_CHANGED``.  Sold counts (written behind)
+and ratings change without that event, so ``catalog_refresh_task`` reloads
+them every ``CATALOG_REFRESH_SECONDS``.
+"""
+import threading
+
+import numpy as np
+from sqlalchemy import func
+
+from app.config import settings
+from app.core import events
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicTask
+from app.models.product import Product
+from app.models.review import Review
+
+# Listing sort options -> array holding the sort key
+SORT_KEYS = {
+    "created_at": "created_ts",
+    "price": "prices",
+    "sold_count": "sold_counts",
+    "rating": "ratings",
+    "trending": "trending_scores",
+}
+
+NO_CATEGORY = -1
+INITIAL_CAPACITY = 1024
+CATALOG_REFRESH_SECONDS = getattr(settings, "CATALOG_REFRESH_SECONDS", 60)
+
+
+def is_listed(product) -> bool:
+    """Whether a product belongs in the public listing"""
+    status = getattr(product.status, "value", product.status)
+    return bool(product.is_active) and status == "active"
+
+
+def _timestamp(value) -> int:
+    """Datetime -> integer microseconds, exact enough to reproduce SQL ordering"""
+    if value is None:
+        return 0
+    return int(value.timestamp() * 1_000_000)
+
+
+class CatalogIndex:
+    """Compact arrays of the listing columns, one row per active product"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.ready = False
+        self._allocate(INITIAL_CAPACITY)
+
+    def _allocate(self, capacity: int):
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.sold_counts = np.zeros(capacity, dtype=np.int64)
+        self.created_ts = np.zeros(capacity, dtype=np.int64)
+        self.ratings = np.zeros(capacity, dtype=np.float64)
+        self.trending_scores = np.zeros(capacity, dtype=np.float64)
+        self.category_ids = np.full(capacity, NO_CATEGORY, dtype=np.int64)
+        self.seller_ids = np.zeros(capacity, dtype=np.int64)
+        self.live = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._positions = {}
+        self._category_codes = {}
+        self._orders = {}
+
+    def _columns(self):
+        return ("ids", "prices", "sold_counts", "created_ts", "ratings",
+                "trending_scores", "category_ids", "seller_ids", "live")
+
+    def _grow(self):
+        capacity = max(INITIAL_CAPACITY, len(self.ids) * 2)
+        for name in self._columns():
+            old = getattr(self, name)
+            fill = NO_CATEGORY if name == "category_ids" else 0
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _compact(self):
+        rows = np.flatnonzero(self.live[:self._size])
+        for name in self._columns():
+            column = getattr(self, name)
+            column[:len(rows)] = column[rows]
+        self.live[len(rows):self._size] = False
+        self._size = len(rows)
+        self._dead = 0
+        self._positions = {int(pid): row for row, pid in enumerate(self.ids[:self._size])}
+
+    def _write(self, row: int, product):
+        category = product.category
+        if category is not None:
+            self._category_codes[category.name] = category.id
+        self.ids[row] = product.id
+        self.prices[row] = product.price or 0.0
+        self.sold_counts[row] = product.sold_count or 0
+        self.created_ts[row] = _timestamp(product.created_at)
+        self.ratings[row] = product.average_rating or 0.0
+        self.trending_scores[row] = product.trending_score or 0.0
+        self.category_ids[row] = product.category_id if product.category_id is not None else NO_CATEGORY
+        self.seller_ids[row] = product.seller_id
+        self.live[row] = True
+
+    def _upsert(self, product):
+        row = self._positions.get(product.id)
+        if row is None:
+            if self._size == len(self.ids):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._positions[product.id] = row
+        self._write(row, product)
+
+    def _remove(self, product_id: int):
+        row = self._positions.pop(product_id, None)
+        if row is None:
+            return
+        self.live[row] = False
+        self._dead += 1
+        if self._dead > self._size // 2:
+            self._compact()
+
+    def build(self, products):
+        """Replace the snapshot with the given active products"""
+        with self._lock:
+            self._allocate(INITIAL_CAPACITY)
+            for product in products:
+                if is_listed(product):
+                    self._upsert(product)
+            self.ready = True
+
+    def apply(self, product):
+        """Incrementally reflect a created, updated or delisted product"""
+        if not self.ready:
+            return
+        with self._lock:
+            if is_listed(product):
+                self._upsert(product)
+            else:
+                self._remove(product.id)
+            self._orders.clear()
+
+    def _replace(self, sort_by: str, values: dict):
+        column = getattr(self, SORT_KEYS[sort_by])
+        rows = [(self._positions[pid], value) for pid, value in values.items() if pid in self._positions]
+        if rows:
+            positions, new_values = zip(*rows)
+            column[list(positions)] = new_values
+        self._orders.pop(sort_by, None)
+
+    def update_scores(self, scores: dict):
+        """Bulk-replace trending scores ({product_id: score}) for indexed products"""
+        if not self.ready:
+            return
+        with self._lock:
+            self._replace("trending", scores)
+
+    def update_counts(self, sold_counts: dict, ratings: dict):
+        """Bulk-replace sold counts and ratings ({product_id: value}) for indexed products"""
+        if not self.ready:
+            return
+        with self._lock:
+            self._replace("sold_count", sold_counts)
+            self._replace("rating", ratings)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _sorted_rows(self, sort_by: str):
+        """Row positions in ascending (key, id) order, cached until the next change"""
+        order = self._orders.get(sort_by)
+        if order is None:
+            keys = getattr(self, SORT_KEYS[sort_by])[:self._size]
+            order = np.lexsort((self.ids[:self._size], keys))
+            self._orders[sort_by] = order
+        return order
+
+    def query(
+        self,
+        category: str = None,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list:
+        """Product ids for one listing page, ordered like ``ORDER BY key, id``"""
+        with self._lock:
+            mask = self.live[:self._size]
+            if category is not None:
+                code = self._category_codes.get(category)
+                if code is None:
+                    return []
+                mask = mask & (self.category_ids[:self._size] == code)
+
+            order = self._sorted_rows(sort_by)
+            rows = order[mask[order]]
+            if sort_order == "desc":
+                rows = rows[::-1]
+            return self.ids[rows[skip:skip + limit]].tolist()
+
+
+def refresh_catalog_counts(index: CatalogIndex = None, session_factory=SessionLocal):
+    """Periodic job: reload the sold counts and ratings of the listed products"""
+    index = catalog_index if index is None else index
+    if not index.ready:
+        return
+    listed = (Product.is_active == True, Product.status == "active")
+    db = session_factory()
+    try:
+        sold_counts = {
+            product_id: sold_count or 0
+            for product_id, sold_count in db.query(Product.id, Product.sold_count).filter(*listed)
+        }
+        averages = dict(db.query(Review.product_id, func.avg(Review.rating)).join(
+            Product, Product.id == Review.product_id
+        ).filter(*listed).group_by(Review.product_id).all())
+    finally:
+        db.close()
+    index.update_counts(
+        sold_counts,
+        {product_id: float(averages.get(product_id) or 0.0) for product_id in sold_counts}
+    )
+
+
+catalog_index = CatalogIndex()
+events.subscribe(events.PRODUCT_CHANGED, lambda product: catalog_index.apply(product))
+catalog_refresh_task = PeriodicTask("catalog-refresh", CATALOG_REFRESH_SECONDS, refresh_catalog_counts)
@@ -0,0 +1,221 @@
+"""
+Cross-worker cache invalidation through a database change log.
+
+In-process structures (the product cache, catalog and suggestion indexes,
+wishlist cache) are kept fresh by local events, which only reach the worker
+that made the change.  Mutations therefore also call ``record_change``
+before committing, adding a ``change_log`` row in the same transaction:
+the row exists exactly when the change does.
+
+Every worker polls the log every ``CHANGE_FEED_POLL_INTERVAL`` seconds for
+rows past its position (a primary key range scan) and re-publishes other
+workers' changes as local events, so other workers serve stale data for
+at most about one poll interval.  Changes of its own worker were already
+published locally and are skipped.
+
+Log ids are assigned at insert but become visible at commit, so a
+smaller id can show up after a larger one.  Ids skipped over are kept as
+gaps and looked up again on the following polls, for up to
+``CHANGE_FEED_GAP_TIMEOUT`` seconds (a rolled back insert leaves a gap that
+never fills).  Rows older than ``CHANGE_LOG_RETENTION_HOURS`` are pruned.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import socket
+import threading
+import time
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.config import settings
+from app.core import events, metrics
+from app.core.database import SessionLocal
+from app.core.load_profiles import load_profile
+from app.core.periodic import PeriodicTask
+from app.models.change_log import ChangeLog
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_POLL_INTERVAL = getattr(settings, "CHANGE_FEED_POLL_INTERVAL", 1.0)
+CHANGE_FEED_GAP_TIMEOUT = getattr(settings, "CHANGE_FEED_GAP_TIMEOUT", 60.0)
+CHANGE_LOG_RETENTION_HOURS = getattr(settings, "CHANGE_LOG_RETENTION_HOURS", 24)
+CHANGE_FEED_BATCH = 1000
+MAX_TRACKED_GAPS = 10_000
+PRUNE_INTERVAL = 60 * 60
+
+# Entities
+PRODUCT = "product"
+USER = "user"
+WISHLIST = "wishlist"
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def record_change(db, entity: str, *entity_ids: int):
+    """Log changed entities in the caller's transaction (call before committing)"""
+    origin = change_feed.origin or worker_id()
+    # One multi-row INSERT, however large the batch
+    db.execute(insert(ChangeLog), [
+        {"entity": entity, "entity_id": entity_id, "origin": origin} for entity_id in entity_ids
+    ])
+
+
+def publish_products(product_ids: list):
+    """Reload changed products and publish them as ``PRODUCT_CHANGED``"""
+    db = SessionLocal()
+    try:
+        products = db.query(Product).options(
+            *load_profile(Product, "detail"),
+            joinedload(Product.category),
+            selectinload(Product.reviews)
+        ).filter(Product.id.in_(product_ids)).all()
+        for product in products:
+            events.publish(events.PRODUCT_CHANGED, product=product)
+    finally:
+        db.close()
+
+
+def publish_users(user_ids: list):
+    events.publish(events.USER_CHANGED, user_ids=user_ids)
+
+
+def publish_wishlists(user_ids: list):
+    for user_id in user_ids:
+        events.publish(events.WISHLIST_CHANGED, user_id=user_id)
+
+
+# Entity -> re-publishes a batch of remote changes as local events
+PUBLISHERS = {
+    PRODUCT: publish_products,
+    USER: publish_users,
+    WISHLIST: publish_wishlists,
+}
+
+
+class ChangeFeed:
+    """Follows the change log and replays other workers' changes on this one"""
+
+    def __init__(self, poll_interval: float = CHANGE_FEED_POLL_INTERVAL):
+        self.origin = None
+        self.position = None  # Highest log id seen
+        self._gaps = {}  # Skipped log id -> when first missed (monotonic)
+        self._lock = threading.Lock()
+        self._task = PeriodicTask("change-feed", poll_interval, self.poll)
+        self._last_prune = 0.0
+
+        self.polls = 0
+        self.applied = 0
+        self.errors = 0
+        self.last_poll_at = None
+        self.last_delay = 0.0  # Seconds from commit to replay, latest batch
+
+    def start(self):
+        """Take the current end of the log as position; start before loading caches"""
+        self.origin = worker_id()
+        if self.position is None:
+            db = SessionLocal()
+            try:
+                self.position = db.query(func.coalesce(func.max(ChangeLog.id), 0)).scalar()
+            finally:
+                db.close()
+        self._task.start()
+
+    def stop(self):
+        self._task.stop()
+
+    def poll(self):
+        """Replay the changes committed since the last poll"""
+        with self._lock:
+            if self.position is None:
+                return
+            db = SessionLocal()
+            try:
+                while True:
+                    rows = self._read(db)
+                    self._apply(rows)
+                    if len(rows) < CHANGE_FEED_BATCH:
+                        break
+                self._prune(db)
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                db.close()
+                self.polls += 1
+                self.last_poll_at = datetime.now(timezone.utc)
+
+    def _read(self, db) -> list:
+        rows = db.query(ChangeLog).filter(
+            ChangeLog.id > self.position
+        ).order_by(ChangeLog.id).limit(CHANGE_FEED_BATCH).all()
+        if self._gaps:
+            rows += db.query(ChangeLog).filter(ChangeLog.id.in_(list(self._gaps))).all()
+
+        now = time.monotonic()
+        top = max((row.id for row in rows), default=self.position)
+        seen = {row.id for row in rows}
+        for log_id in seen:
+            self._gaps.pop(log_id, None)
+        if top - self.position <= MAX_TRACKED_GAPS:
+            for log_id in range(self.position + 1, top):
+                if log_id not in seen:
+                    self._gaps[log_id] = now
+        else:
+            # A sequence jump (restore, reset) rather than in-flight commits
+            logger.warning("Change log jumped from %d to %d; not tracking gaps", self.position, top)
+        for log_id, missed_at in list(self._gaps.items()):
+            if now - missed_at > CHANGE_FEED_GAP_TIMEOUT:
+                del self._gaps[log_id]
+        self.position = top
+        return rows
+
+    def _apply(self, rows: list):
+        changed = defaultdict(set)
+        newest = None
+        for row in rows:
+            if row.origin == self.origin:
+                continue
+            changed[row.entity].add(row.entity_id)
+            newest = row.created_at if newest is None else max(newest, row.created_at)
+
+        for entity, entity_ids in changed.items():
+            publisher = PUBLISHERS.get(entity)
+            if publisher is None:
+                logger.warning("No publisher for change log entity %s", entity)
+                continue
+            publisher(sorted(entity_ids))
+            self.applied += len(entity_ids)
+
+        if newest is not None:
+            newest = newest if newest.tzinfo else newest.replace(tzinfo=timezone.utc)
+            self.last_delay = max(0.0, (datetime.now(timezone.utc) - newest).total_seconds())
+
+    def _prune(self, db):
+        if time.monotonic() - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=CHANGE_LOG_RETENTION_HOURS)
+        db.query(ChangeLog).filter(ChangeLog.created_at < cutoff).delete(synchronize_session=False)
+        db.commit()
+
+    def metrics(self) -> dict:
+        return {
+            "origin": self.origin,
+            "position": self.position,
+            "pending_gaps": len(self._gaps),
+            "polls": self.polls,
+            "applied": self.applied,
+            "errors": self.errors,
+            "last_poll_at": self.last_poll_at.isoformat() if self.last_poll_at else None,
+            "last_delay_ms": round(self.last_delay * 1000, 2),
+        }
+
+
+change_feed = ChangeFeed()
+metrics.register("change_feed", change_feed.metrics)
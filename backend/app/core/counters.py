@@ -0,0 +1,122 @@
+"""
+Write-behind counters (views, downloads, sales).
+
+Incrementing a hot product's counter with one ``UPDATE`` per event makes
+every request queue on the same row lock.  Instead each worker adds the
+increments up in memory and flushes them every ``COUNTER_FLUSH_INTERVAL_MS``
+as one batched ``UPDATE ... SET x = x + :delta`` per column, in a single
+transaction.  Counter reads therefore lag by at most one flush interval
+(plus the flush itself); pending increments are flushed on shutdown.
+"""
+from collections import defaultdict
+import logging
+import threading
+import time
+
+from sqlalchemy import bindparam, func
+
+from app.config import settings
+from app.core import metrics
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FLUSH_INTERVAL_MS = getattr(settings, "COUNTER_FLUSH_INTERVAL_MS", 1000)
+
+
+class WriteBehindCounters:
+    """Per-worker buffer of counter deltas keyed by (model, column, primary key)"""
+
+    def __init__(self, session_factory=SessionLocal, flush_interval_ms: int = COUNTER_FLUSH_INTERVAL_MS):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self._pending = defaultdict(int)
+        self._oldest = None  # When the oldest unflushed increment arrived
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task = PeriodicTask("counter-flush", self.flush_interval, self.flush, run_on_stop=True)
+
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.errors = 0
+        self.last_flush_duration = 0.0
+
+    def incr(self, model, column: str, pk: int, delta: int = 1):
+        """Record an increment; O(1) and never touches the database"""
+        with self._lock:
+            self._pending[(model, column, pk)] += delta
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def pending(self, model, column: str, pk: int) -> int:
+        """Increments not yet written for one counter"""
+        with self._lock:
+            return self._pending.get((model, column, pk), 0)
+
+    def flush(self):
+        """Write all pending increments in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(int)
+                self._oldest = None
+            if not batch:
+                return
+
+            statements = defaultdict(list)
+            for (model, column, pk), delta in batch.items():
+                if delta:
+                    statements[(model, column)].append({"_pk": pk, "_delta": delta})
+
+            started = time.monotonic()
+            db = self.session_factory()
+            try:
+                for (model, column), rows in statements.items():
+                    table = model.__table__
+                    stmt = table.update().where(
+                        table.c.id == bindparam("_pk")
+                    ).values({
+                        column: func.coalesce(table.c[column], 0) + bindparam("_delta")
+                    })
+                    db.execute(stmt, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.errors += 1
+                logger.exception("Counter flush failed; keeping %d deltas for the next attempt", len(batch))
+                with self._lock:
+                    for key, delta in batch.items():
+                        self._pending[key] += delta
+                    self._oldest = self._oldest or started
+                return
+            finally:
+                db.close()
+
+            self.flushes += 1
+            self.rows_flushed += len(batch)
+            self.last_flush_duration = time.monotonic() - started
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lag = time.monotonic() - self._oldest if self._oldest is not None else 0.0
+            return {
+                "pending_counters": len(self._pending),
+                "pending_increments": sum(self._pending.values()),
+                "lag_seconds": round(lag, 3),
+                "flush_interval_seconds": self.flush_interval,
+                "flushes": self.flushes,
+                "rows_flushed": self.rows_flushed,
+                "errors": self.errors,
+                "last_flush_ms": round(self.last_flush_duration * 1000, 2),
+            }
+
+    def start(self):
+        self._task.start()
+
+    def stop(self):
+        """Stop the flusher, writing whatever is still pending"""
+        self._task.stop()
+
+
+counters = WriteBehindCounters()
+metrics.register("counters", counters.metrics)
@@ -0,0 +1,40 @@
+"""
+In-process domain events.
+
+Endpoints publish an event after their transaction commits; in-memory
+structures (indexes, caches) subscribe to keep themselves up to date.
+"""
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# === Event names ===
+PRODUCT_CHANGED = "product.changed"  # payload: product
+PRODUCT_VIEWED = "product.viewed"  # payload: product_id
+ORDER_PLACED = "order.placed"  # payload: items, a list of (product_id, quantity)
+USER_CHANGED = "user.changed"  # payload: user_ids, a list (one event per batch)
+WISHLIST_CHANGED = "wishlist.changed"  # payload: user_id
+
+_subscribers = defaultdict(list)
+
+
+def subscribe(event: str, handler):
+    """Register a handler called with the event payload as keyword arguments"""
+    _subscribers[event].append(handler)
+    return handler
+
+
+def unsubscribe(event: str, handler):
+    """Remove a previously registered handler"""
+    if handler in _subscribers[event]:
+        _subscribers[event].remove(handler)
+
+
+def publish(event: str, **payload):
+    """Call every handler for the event; a failing handler never breaks the request"""
+    for handler in list(_subscribers[event]):
+        try:
+            handler(**payload)
+        except Exception:
+            logger.exception("Handler %r failed for event %s", handler, event)
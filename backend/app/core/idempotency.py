@@ -0,0 +1,168 @@
+"""
+``Idempotency-Key`` support for unsafe POSTs.
+
+The first request with a key claims it atomically and runs normally.  Its
+response is stored under the key for ``IDEMPOTENCY_TTL`` when it is final
+(2xx, or a client error that a retry would repeat); anything else releases
+the key so the client can retry.  Duplicates arriving while it is still in
+flight wait for it; later duplicates get the stored response replayed
+without reaching the endpoint (and therefore without touching the
+database).  Keys are scoped to the method, path and credentials of the
+request.
+"""
+import asyncio
+import base64
+import hashlib
+import time
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app.core.kvstore import create_store
+
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IN_FLIGHT_TTL = 120  # Marker lifetime, in case the owning worker dies mid-request
+WAIT_TIMEOUT = 60.0
+POLL_INTERVAL = 0.1
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENT_ROUTES = {
+    ("POST", "/api/v1/orders"),
+    ("POST", "/api/v1/sellers/apply"),
+    ("POST", "/api/v1/products"),
+}
+
+# Client errors that a retry with the same body would repeat; others (401,
+# 409, 429, ...) depend on state that may change before the retry
+REPLAYED_CLIENT_ERRORS = {400, 422}
+
+IN_PROGRESS = "in_progress"
+DONE = "done"
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware storing and replaying responses by idempotency key"""
+
+    def __init__(self, app, routes=IDEMPOTENT_ROUTES, store=None, ttl: int = IDEMPOTENCY_TTL):
+        self.app = app
+        self.routes = routes
+        self.ttl = ttl
+        self.store = store or create_store("idempotency", maxsize=100_000, ttl=ttl)
+        self._in_flight = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"].rstrip("/")) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if not key:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"},
+                status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        storage_key = self.storage_key(scope, headers, key)
+        while True:
+            record = await self.wait_for_record(storage_key)
+            if record is not None and record["state"] == DONE:
+                await self.replay(record, send)
+                return
+            if record is not None:
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still being processed"},
+                    status_code=409
+                )
+                await response(scope, receive, send)
+                return
+            # Another worker may claim the key between the read and the claim
+            if self.store.add(storage_key, {"state": IN_PROGRESS}, ttl=IN_FLIGHT_TTL):
+                break
+
+        await self.run_first(storage_key, scope, receive, send)
+
+    def storage_key(self, scope, headers: Headers, key: str) -> str:
+        scope_parts = "\n".join([
+            scope["method"],
+            scope["path"].rstrip("/"),
+            headers.get("authorization", ""),
+            key,
+        ])
+        return hashlib.sha256(scope_parts.encode("utf-8")).hexdigest()
+
+    async def wait_for_record(self, storage_key: str):
+        """Stored record for the key, waiting while another request holds it"""
+        record = self.store.get(storage_key)
+        if record is None or record["state"] == DONE:
+            return record
+
+        event = self._in_flight.get(storage_key)
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        if event is not None:
+            # Same worker: wake up as soon as the first request finishes
+            try:
+                await asyncio.wait_for(event.wait(), WAIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            return self.store.get(storage_key)
+
+        # Another worker owns the key: poll the shared store
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            record = self.store.get(storage_key)
+            if record is None or record["state"] == DONE:
+                return record
+        return record
+
+    def is_final(self, status: int) -> bool:
+        """Whether a response with this status is stored and replayed"""
+        return 200 <= status < 300 or status in REPLAYED_CLIENT_ERRORS
+
+    async def run_first(self, storage_key: str, scope, receive, send):
+        """Run the request whose claim on the key succeeded"""
+        event = asyncio.Event()
+        self._in_flight[storage_key] = event
+
+        response = {"status": None, "headers": [], "body": []}
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        finally:
+            if response["status"] is not None and self.is_final(response["status"]):
+                self.store.set(storage_key, {
+                    "state": DONE,
+                    "status": response["status"],
+                    "headers": response["headers"],
+                    "body": base64.b64encode(b"".join(response["body"])).decode("ascii"),
+                }, ttl=self.ttl)
+            else:
+                # Server errors and transient client errors are not cached so the client can retry
+                self.store.delete(storage_key)
+            event.set()
+            self._in_flight.pop(storage_key, None)
+
+    async def replay(self, record: dict, send):
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in record["headers"]
+        ]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
@@ -0,0 +1,487 @@
+"""
+Durable background jobs without an external broker.
+
+Work that should not run inside a request (notifications, file cleanup, ...)
+is enqueued as a row of the ``jobs`` table, in the same transaction as the
+change that caused it: the job exists exactly when that change is
+committed.  A ``JobRunner`` on each API worker's event loop claims ready
+jobs and runs them.
+
+- Handlers register with ``@job(name, queue=...)``.  Coroutine handlers run
+  on the event loop, plain functions in a thread, and handlers registered
+  with ``executor="process"`` (CPU-bound, module-level functions taking
+  picklable arguments) in a process pool.
+- Each queue has its own concurrency limit (``JOB_QUEUES``, per worker
+  process); within a queue higher ``priority`` runs first, then the longest
+  waiting job.
+- A failing job is retried with exponential backoff and jitter until its
+  ``max_attempts``, then kept as ``failed`` for inspection.
+- Claims use ``FOR UPDATE SKIP LOCKED``, so any number of workers share the
+  table.  Running jobs hold a lease the runner renews; the job of a worker
+  that died is requeued once its lease expires.
+- On shutdown the runner stops claiming, gives running jobs
+  ``JOB_SHUTDOWN_TIMEOUT`` seconds and requeues the rest without charging an
+  attempt.
+
+A job can therefore run more than once; handlers must be idempotent.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import time
+import traceback
+
+from sqlalchemy import event, func, insert
+
+from app.config import settings
+from app.core import metrics
+from app.core.database import SessionLocal
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Queue -> jobs run at once by one worker process
+JOB_QUEUES = getattr(settings, "JOB_QUEUES", {
+    "default": 4,
+    "notifications": 8,
+    "files": 1,
+    "cpu": os.cpu_count() or 1,
+})
+JOB_POLL_INTERVAL = getattr(settings, "JOB_POLL_INTERVAL", 1.0)
+JOB_LEASE_SECONDS = getattr(settings, "JOB_LEASE_SECONDS", 5 * 60)
+JOB_SHUTDOWN_TIMEOUT = getattr(settings, "JOB_SHUTDOWN_TIMEOUT", 20.0)
+JOB_RETRY_BASE_SECONDS = 10
+JOB_RETRY_MAX_SECONDS = 60 * 60
+JOB_RETENTION_DAYS = getattr(settings, "JOB_RETENTION_DAYS", 7)  # Succeeded jobs
+JOB_PROCESS_WORKERS = getattr(settings, "JOB_PROCESS_WORKERS", os.cpu_count() or 1)
+MAINTENANCE_INTERVAL = JOB_LEASE_SECONDS / 3
+
+EXECUTORS = ("async", "thread", "process")
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    name: str
+    func: object
+    queue: str
+    executor: str
+    max_attempts: int
+    timeout: float = None
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    name: str
+    queue: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    waited: float  # Seconds between becoming ready and being claimed
+
+
+_registry = {}
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; everything is stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def job(name: str, queue: str = "default", executor: str = None, max_attempts: int = 5, timeout: float = None):
+    """Register the decorated function as the handler of jobs called ``name``"""
+    def decorator(func):
+        kind = executor or ("async" if asyncio.iscoroutinefunction(func) else "thread")
+        if kind not in EXECUTORS:
+            raise ValueError(f"Unknown executor {kind!r}; use one of {EXECUTORS}")
+        if queue not in JOB_QUEUES:
+            raise ValueError(f"Unknown job queue {queue!r}")
+        _registry[name] = JobSpec(name, func, queue, kind, max_attempts, timeout)
+        return func
+    return decorator
+
+
+def enqueue(db, name: str, payload: dict = None, priority: int = 0, delay: float = 0) -> Job:
+    """Add a job to the caller's session; it is committed (and run) with the caller's transaction"""
+    spec = _registry[name]
+    queued = Job(
+        queue=spec.queue,
+        name=name,
+        payload=json.dumps(payload or {}),
+        priority=priority,
+        status=JobStatus.QUEUED,
+        attempts=0,
+        max_attempts=spec.max_attempts,
+        run_at=utcnow() + timedelta(seconds=delay)
+    )
+    db.add(queued)
+    _wake_on_commit(db)
+    return queued
+
+
+def enqueue_many(db, name: str, payloads: list, priority: int = 0, delay: float = 0):
+    """Add one job per payload to the caller's transaction in a single multi-row INSERT"""
+    if not payloads:
+        return
+    spec = _registry[name]
+    run_at = utcnow() + timedelta(seconds=delay)
+    db.execute(insert(Job), [
+        {
+            "queue": spec.queue,
+            "name": name,
+            "payload": json.dumps(payload or {}),
+            "priority": priority,
+            "status": JobStatus.QUEUED,
+            "attempts": 0,
+            "max_attempts": spec.max_attempts,
+            "run_at": run_at,
+        }
+        for payload in payloads
+    ])
+    _wake_on_commit(db)
+
+
+def _wake_on_commit(db):
+    if not db.info.get("wakes_job_runner"):
+        db.info["wakes_job_runner"] = True
+        event.listen(db, "after_commit", lambda session: job_runner.wake())
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: about 10s, 20s, 40s, ... capped at an hour"""
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# === Job table operations (blocking; the runner calls them in threads) ===
+
+def claim_jobs(queue: str, limit: int, worker_id: str) -> list:
+    """Lease up to ``limit`` ready jobs of ``queue`` to this worker"""
+    db = SessionLocal()
+    try:
+        now = utcnow()
+        jobs = db.query(Job).filter(
+            Job.queue == queue,
+            Job.status == JobStatus.QUEUED,
+            Job.run_at <= now
+        ).order_by(
+            Job.priority.desc(), Job.run_at, Job.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for queued in jobs:
+            queued.status = JobStatus.RUNNING
+            queued.attempts += 1
+            queued.locked_by = worker_id
+            queued.locked_at = now
+            queued.started_at = now
+            claimed.append(ClaimedJob(
+                id=queued.id,
+                name=queued.name,
+                queue=queued.queue,
+                payload=json.loads(queued.payload or "{}"),
+                attempts=queued.attempts,
+                max_attempts=queued.max_attempts,
+                waited=max(0.0, (now - _aware(queued.run_at)).total_seconds())
+            ))
+        db.commit()
+        return claimed
+    finally:
+        db.close()
+
+
+def _leased(db, job_id: int, worker_id: str):
+    # A job whose lease expired may already be running elsewhere; leave it alone
+    return db.query(Job).filter(
+        Job.id == job_id,
+        Job.status == JobStatus.RUNNING,
+        Job.locked_by == worker_id
+    )
+
+
+def complete_job(job_id: int, worker_id: str):
+    db = SessionLocal()
+    try:
+        _leased(db, job_id, worker_id).update({
+            Job.status: JobStatus.SUCCEEDED,
+            Job.locked_by: None,
+            Job.locked_at: None,
+            Job.last_error: None,
+            Job.finished_at: utcnow(),
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def fail_job(claimed: ClaimedJob, worker_id: str, error: str) -> bool:
+    """Record a failed attempt; returns whether the job will be retried"""
+    retry = claimed.attempts < claimed.max_attempts
+    values = {Job.locked_by: None, Job.locked_at: None, Job.last_error: error}
+    if retry:
+        values.update({
+            Job.status: JobStatus.QUEUED,
+            Job.run_at: utcnow() + timedelta(seconds=retry_delay(claimed.attempts)),
+        })
+    else:
+        values.update({Job.status: JobStatus.FAILED, Job.finished_at: utcnow()})
+
+    db = SessionLocal()
+    try:
+        _leased(db, claimed.id, worker_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    return retry
+
+
+def release_job(job_id: int, worker_id: str):
+    """Requeue an interrupted job without charging the attempt"""
+    db = SessionLocal()
+    try:
+        _leased(db, job_id, worker_id).update({
+            Job.status: JobStatus.QUEUED,
+            Job.attempts: Job.attempts - 1,
+            Job.locked_by: None,
+            Job.locked_at: None,
+            Job.run_at: utcnow(),
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def maintain_jobs(worker_id: str, running_ids: list):
+    """Renew this worker's leases, requeue expired ones and prune old succeeded jobs"""
+    now = utcnow()
+    expired = now - timedelta(seconds=JOB_LEASE_SECONDS)
+    db = SessionLocal()
+    try:
+        if running_ids:
+            db.query(Job).filter(
+                Job.id.in_(running_ids),
+                Job.locked_by == worker_id
+            ).update({Job.locked_at: now}, synchronize_session=False)
+
+        stale = db.query(Job).filter(Job.status == JobStatus.RUNNING, Job.locked_at < expired)
+        exhausted = stale.filter(Job.attempts >= Job.max_attempts).update({
+            Job.status: JobStatus.FAILED,
+            Job.locked_by: None,
+            Job.last_error: "Lease expired (worker lost)",
+            Job.finished_at: now,
+        }, synchronize_session=False)
+        requeued = stale.update({
+            Job.status: JobStatus.QUEUED,
+            Job.locked_by: None,
+            Job.locked_at: None,
+            Job.run_at: now,
+        }, synchronize_session=False)
+
+        db.query(Job).filter(
+            Job.status == JobStatus.SUCCEEDED,
+            Job.finished_at < now - timedelta(days=JOB_RETENTION_DAYS)
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    if requeued or exhausted:
+        logger.warning("Recovered %d jobs with expired leases (%d failed for good)", requeued + exhausted, exhausted)
+
+
+def queue_stats(db) -> dict:
+    """Per-queue job counts by status and the age of the oldest ready job"""
+    now = utcnow()
+    queues = {
+        name: {"queued": 0, "scheduled": 0, "running": 0, "failed": 0, "oldest_ready_seconds": 0.0}
+        for name in JOB_QUEUES
+    }
+    ready = Job.run_at <= now
+    rows = db.query(
+        Job.queue, Job.status, ready.label("ready"), func.count(Job.id), func.min(Job.run_at)
+    ).filter(
+        Job.status != JobStatus.SUCCEEDED
+    ).group_by(Job.queue, Job.status, ready).all()
+
+    for queue, status, is_ready, count, oldest in rows:
+        stats = queues.setdefault(
+            queue, {"queued": 0, "scheduled": 0, "running": 0, "failed": 0, "oldest_ready_seconds": 0.0}
+        )
+        if status == JobStatus.QUEUED and is_ready:
+            stats["queued"] += count
+            stats["oldest_ready_seconds"] = round((now - _aware(oldest)).total_seconds(), 3)
+        elif status == JobStatus.QUEUED:
+            stats["scheduled"] += count
+        elif status in stats:
+            stats[status] += count
+    return queues
+
+
+# === Runner ===
+
+class JobRunner:
+    """Claims and runs jobs on the event loop of one worker process"""
+
+    def __init__(self, queues: dict):
+        self.queues = dict(queues)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running = {queue: {} for queue in self.queues}  # queue -> {asyncio task: job id}
+        self._loop = None
+        self._wake = None
+        self._task = None
+        self._stopping = False
+        self._pool = None
+        self._stats = {
+            queue: {"succeeded": 0, "failed": 0, "retried": 0, "wait_seconds": 0.0, "run_seconds": 0.0}
+            for queue in self.queues
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="job-runner")
+
+    async def stop(self, timeout: float = JOB_SHUTDOWN_TIMEOUT):
+        """Stop claiming, let running jobs finish within ``timeout``, requeue the rest"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+        tasks = [task for running in self._running.values() for task in running]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def wake(self):
+        """Look for ready jobs now instead of at the next poll (thread-safe)"""
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:  # Loop closed meanwhile
+                pass
+
+    async def _run(self):
+        last_maintenance = 0.0
+        while not self._stopping:
+            try:
+                if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                    running_ids = [job_id for running in self._running.values() for job_id in running.values()]
+                    await asyncio.to_thread(maintain_jobs, self.worker_id, running_ids)
+                    last_maintenance = time.monotonic()
+                claimed = await self._claim()
+            except Exception:
+                logger.exception("Job runner poll failed")
+                claimed = 0
+            if claimed:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim(self) -> int:
+        claimed = 0
+        for queue, limit in self.queues.items():
+            free = limit - len(self._running[queue])
+            if free <= 0 or self._stopping:
+                continue
+            for claimed_job in await asyncio.to_thread(claim_jobs, queue, free, self.worker_id):
+                task = asyncio.create_task(self._execute(claimed_job), name=f"job-{claimed_job.id}")
+                self._running[queue][task] = claimed_job.id
+                task.add_done_callback(functools.partial(self._finished, queue))
+                claimed += 1
+        return claimed
+
+    def _finished(self, queue: str, task):
+        self._running[queue].pop(task, None)
+        self._wake.set()  # A slot is free
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Fresh interpreters: forking a process that runs threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=JOB_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _call(self, spec: JobSpec, payload: dict):
+        if spec.executor == "async":
+            return spec.func(**payload)
+        if spec.executor == "thread":
+            return asyncio.to_thread(spec.func, **payload)
+        return self._loop.run_in_executor(self._process_pool(), functools.partial(spec.func, **payload))
+
+    async def _execute(self, claimed: ClaimedJob):
+        stats = self._stats[claimed.queue]
+        started = time.perf_counter()
+        try:
+            spec = _registry.get(claimed.name)
+            if spec is None:
+                raise LookupError(f"No handler registered for job {claimed.name!r}")
+            await asyncio.wait_for(self._call(spec, claimed.payload), spec.timeout)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(release_job, claimed.id, self.worker_id)
+            raise
+        except Exception:
+            error = traceback.format_exc(limit=20)
+            retry = await asyncio.to_thread(fail_job, claimed, self.worker_id, error)
+            stats["retried" if retry else "failed"] += 1
+            logger.warning(
+                "Job %s #%d failed (attempt %d/%d)%s",
+                claimed.name, claimed.id, claimed.attempts, claimed.max_attempts,
+                ", will retry" if retry else "", exc_info=True
+            )
+        else:
+            await asyncio.to_thread(complete_job, claimed.id, self.worker_id)
+            stats["succeeded"] += 1
+        finally:
+            stats["wait_seconds"] += claimed.waited
+            stats["run_seconds"] += time.perf_counter() - started
+
+    def metrics(self) -> dict:
+        result = {"worker": self.worker_id, "running": self.running, "queues": {}}
+        for queue, stats in self._stats.items():
+            finished = stats["succeeded"] + stats["failed"] + stats["retried"]
+            result["queues"][queue] = {
+                "concurrency": self.queues[queue],
+                "active": len(self._running[queue]),
+                "succeeded": stats["succeeded"],
+                "failed": stats["failed"],
+                "retried": stats["retried"],
+                "avg_wait_ms": round(stats["wait_seconds"] / finished * 1000, 2) if finished else 0.0,
+                "avg_run_ms": round(stats["run_seconds"] / finished * 1000, 2) if finished else 0.0,
+            }
+        return result
+
+
+job_runner = JobRunner(JOB_QUEUES)
+metrics.register("jobs", job_runner.metrics)
@@ -0,0 +1,127 @@
+"""
+Pluggable key-value stores for short-lived state (carts, idempotency records,
+rate-limit buckets).
+
+``MemoryStore`` keeps values in the worker process.  ``SharedStore`` keeps
+JSON-encoded values in a Redis-style client (``get``/``set(ex=, nx=)``/``delete``)
+so several workers see the same data; ``LocalKeyValueClient`` is an
+in-process stand-in for that client.
+"""
+import json
+import threading
+import time
+
+from app.core.cache import TTLCache
+from app.config import settings
+
+
+class MemoryStore:
+    """Process-local store: LRU-bounded, entries expire after their TTL"""
+
+    def __init__(self, maxsize: int = 100_000, ttl: float = 3600.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def set(self, key: str, value, ttl: float = None):
+        self._cache.set(key, value, ttl)
+
+    def add(self, key: str, value, ttl: float = None) -> bool:
+        """Set ``key`` only if it is absent; True if it was set"""
+        return self._cache.add(key, value, ttl)
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+
+class LocalKeyValueClient:
+    """In-process stand-in for a shared key-value server"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value, ex: int = None, nx: bool = False):
+        now = time.monotonic()
+        expires = now + ex if ex else None
+        with self._lock:
+            if nx:
+                entry = self._data.get(key)
+                if entry is not None and (entry[1] is None or entry[1] >= now):
+                    return None
+            self._data[key] = (value, expires)
+        return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SharedStore:
+    """Store backed by a shared key-value client; values must be JSON-serializable"""
+
+    def __init__(self, client, namespace: str, ttl: float = 3600.0):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str):
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def set(self, key: str, value, ttl: float = None):
+        seconds = max(1, int(self.ttl if ttl is None else ttl))
+        self.client.set(self._key(key), json.dumps(value), ex=seconds)
+
+    def add(self, key: str, value, ttl: float = None) -> bool:
+        """Set ``key`` only if it is absent (``SET NX``); True if it was set"""
+        seconds = max(1, int(self.ttl if ttl is None else ttl))
+        return bool(self.client.set(self._key(key), json.dumps(value), ex=seconds, nx=True))
+
+    def delete(self, key: str):
+        self.client.delete(self._key(key))
+
+
+_shared_client = None
+
+
+def shared_client():
+    """Client for ``settings.SHARED_KV_URL`` (Redis protocol), or None if not configured"""
+    global _shared_client
+    url = getattr(settings, "SHARED_KV_URL", None)
+    if not url:
+        return None
+    if _shared_client is None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "SHARED_KV_URL is set but the redis package is not installed (pip install redis)"
+            ) from exc
+        _shared_client = redis.Redis.from_url(url)
+    return _shared_client
+
+
+def create_store(namespace: str, maxsize: int = 100_000, ttl: float = 3600.0):
+    """Shared store when a shared backend is configured, otherwise a per-worker one"""
+    client = shared_client()
+    if client is not None:
+        return SharedStore(client, namespace, ttl=ttl)
+    return MemoryStore(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,67 @@
+"""
+Named ORM load profiles for ``User`` and ``Product``.
+
+Bulky or rarely read columns are deferred in groups on the models, so a
+plain query already skips them:
+
+- ``User``: ``profile`` (bios, seller application details) and ``address``
+  (postal and payment details)
+- ``Product``: ``content`` (description, gallery) and ``seo``
+
+Endpoints declare the profile matching what they read:
+
+- ``auth``: identity, role and login state (token checks, login)
+- ``listing``: the columns of list rows
+- ``ownership``: just enough to check who owns a product
+- ``detail``: everything, deferred groups included
+
+A column outside the profile is still loaded on first access (a whole
+deferred group at a time), so a too-slim profile costs a query, not an
+error.
+"""
+from functools import lru_cache
+
+from sqlalchemy.orm import load_only, undefer_group
+
+from app.models.product import Product
+from app.models.user import User
+
+DEFERRED_GROUPS = {
+    User: ("profile", "address"),
+    Product: ("content", "seo"),
+}
+
+
+@lru_cache(maxsize=None)
+def profiles() -> dict:
+    """Options of every profile, built on first use (``load_only`` needs all models mapped)"""
+    return {
+        User: {
+            "auth": (load_only(
+                User.id, User.email, User.username, User.full_name, User.role,
+                User.is_active, User.is_seller_approved, User.store_name,
+                User.hashed_password, User.login_attempts, User.locked_until,
+                User.created_at, User.updated_at
+            ),),
+            "listing": (load_only(
+                User.id, User.email, User.username, User.full_name, User.role,
+                User.is_active, User.created_at, User.updated_at
+            ),),
+            "detail": tuple(undefer_group(group) for group in DEFERRED_GROUPS[User]),
+        },
+        Product: {
+            "ownership": (load_only(Product.id, Product.seller_id),),
+            "listing": (load_only(
+                Product.id, Product.title, Product.short_description, Product.price,
+                Product.compare_at_price, Product.thumbnail_url, Product.sold_count,
+                Product.wishlist_count, Product.is_featured, Product.created_at,
+                Product.seller_id
+            ),),
+            "detail": tuple(undefer_group(group) for group in DEFERRED_GROUPS[Product]),
+        },
+    }
+
+
+def load_profile(model, name: str) -> list:
+    """Loader options of a named profile"""
+    return list(profiles()[model][name])
@@ -0,0 +1,138 @@
+"""
+Static serving for uploaded media.
+
+Uploaded files get unique names (``generate_unique_filename``) and are never
+rewritten, so they can be cached by browsers and CDNs forever.  ``MediaFiles``
+extends Starlette's ``StaticFiles`` with immutable caching headers, strong
+ETags derived from ``stat`` (conditional requests never read the file),
+precompressed ``.br``/``.gz`` siblings and optional ``X-Accel-Redirect``
+offloading to a front proxy.  With ``signed=True`` every request must carry a
+valid download signature (see ``app.core.signing``).
+"""
+import mimetypes
+import os
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+
+from app.core.signing import verify_signature
+
+ONE_YEAR = 365 * 24 * 60 * 60
+
+# Preferred order when the client accepts several encodings
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(request_headers: Headers) -> set:
+    """Content codings the client accepts (q=0 means refused)"""
+    accepted = set()
+    for item in request_headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.lower())
+    return accepted
+
+
+def strong_etag(stat_result: os.stat_result, encoding: str = None) -> str:
+    """ETag from size and mtime; valid as a strong validator because files are immutable"""
+    tag = f"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+    if encoding:
+        tag = f"{tag}-{encoding}"
+    return f'"{tag}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+class MediaFiles(StaticFiles):
+    """StaticFiles for immutable uploads"""
+
+    def __init__(
+        self,
+        *args,
+        max_age: int = ONE_YEAR,
+        accel_redirect_prefix: str = None,
+        signed: bool = False,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.signed = signed
+        visibility = "private" if signed else "public"
+        self.cache_control = f"{visibility}, max-age={max_age}, immutable"
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/") if accel_redirect_prefix else None
+
+    async def get_response(self, path: str, scope) -> Response:
+        if self.signed:
+            params = QueryParams(scope.get("query_string", b"").decode("latin-1"))
+            if not verify_signature(path.replace(os.sep, "/"), params):
+                raise HTTPException(status_code=403, detail="Invalid or expired download link")
+        return await super().get_response(path, scope)
+
+    def precompressed(self, full_path: str, media_type: str, request_headers: Headers):
+        """Pick a ``.br``/``.gz`` sibling the client accepts: (path, stat, encoding)"""
+        if not is_compressible(media_type):
+            return None
+        accepted = accepted_encodings(request_headers)
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                return full_path + suffix, os.stat(full_path + suffix), encoding
+            except OSError:
+                continue
+        return None
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        full_path = os.fspath(full_path)
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+        encoding = None
+        variant = self.precompressed(full_path, media_type, request_headers)
+        if variant is not None:
+            full_path, stat_result, encoding = variant
+
+        headers = {
+            "cache-control": self.cache_control,
+            "etag": strong_etag(stat_result, encoding),
+        }
+        if is_compressible(media_type):
+            headers["vary"] = "Accept-Encoding"
+
+        # Answered from the stat result alone, without opening the file
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and etag_matches(headers["etag"], if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["content-encoding"] = encoding
+
+        if self.accel_redirect_prefix:
+            relative_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers["x-accel-redirect"] = f"{self.accel_redirect_prefix}/{relative_path}"
+            return Response(status_code=status_code, headers=headers, media_type=media_type)
+
+        return FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result
+        )
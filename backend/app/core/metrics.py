@@ -0,0 +1,26 @@
+"""
+Registry of in-process metrics shown on the admin metrics endpoint.
+
+Subsystems register a callable returning a dict; ``snapshot`` collects them.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+_providers = {}
+
+
+def register(name: str, provider):
+    """Expose ``provider()`` under ``name``"""
+    _providers[name] = provider
+
+
+def snapshot() -> dict:
+    result = {}
+    for name, provider in _providers.items():
+        try:
+            result[name] = provider()
+        except Exception as exc:
+            logger.exception("Metrics provider %s failed", name)
+            result[name] = {"error": str(exc)}
+    return result
@@ -0,0 +1,35 @@
+"""
+User notifications, delivered by background jobs.
+
+Endpoints enqueue a notification job in their own transaction; the job
+runner delivers it (with retries) after the change is committed, so a slow
+or failing delivery never holds up or breaks the request.  No mail
+transport is configured yet: ``deliver`` writes to the
+``app.notifications`` log, which is where a transport plugs in.
+"""
+import logging
+
+from app.core.jobs import job
+
+logger = logging.getLogger("app.notifications")
+
+SELLER_DECISION_JOB = "notifications.seller_decision"
+
+SELLER_DECISION_SUBJECTS = {
+    "approved": "Your seller application was approved",
+    "rejected": "Your seller application was not approved",
+}
+
+
+def deliver(email: str, subject: str, body: str):
+    logger.info("Notification to %s: %s\n%s", email, subject, body)
+
+
+@job(SELLER_DECISION_JOB, queue="notifications", max_attempts=8)
+def notify_seller_decision(user_id: int, email: str, decision: str, store_name: str = None):
+    """Tell an applicant whether their seller application was approved"""
+    if decision == "approved":
+        body = f"Your store {store_name or ''} is now open: you can start listing products."
+    else:
+        body = "Your seller application was reviewed and not approved. You can apply again at any time."
+    deliver(email, SELLER_DECISION_SUBJECTS[decision], body)
@@ -0,0 +1,205 @@
+"""
+Garbage collection of upload files no product refers to.
+
+Files end up unreferenced in several ways: a drag-and-drop upload is never
+attached to a product, an update replaces a product's file or thumbnail, or
+a request fails after writing its file.  Requests never delete files
+themselves; instead ``orphan_sweep_task`` periodically (or an admin, through
+a queued job) walks ``UPLOAD_DIR`` and ``MEDIA_DIR`` and removes files that
+
+- are older than ``ORPHAN_GRACE_SECONDS`` (so a file written by a request
+  whose commit is still in flight, or waiting in a finished resumable
+  upload, is never touched), and
+- are not referenced by any product, category or user URL column, product
+  gallery, or finalized upload awaiting its product.
+
+Precompressed ``.br``/``.gz`` siblings live and die with their file.  The
+file system is listed before references are read, so a file referenced
+while the sweep runs is kept.  Deletions go in batches of
+``ORPHAN_DELETE_BATCH`` with a short pause in between to keep the disk
+available for downloads.  Shard directories are left in place: there are
+at most 65536 of them and removing one could race a concurrent upload.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from app.config import settings
+from app.core import metrics
+from app.core.database import SessionLocal
+from app.core.jobs import job
+from app.core.periodic import PeriodicTask
+from app.core.signing import upload_path
+from app.core.uploads import UPLOAD_SESSION_TTL, UPLOAD_GC_INTERVAL, finished_upload_urls
+from app.models.product import Category, Product
+from app.models.user import User
+from app.utils.storage import UPLOAD_ROOT, UPLOAD_DIR, MEDIA_DIR
+
+logger = logging.getLogger(__name__)
+
+# Longer than an unclaimed finished upload can live
+ORPHAN_GRACE_SECONDS = max(
+    getattr(settings, "ORPHAN_GRACE_SECONDS", 2 * 24 * 60 * 60),
+    UPLOAD_SESSION_TTL + UPLOAD_GC_INTERVAL
+)
+ORPHAN_SWEEP_INTERVAL = getattr(settings, "ORPHAN_SWEEP_INTERVAL", 6 * 60 * 60)
+ORPHAN_DELETE_BATCH = 500
+ORPHAN_BATCH_PAUSE = 0.05  # Seconds between batches
+
+SWEEP_ORPHANS_JOB = "files.sweep_orphans"
+
+LOCAL_URL_PREFIX = "/static/uploads/"
+COMPRESSED_SUFFIXES = (".br", ".gz")
+
+# Columns holding the URL of a single uploaded file
+URL_COLUMNS = (
+    Product.file_url,
+    Product.preview_url,
+    Product.sample_file_url,
+    Product.thumbnail_url,
+    Product.video_url,
+    Category.image_url,
+    User.avatar_url,
+)
+
+_lock = threading.Lock()
+_stats = {"sweeps": 0, "deleted": 0, "bytes_reclaimed": 0, "last_sweep": None}
+
+
+def _local_path(url):
+    """Path relative to ``UPLOAD_ROOT`` of a local upload URL, else None"""
+    if isinstance(url, str) and url.startswith(LOCAL_URL_PREFIX):
+        return os.path.normpath(upload_path(url.split("?", 1)[0]))
+    return None
+
+
+def _gallery_urls(value) -> list:
+    try:
+        urls = json.loads(value) if value else []
+    except ValueError:
+        return []
+    return urls if isinstance(urls, list) else []
+
+
+def referenced_paths(db) -> set:
+    """Every upload path (relative to ``UPLOAD_ROOT``) something still points at"""
+    urls = []
+    for column in URL_COLUMNS:
+        rows = db.query(column).filter(column.like(f"{LOCAL_URL_PREFIX}%")).yield_per(5000)
+        urls.extend(url for url, in rows)
+    rows = db.query(Product.gallery_images).filter(Product.gallery_images.isnot(None)).yield_per(1000)
+    for gallery, in rows:
+        urls.extend(_gallery_urls(gallery))
+    urls.extend(finished_upload_urls())
+
+    return {path for path in map(_local_path, urls) if path is not None}
+
+
+def _scan(directory, cutoff: float, found: list) -> int:
+    """Collect ``(path, size)`` of files last modified before ``cutoff``; returns files seen"""
+    seen = 0
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            seen += _scan(entry.path, cutoff, found)
+        elif entry.is_file(follow_symlinks=False):
+            seen += 1
+            try:
+                stat_result = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if stat_result.st_mtime < cutoff:
+                found.append((entry.path, stat_result.st_size))
+    return seen
+
+
+def _owner(path: str) -> str:
+    """Relative path of the file a precompressed sibling belongs to"""
+    relative = os.path.relpath(path, UPLOAD_ROOT)
+    for suffix in COMPRESSED_SUFFIXES:
+        if relative.endswith(suffix):
+            return relative[:-len(suffix)]
+    return relative
+
+
+def find_orphans(db, now: float = None) -> tuple:
+    """(files scanned, ``(path, size)`` of orphans past the grace period)"""
+    now = time.time() if now is None else now
+    candidates = []
+    scanned = sum(_scan(directory, now - ORPHAN_GRACE_SECONDS, candidates) for directory in (UPLOAD_DIR, MEDIA_DIR))
+    if not candidates:
+        return scanned, []
+    referenced = referenced_paths(db)
+    orphans = [
+        (path, size) for path, size in candidates
+        if os.path.relpath(path, UPLOAD_ROOT) not in referenced and _owner(path) not in referenced
+    ]
+    return scanned, orphans
+
+
+def delete_files(files: list) -> tuple:
+    """Unlink ``(path, size)`` pairs in batches; returns (deleted, bytes reclaimed)"""
+    deleted = reclaimed = 0
+    for start in range(0, len(files), ORPHAN_DELETE_BATCH):
+        if start:
+            time.sleep(ORPHAN_BATCH_PAUSE)
+        for path, size in files[start:start + ORPHAN_DELETE_BATCH]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            except OSError:
+                logger.exception("Could not delete orphaned file %s", path)
+                continue
+            deleted += 1
+            reclaimed += size
+    return deleted, reclaimed
+
+
+@job(SWEEP_ORPHANS_JOB, queue="files", max_attempts=1)
+def sweep_orphan_files(dry_run: bool = False, now: float = None) -> dict:
+    """Find and (unless ``dry_run``) delete orphaned upload files; returns a report"""
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        scanned, orphans = find_orphans(db, now)
+    finally:
+        db.close()
+
+    if dry_run:
+        deleted, reclaimed = 0, 0
+    else:
+        deleted, reclaimed = delete_files(orphans)
+
+    report = {
+        "dry_run": dry_run,
+        "scanned": scanned,
+        "orphans": len(orphans),
+        "orphan_bytes": sum(size for _, size in orphans),
+        "deleted": deleted,
+        "bytes_reclaimed": reclaimed,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    if not dry_run:
+        with _lock:
+            _stats["sweeps"] += 1
+            _stats["deleted"] += deleted
+            _stats["bytes_reclaimed"] += reclaimed
+            _stats["last_sweep"] = report
+        if deleted:
+            logger.info("Deleted %d orphaned upload files (%d bytes)", deleted, reclaimed)
+    return report
+
+
+def sweep_metrics() -> dict:
+    with _lock:
+        return {**_stats, "grace_seconds": ORPHAN_GRACE_SECONDS}
+
+
+orphan_sweep_task = PeriodicTask("orphan-sweep", ORPHAN_SWEEP_INTERVAL, sweep_orphan_files)
+metrics.register("orphan_files", sweep_metrics)
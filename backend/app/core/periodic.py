@@ -0,0 +1,49 @@
+"""
+Background work that repeats on a fixed interval.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs ``func`` every ``interval`` seconds on a daemon thread"""
+
+    def __init__(self, name: str, interval: float, func, run_on_stop: bool = False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_on_stop = run_on_stop
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Stop the loop; with ``run_on_stop`` the function runs one last time"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.run_on_stop:
+            self._call()
+
+    def _call(self):
+        try:
+            self.func()
+        except Exception:
+            logger.exception("Periodic task %s failed", self.name)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._call()
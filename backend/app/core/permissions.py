@@ -2,6 +2,7 @@ from fastapi import HTTPException, status, Depends
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.load_profiles import load_profile
 from app.models.user import User, UserRole
 from app.api.auth import get_current_user
 
@@ -51,10 +52,12 @@ def check_product_ownership(
     current_user: User = Depends(get_approved_seller),
     db: Session = Depends(get_db)
 ):
-    """Dependency to check if user owns the product"""
+    """Dependency to check if user owns the product (loads only id and seller_id)"""
     from app.models.product import Product
     
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.query(Product).options(
+        *load_profile(Product, "ownership")
+    ).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,124 @@
+"""
+Time-decayed popularity ("trending") scores.
+
+A product's score is the sum of its event weights, each decayed
+exponentially with a half-life of ``TRENDING_HALF_LIFE_DAYS``.  Rather than
+decaying every score over time, each event is scaled *up* relative to a
+fixed epoch: ``weight * exp(lambda * (t - epoch))``.  All products share
+the same decay factor, so ordering by the stored value is exactly ordering
+by the decayed score, every event is an O(1) ``score += delta``, and
+workers can add their deltas independently (they go through the
+write-behind counters).  A current-time score is
+``stored * exp(-lambda * (now - epoch))``.
+
+A periodic refresh marks the top ``BESTSELLERS_PER_CATEGORY`` products of
+each category as bestsellers and pushes the scores into the catalog and
+suggestion indexes.
+"""
+from datetime import datetime, timezone
+import logging
+import math
+import time
+
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.core import events
+from app.core.catalog_index import catalog_index
+from app.core.counters import counters
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicTask
+from app.core.suggest import suggest_index
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+TRENDING_HALF_LIFE_DAYS = getattr(settings, "TRENDING_HALF_LIFE_DAYS", 7)
+TRENDING_REFRESH_SECONDS = getattr(settings, "TRENDING_REFRESH_SECONDS", 300)
+BESTSELLERS_PER_CATEGORY = getattr(settings, "BESTSELLERS_PER_CATEGORY", 10)
+
+# Scores grow by 2x per half-life after the epoch; with a 7 day half-life a
+# float64 lasts ~19 years before the epoch must be moved (and scores rescaled)
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+
+# Event weights
+VIEW_WEIGHT = 1.0
+PURCHASE_WEIGHT = 10.0  # Per unit sold
+
+DECAY_RATE = math.log(2) / (TRENDING_HALF_LIFE_DAYS * 24 * 60 * 60)
+
+
+def epoch_weight(weight: float, at: float = None) -> float:
+    """Event weight expressed at the epoch scale"""
+    at = time.time() if at is None else at
+    return weight * math.exp(DECAY_RATE * (at - TRENDING_EPOCH))
+
+
+def current_score(stored: float, now: float = None) -> float:
+    """Stored (epoch-scaled) score -> decayed score as of ``now``"""
+    now = time.time() if now is None else now
+    return (stored or 0.0) * math.exp(-DECAY_RATE * (now - TRENDING_EPOCH))
+
+
+def record(product_id: int, weight: float):
+    """O(1): add a weighted event to a product's score (flushed write-behind)"""
+    counters.incr(Product, "trending_score", product_id, epoch_weight(weight))
+
+
+def on_product_viewed(product_id: int):
+    record(product_id, VIEW_WEIGHT)
+
+
+def on_order_placed(items):
+    for product_id, quantity in items:
+        record(product_id, PURCHASE_WEIGHT * quantity)
+
+
+events.subscribe(events.PRODUCT_VIEWED, on_product_viewed)
+events.subscribe(events.ORDER_PLACED, on_order_placed)
+
+
+def refresh_bestsellers(db, per_category: int = BESTSELLERS_PER_CATEGORY) -> int:
+    """Set ``is_bestseller`` on the top products of each category; returns how many"""
+    listed = (Product.is_active == True, Product.status == "active", Product.trending_score > 0)
+    ranked = select(
+        Product.id,
+        func.row_number().over(
+            partition_by=Product.category_id,
+            order_by=(Product.trending_score.desc(), Product.id.desc())
+        ).label("position")
+    ).where(*listed).subquery()
+    top_ids = select(ranked.c.id).where(ranked.c.position <= per_category)
+
+    db.query(Product).filter(
+        Product.is_bestseller == True,
+        Product.id.not_in(top_ids)
+    ).update({Product.is_bestseller: False}, synchronize_session=False)
+    db.query(Product).filter(
+        Product.is_bestseller.isnot(True),
+        Product.id.in_(top_ids)
+    ).update({Product.is_bestseller: True}, synchronize_session=False)
+    db.commit()
+
+    return db.query(func.count(Product.id)).filter(Product.is_bestseller == True).scalar()
+
+
+def refresh_rankings():
+    """Periodic job: persist pending deltas, then recompute bestsellers and index scores"""
+    counters.flush()
+    db = SessionLocal()
+    try:
+        refresh_bestsellers(db)
+        if catalog_index.ready or suggest_index.ready:
+            rows = db.query(Product.id, Product.trending_score).filter(
+                Product.is_active == True,
+                Product.status == "active"
+            ).all()
+            scores = {row.id: row.trending_score or 0.0 for row in rows}
+            catalog_index.update_scores(scores)
+            suggest_index.update_scores(scores)
+    finally:
+        db.close()
+
+
+ranking_task = PeriodicTask("trending-refresh", TRENDING_REFRESH_SECONDS, refresh_rankings)
@@ -0,0 +1,118 @@
+"""
+Token-bucket rate limiting per route group.
+
+Each client (user id from the bearer token, else IP address) gets a bucket
+per group holding at most ``capacity`` tokens, refilled at ``rate`` tokens
+per second.  Buckets take O(1) memory and the least recently used ones are
+evicted past ``max_keys``.  With ``SHARED_KV_URL`` configured the buckets
+live in the shared store so limits hold across workers (best effort: the
+read-modify-write is not atomic).
+"""
+from collections import OrderedDict
+import math
+import threading
+import time
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+
+from app.config import settings
+from app.core.kvstore import SharedStore, shared_client
+
+# group -> (tokens per second, burst capacity)
+RATE_LIMITS = {
+    "auth": (10 / 60, 10),     # login/register: 10 per minute
+    "search": (5.0, 20),       # free-text catalog search
+    "upload": (20 / 3600, 10),  # file uploads: 20 per hour
+}
+
+MAX_KEYS = 100_000
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client, LRU-bounded"""
+
+    def __init__(self, rate: float, capacity: int, max_keys: int = MAX_KEYS, store=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.store = store
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refill(self, bucket, now: float):
+        tokens, updated = bucket if bucket else (self.capacity, now)
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def hit(self, key: str, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens; returns 0 if allowed, else seconds until it would be"""
+        if self.store is not None:
+            now = time.time()
+            tokens = self._refill(self.store.get(key), now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.store.set(key, [tokens, now], ttl=self.capacity / self.rate)
+            return 0.0 if allowed else (cost - tokens) / self.rate
+
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(self._buckets.get(key), now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return 0.0 if allowed else (cost - tokens) / self.rate
+
+
+def _create_limiters() -> dict:
+    client = shared_client()
+    limiters = {}
+    for group, (rate, capacity) in RATE_LIMITS.items():
+        store = None
+        if client is not None:
+            store = SharedStore(client, f"ratelimit:{group}", ttl=capacity / rate)
+        limiters[group] = TokenBucketLimiter(rate, capacity, store=store)
+    return limiters
+
+
+limiters = _create_limiters()
+
+
+def client_key(request: Request) -> str:
+    """User id from a valid bearer token (no DB lookup), otherwise the client IP"""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            if payload.get("sub") is not None:
+                return f"user:{payload['sub']}"
+        except JWTError:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit(group: str, only_with_param: str = None):
+    """Dependency enforcing the limit of a route group
+
+    With ``only_with_param`` the request only counts when that query
+    parameter is present (e.g. listings are free, searches are limited).
+    """
+    limiter = limiters[group]
+
+    def dependency(request: Request):
+        if only_with_param and not request.query_params.get(only_with_param):
+            return
+        retry_after = limiter.hit(client_key(request))
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please slow down.",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    return dependency
@@ -0,0 +1,226 @@
+"""
+"Customers also bought": co-purchase recommendations.
+
+Two products co-occur once for every order containing both.  The full
+co-occurrence matrix is computed in one batch from ``order_items`` with
+NumPy (pairs expanded per order, then counted as a sparse COO matrix) and
+stored CSR-style.  New orders add their pairs to a small delta on top of
+it, and each product's top ``RELATED_PRODUCTS_LIMIT`` neighbours are
+precomputed, so serving recommendations is a single dict lookup.
+
+Deltas only see orders placed through this worker; the periodic rebuild
+brings every worker back to the database's view (including cancellations).
+"""
+from collections import defaultdict
+import heapq
+import logging
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.core import events, metrics
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicTask
+from app.models.order import Order, OrderItem, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+RELATED_PRODUCTS_LIMIT = getattr(settings, "RELATED_PRODUCTS_LIMIT", 20)
+RECOMMENDATIONS_REBUILD_SECONDS = getattr(settings, "RECOMMENDATIONS_REBUILD_SECONDS", 3600)
+
+# An order with n products contributes n * (n - 1) pairs; bulk orders say
+# little about affinity and would dominate both the cost and the counts
+MAX_BASKET_SIZE = 50
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def co_occurrence(order_ids, product_ids):
+    """Sparse co-occurrence counts from parallel (order_id, product_id) arrays
+
+    Returns ``(left, right, counts)`` arrays of product ids; every unordered
+    pair appears in both directions and a product never pairs with itself.
+    """
+    rows = np.column_stack((
+        np.asarray(order_ids, dtype=np.int64),
+        np.asarray(product_ids, dtype=np.int64)
+    ))
+    if not len(rows):
+        return _EMPTY, _EMPTY, _EMPTY
+
+    # One row per (order, product), grouped by order
+    rows = np.unique(rows, axis=0)
+    orders, products = rows[:, 0], rows[:, 1]
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]])
+    sizes = np.diff(np.r_[starts, len(orders)])
+
+    row_sizes = np.repeat(sizes, sizes)
+    row_starts = np.repeat(starts, sizes)
+    kept = np.flatnonzero((row_sizes > 1) & (row_sizes <= MAX_BASKET_SIZE))
+    if not len(kept):
+        return _EMPTY, _EMPTY, _EMPTY
+
+    # Pair every kept row with every row of its own order
+    fanout = row_sizes[kept]
+    left = np.repeat(kept, fanout)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+    right = np.repeat(row_starts[kept], fanout) + offsets
+    distinct = left != right
+    left, right = products[left[distinct]], products[right[distinct]]
+
+    # Count pairs on dense product codes
+    catalog, codes = np.unique(np.r_[left, right], return_inverse=True)
+    size = len(catalog)
+    keys, counts = np.unique(codes[:len(left)] * size + codes[len(left):], return_counts=True)
+    return catalog[keys // size], catalog[keys % size], counts
+
+
+def top_neighbours(counts: dict, limit: int) -> list:
+    """Neighbour ids by descending count, ties broken by id"""
+    return [product_id for product_id, _ in heapq.nsmallest(
+        limit, counts.items(), key=lambda item: (-item[1], item[0])
+    )]
+
+
+class CoPurchaseRecommender:
+    """Co-occurrence matrix plus the precomputed top neighbours of every product"""
+
+    def __init__(self, limit: int = RELATED_PRODUCTS_LIMIT):
+        self.limit = limit
+        self.ready = False
+        self._lock = threading.RLock()
+        self._rows = {}  # Product id -> row of the CSR arrays
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._neighbours = _EMPTY
+        self._counts = _EMPTY
+        self._delta = defaultdict(lambda: defaultdict(int))  # Pairs counted since the last build
+        self._related = {}
+        self._replay = None  # Orders seen while a rebuild is loading
+        self.last_build_duration = 0.0
+
+    def build(self, order_ids, product_ids):
+        """Replace the matrix with one computed from (order_id, product_id) rows"""
+        started = time.monotonic()
+        left, right, counts = co_occurrence(order_ids, product_ids)
+
+        # Row-major, and within a row by descending count then id,
+        # so the top neighbours of a row are its first entries
+        order = np.lexsort((right, -counts, left))
+        left, right, counts = left[order], right[order], counts[order]
+        catalog, starts = np.unique(left, return_index=True)
+        indptr = np.r_[starts, len(left)].astype(np.int64)
+
+        catalog = catalog.tolist()
+        related = {
+            product_id: right[indptr[row]:indptr[row] + self.limit].tolist()
+            for row, product_id in enumerate(catalog)
+        }
+
+        with self._lock:
+            self._rows = {product_id: row for row, product_id in enumerate(catalog)}
+            self._indptr, self._neighbours, self._counts = indptr, right, counts
+            self._delta.clear()
+            self._related = related
+            replay, self._replay = self._replay or [], None
+            self.ready = True
+            for product_ids in replay:
+                self._add(product_ids)
+        self.last_build_duration = time.monotonic() - started
+
+    def rebuild(self, db):
+        """Recompute the matrix from every non-cancelled order"""
+        with self._lock:
+            self._replay = []
+        try:
+            rows = db.query(OrderItem.order_id, OrderItem.product_id).join(Order).filter(
+                Order.status != OrderStatus.CANCELLED,
+                OrderItem.product_id.isnot(None)
+            ).all()
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+        pairs = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        self.build(pairs[:, 0], pairs[:, 1])
+
+    def _neighbour_counts(self, product_id: int) -> dict:
+        counts = {}
+        row = self._rows.get(product_id)
+        if row is not None:
+            start, end = self._indptr[row], self._indptr[row + 1]
+            counts = dict(zip(self._neighbours[start:end].tolist(), self._counts[start:end].tolist()))
+        for other, count in self._delta.get(product_id, {}).items():
+            counts[other] = counts.get(other, 0) + count
+        return counts
+
+    def _add(self, product_ids):
+        for product_id in product_ids:
+            for other in product_ids:
+                if other != product_id:
+                    self._delta[product_id][other] += 1
+        for product_id in product_ids:
+            self._related[product_id] = top_neighbours(self._neighbour_counts(product_id), self.limit)
+
+    def add_order(self, product_ids):
+        """Count the pairs of a new order and refresh the affected products"""
+        product_ids = list(dict.fromkeys(product_ids))
+        if not 1 < len(product_ids) <= MAX_BASKET_SIZE:
+            return
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(product_ids)
+            if self.ready:
+                self._add(product_ids)
+
+    def related(self, product_id: int) -> list:
+        """Precomputed neighbour ids, most often bought together first"""
+        return self._related.get(product_id, [])
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "products": len(self._related),
+                "pairs": len(self._neighbours),
+                "pending_pairs": sum(len(counts) for counts in self._delta.values()),
+                "last_build_ms": round(self.last_build_duration * 1000, 2),
+            }
+
+
+def query_related(db, product_id: int, limit: int = RELATED_PRODUCTS_LIMIT) -> list:
+    """One product's neighbours straight from SQL, for when the recommender is not loaded"""
+    other = aliased(OrderItem)
+    orders = func.count(func.distinct(other.order_id))
+    rows = db.query(other.product_id).join(
+        OrderItem, OrderItem.order_id == other.order_id
+    ).join(Order, Order.id == other.order_id).filter(
+        OrderItem.product_id == product_id,
+        other.product_id != product_id,
+        Order.status != OrderStatus.CANCELLED
+    ).group_by(other.product_id).order_by(
+        orders.desc(), other.product_id
+    ).limit(limit).all()
+    return [row.product_id for row in rows]
+
+
+def rebuild_recommendations():
+    db = SessionLocal()
+    try:
+        recommender.rebuild(db)
+    finally:
+        db.close()
+
+
+recommender = CoPurchaseRecommender()
+recommendations_task = PeriodicTask(
+    "recommendations-rebuild", RECOMMENDATIONS_REBUILD_SECONDS, rebuild_recommendations
+)
+events.subscribe(
+    events.ORDER_PLACED,
+    lambda items: recommender.add_order([product_id for product_id, _ in items])
+)
+metrics.register("recommendations", recommender.metrics)
@@ -0,0 +1,252 @@
+"""
+Read-replica routing.
+
+Endpoints that only read depend on ``get_read_db`` instead of ``get_db``.
+With ``DATABASE_REPLICA_URLS`` configured, their sessions go to the healthy
+replicas in round-robin; otherwise, or when no replica is healthy, to the
+primary like everything else.  Sessions from ``get_read_db`` refuse to
+write, so a write can never land on a replica by mistake.
+
+Replicas are checked every ``REPLICA_HEALTH_INTERVAL`` seconds: one that
+fails the check, or (on PostgreSQL) replays more than
+``REPLICA_MAX_LAG_SECONDS`` behind the primary, gets no traffic until it
+passes again.
+
+Read-your-writes: when a request commits a write, ``ReadYourWritesMiddleware``
+adds an ``X-Primary-Until`` header (a Unix time ``PRIMARY_STICKY_SECONDS``
+ahead).  Clients echo it on their following requests; until it passes,
+their reads use the primary.  The window covers the largest lag a healthy
+replica can have, and works whichever worker or host serves the next
+request.
+"""
+from contextvars import ContextVar
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.core import metrics
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+REPLICA_URLS = list(getattr(settings, "DATABASE_REPLICA_URLS", None) or [])
+REPLICA_HEALTH_INTERVAL = getattr(settings, "REPLICA_HEALTH_INTERVAL", 5.0)
+REPLICA_MAX_LAG_SECONDS = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5.0)
+PRIMARY_STICKY_SECONDS = getattr(settings, "PRIMARY_STICKY_SECONDS", REPLICA_MAX_LAG_SECONDS)
+
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+# Replay lag of a PostgreSQL standby (0 when it has replayed everything it received)
+PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Per request: {"sticky": reads go to the primary, "wrote": a write was committed}
+_request_state = ContextVar("request_state", default=None)
+
+
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+
+def _refuse_flush(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise ReadOnlySessionError("Read-only session: use get_db for endpoints that write")
+
+
+def _refuse_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise ReadOnlySessionError("Read-only session: use get_db for endpoints that write")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_engine(url, pool_pre_ping=True)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.healthy = True
+        self.lag = None
+        self.last_error = None
+        self.sessions = 0
+
+    def check(self):
+        try:
+            with self.engine.connect() as connection:
+                if self.engine.dialect.name == "postgresql":
+                    self.lag = float(connection.execute(PG_REPLICA_LAG).scalar() or 0.0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    self.lag = None
+        except Exception as exc:
+            if self.healthy:
+                logger.warning("Replica %s failed its health check: %s", self.name, exc)
+            self.healthy = False
+            self.last_error = str(exc)
+            return
+
+        healthy = self.lag is None or self.lag <= REPLICA_MAX_LAG_SECONDS
+        if healthy != self.healthy:
+            logger.warning("Replica %s is now %s (lag %s)", self.name, "healthy" if healthy else "lagging", self.lag)
+        self.healthy = healthy
+        self.last_error = None if healthy else f"Replication lag {self.lag:.1f}s"
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas, falling back to the primary"""
+
+    def __init__(self, urls: list):
+        self.replicas = [Replica(url) for url in urls]
+        self._sessions = {
+            replica: sessionmaker(bind=replica.engine, autocommit=False, autoflush=False)
+            for replica in self.replicas
+        }
+        for factory in self._sessions.values():
+            event.listen(factory, "before_flush", _refuse_flush)
+            event.listen(factory, "do_orm_execute", _refuse_bulk_writes)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._task = PeriodicTask("replica-health", REPLICA_HEALTH_INTERVAL, self.check)
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def check(self):
+        for replica in self.replicas:
+            replica.check()
+
+    def start(self):
+        if self.enabled:
+            self.check()
+            self._task.start()
+
+    def stop(self):
+        self._task.stop()
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    def pick(self):
+        """Next healthy replica, or None"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            return healthy[next(self._turn) % len(healthy)]
+
+    def read_session(self):
+        if not self.enabled:
+            return SessionLocal()
+        state = _request_state.get()
+        if state is not None and state["sticky"]:
+            self.sticky_reads += 1
+            return SessionLocal()
+        replica = self.pick()
+        if replica is None:
+            self.primary_reads += 1
+            return SessionLocal()
+        replica.sessions += 1
+        return self._sessions[replica]()
+
+    def metrics(self) -> dict:
+        return {
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag,
+                    "sessions": replica.sessions,
+                    "last_error": replica.last_error,
+                }
+                for replica in self.replicas
+            ],
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+        }
+
+
+def get_read_db():
+    """Session for endpoints that only read: a replica when possible"""
+    db = replica_router.read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# === Read-your-writes ===
+
+def _note_write(session, *args):
+    session.info["wrote"] = True
+
+
+def _note_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def _after_commit(session):
+    if session.info.pop("wrote", False):
+        state = _request_state.get()
+        if state is not None:
+            # Shared dict: visible to the middleware even from a threadpool context copy
+            state["wrote"] = True
+
+
+def _after_rollback(session):
+    session.info.pop("wrote", None)
+
+
+event.listen(SessionLocal, "after_flush", _note_write)
+event.listen(SessionLocal, "do_orm_execute", _note_bulk_write)
+event.listen(SessionLocal, "after_commit", _after_commit)
+event.listen(SessionLocal, "after_soft_rollback", lambda session, previous_transaction: _after_rollback(session))
+
+
+def primary_until(headers: Headers, now: float) -> bool:
+    """Whether the echoed header still pins reads to the primary"""
+    try:
+        until = float(headers.get(PRIMARY_UNTIL_HEADER, ""))
+    except ValueError:
+        return False
+    # Far-future values can only be forged; ignore them
+    return now < until <= now + PRIMARY_STICKY_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning a client's reads to the primary right after its writes"""
+
+    def __init__(self, app, window: float = PRIMARY_STICKY_SECONDS):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = {"sticky": primary_until(Headers(scope=scope), time.time()), "wrote": False}
+        token = _request_state.set(state)
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start" and state["wrote"]:
+                headers = MutableHeaders(scope=message)
+                headers[PRIMARY_UNTIL_HEADER] = f"{time.time() + self.window:.3f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            _request_state.reset(token)
+
+
+replica_router = ReplicaRouter(REPLICA_URLS)
+metrics.register("replicas", replica_router.metrics)
@@ -0,0 +1,53 @@
+"""
+Fast JSON responses.
+
+List endpoints validate their rows once through a cached pydantic
+``TypeAdapter`` and serialize straight to bytes, instead of building a
+model per row and letting FastAPI re-validate ``response_model`` and
+encode through the stdlib ``json`` module.  Untyped payloads are encoded
+with ``orjson`` when it is installed.
+"""
+from functools import lru_cache
+import json
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """Encode plain JSON-compatible data to bytes"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response that accepts pre-encoded bytes or plain data"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema) -> TypeAdapter:
+    """Adapter for a response type such as ``List[ProductList]``, built once"""
+    return TypeAdapter(schema)
+
+
+def encode(data, schema) -> bytes:
+    """Validate ``data`` (dicts or ORM objects) against ``schema`` and serialize it"""
+    adapter = type_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def fast_response(data, schema, status_code: int = 200) -> FastJSONResponse:
+    """Response for ``data`` validated once against ``schema``"""
+    return FastJSONResponse(content=encode(data, schema), status_code=status_code)
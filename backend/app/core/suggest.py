@@ -0,0 +1,301 @@
+"""
+Typeahead suggestions over active product titles, tags and store names.
+
+Every suggestion (a product, a tag or a store) is indexed under each of its
+word suffixes ("python programming guide", "programming guide", "guide"),
+normalized for case and accents, in one sorted list.  A prefix query is two
+``bisect`` calls plus ranking the matches by popularity: trending score,
+then units sold (summed over the products of a tag or store).  Short,
+broad prefixes match too many keys to rank per keystroke, so their top
+results are memoized; a change only drops the memoized prefixes whose top
+results it could alter.
+
+Products are upserted or removed as ``PRODUCT_CHANGED`` events arrive;
+``build`` prepares a complete new index off to the side and swaps it in.
+"""
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+import heapq
+import threading
+import unicodedata
+
+from sqlalchemy.orm import joinedload
+
+from app.core import events
+from app.core.catalog_index import is_listed
+from app.core.database import SessionLocal
+from app.models.product import Product
+from app.models.user import User
+
+MAX_SUGGESTIONS = 10
+MEMO_MIN_MATCHES = 256  # Prefixes matching at least this many keys have their top results memoized
+MEMO_MAX_PREFIXES = 10000
+MAX_INDEXED_WORDS = 8  # Word suffixes indexed per text
+
+_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def index_keys(text: str) -> set:
+    """Normalized text from each of its first ``MAX_INDEXED_WORDS`` words onwards"""
+    words = normalize(text).split(" ")
+    return {" ".join(words[position:]) for position in range(min(len(words), MAX_INDEXED_WORDS)) if words[position]}
+
+
+def split_tags(tags: str) -> list:
+    """Tags are stored comma-separated (a JSON list is tolerated)"""
+    if not tags:
+        return []
+    values = (tag.strip().strip("\"'").strip() for tag in tags.strip().strip("[]").split(","))
+    return list(dict.fromkeys(tag for tag in values if tag))
+
+
+@dataclass
+class Entry:
+    """One suggestion; tag and store entries aggregate their products"""
+    kind: str  # "product", "tag" or "store"
+    ref: object  # Product id, normalized tag or seller id
+    text: str
+    trending: float = 0.0
+    sold: int = 0
+    products: int = 0
+
+    @property
+    def order(self):
+        """Sort key: most popular first, then alphabetical"""
+        return (-self.trending, -self.sold, self.text, self.kind)
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "text": self.text,
+            "product_id": self.ref if self.kind == "product" else None,
+            "seller_id": self.ref if self.kind == "store" else None,
+        }
+
+
+@dataclass
+class Contribution:
+    """What one listed product adds to the index"""
+    title: str
+    tags: list
+    seller_id: int
+    store_name: str
+    trending: float
+    sold: int
+
+
+def contribution(product) -> Contribution:
+    seller = product.seller
+    return Contribution(
+        title=product.title,
+        tags=split_tags(product.tags),
+        seller_id=product.seller_id,
+        store_name=(seller.store_name or seller.username) if seller is not None else None,
+        trending=product.trending_score or 0.0,
+        sold=product.sold_count or 0,
+    )
+
+
+class SuggestIndex:
+    """Sorted (key, kind, ref) tuples over product, tag and store entries"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.ready = False
+        self._keys = []
+        self._entries = {}
+        self._products = {}  # Product id -> Contribution
+        self._memo = {}
+        self._replay = None  # Product changes seen while a build is running
+
+    # === Entry bookkeeping (under the lock) ===
+
+    def _add(self, kind: str, ref, text: str, trending: float, sold: int, bulk: bool = False):
+        entry = self._entries.get((kind, ref))
+        if entry is None:
+            entry = self._entries[(kind, ref)] = Entry(kind, ref, text)
+            for key in index_keys(text):
+                if bulk:
+                    self._keys.append((key, kind, ref))
+                else:
+                    insort(self._keys, (key, kind, ref))
+        entry.trending += trending
+        entry.sold += sold
+        entry.products += 1
+        if not bulk:
+            self._touch(entry)
+
+    def _discard(self, kind: str, ref, trending: float, sold: int):
+        entry = self._entries.get((kind, ref))
+        if entry is None:
+            return
+        entry.trending -= trending
+        entry.sold -= sold
+        entry.products -= 1
+        self._touch(entry)
+        if entry.products <= 0:
+            del self._entries[(kind, ref)]
+            for key in index_keys(entry.text):
+                position = bisect_left(self._keys, (key, kind, ref))
+                if position < len(self._keys) and self._keys[position] == (key, kind, ref):
+                    del self._keys[position]
+
+    def _touch(self, entry: Entry):
+        """Drop memoized results the entry's change could alter"""
+        for key in index_keys(entry.text):
+            for length in range(1, len(key) + 1):
+                top = self._memo.get(key[:length])
+                if top is None:
+                    continue
+                if (
+                    len(top) < MAX_SUGGESTIONS
+                    or entry.order < top[-1].order
+                    or any(member is entry for member in top)
+                ):
+                    del self._memo[key[:length]]
+
+    def _entries_of(self, product_id: int, item: Contribution):
+        yield "product", product_id, item.title
+        for tag in item.tags:
+            yield "tag", normalize(tag), tag
+        if item.store_name:
+            yield "store", item.seller_id, item.store_name
+
+    def _insert(self, product_id: int, item: Contribution, bulk: bool = False):
+        self._products[product_id] = item
+        for kind, ref, text in self._entries_of(product_id, item):
+            self._add(kind, ref, text, item.trending, item.sold, bulk)
+
+    def _delete(self, product_id: int):
+        item = self._products.pop(product_id, None)
+        if item is None:
+            return
+        for kind, ref, _ in self._entries_of(product_id, item):
+            self._discard(kind, ref, item.trending, item.sold)
+
+    # === Public API ===
+
+    def build(self, products):
+        """Index the given products and swap the result in atomically"""
+        with self._lock:
+            self._replay = {}
+        fresh = SuggestIndex()
+        try:
+            for product in products:
+                if is_listed(product):
+                    fresh._insert(product.id, contribution(product), bulk=True)
+            fresh._keys.sort()
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            for product_id, item in self._replay.items():
+                fresh._delete(product_id)
+                if item is not None:
+                    fresh._insert(product_id, item)
+            self._keys, self._entries, self._products = fresh._keys, fresh._entries, fresh._products
+            self._memo = {}
+            self._replay = None
+            self.ready = True
+
+    def apply(self, product):
+        """Incrementally reflect a created, updated or delisted product"""
+        if not self.ready and self._replay is None:
+            return
+        item = contribution(product) if is_listed(product) else None
+        with self._lock:
+            if self._replay is not None:
+                self._replay[product.id] = item
+            if not self.ready:
+                return
+            self._delete(product.id)
+            if item is not None:
+                self._insert(product.id, item)
+
+    def update_scores(self, scores: dict):
+        """Apply refreshed trending scores ({product_id: score}) to entries and aggregates"""
+        if not self.ready:
+            return
+        with self._lock:
+            for product_id, score in scores.items():
+                item = self._products.get(product_id)
+                if item is None or item.trending == score:
+                    continue
+                delta = score - item.trending
+                item.trending = score
+                for kind, ref, _ in self._entries_of(product_id, item):
+                    entry = self._entries[(kind, ref)]
+                    entry.trending += delta
+                    self._touch(entry)
+
+    def suggest(self, query: str, limit: int = MAX_SUGGESTIONS) -> list:
+        """Most popular entries with a word starting with ``query``"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        with self._lock:
+            top = self._memo.get(prefix)
+            if top is None:
+                start = bisect_left(self._keys, (prefix,))
+                end = bisect_left(self._keys, (prefix + _END,), lo=start)
+                matches = {(kind, ref) for _, kind, ref in self._keys[start:end]}
+                top = heapq.nsmallest(
+                    MAX_SUGGESTIONS,
+                    (self._entries[match] for match in matches),
+                    key=lambda entry: entry.order
+                )
+                if end - start >= MEMO_MIN_MATCHES:
+                    if len(self._memo) >= MEMO_MAX_PREFIXES:
+                        self._memo.clear()
+                    self._memo[prefix] = top
+            return [entry.as_dict() for entry in top[:limit]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def query_suggestions(db, query: str, limit: int = MAX_SUGGESTIONS) -> list:
+    """Title-prefix suggestions straight from SQL, for when the index is not loaded"""
+    pattern = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    if not pattern:
+        return []
+    rows = db.query(Product.id, Product.title).filter(
+        Product.is_active == True,
+        Product.status == "active",
+        Product.title.ilike(f"{pattern}%", escape="\\")
+    ).order_by(
+        Product.trending_score.desc(), Product.sold_count.desc(), Product.id
+    ).limit(limit).all()
+    return [
+        {"kind": "product", "text": row.title, "product_id": row.id, "seller_id": None}
+        for row in rows
+    ]
+
+
+def rebuild_suggest_index():
+    """Load the active catalog into a new index and swap it in"""
+    db = SessionLocal()
+    try:
+        products = db.query(Product).options(
+            joinedload(Product.seller).load_only(User.store_name, User.username)
+        ).filter(
+            Product.is_active == True,
+            Product.status == "active"
+        ).yield_per(1000)
+        suggest_index.build(products)
+    finally:
+        db.close()
+
+
+suggest_index = SuggestIndex()
+events.subscribe(events.PRODUCT_CHANGED, lambda product: suggest_index.apply(product))
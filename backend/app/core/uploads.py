@@ -0,0 +1,273 @@
+"""
+Resumable chunked uploads (tus-style).
+
+A client creates an upload with the file's name, type and size, then sends
+fixed-size chunks in any order, possibly in parallel.  Each chunk is written
+at its offset straight into a preallocated temp file and checked against its
+SHA-256.  After a dropped connection the client asks which chunks are
+missing and resends only those.  Finalizing moves the assembled file into
+the product upload directory, where product creation picks it up.
+
+An upload is a directory on the uploads volume holding the temp file, a JSON
+descriptor and one receipt per stored chunk.  Any worker sharing the volume
+can serve any request of an upload, and parallel chunks never contend on
+shared state.  Uploads idle for ``UPLOAD_SESSION_TTL`` are swept by
+``upload_gc_task``.
+"""
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import time
+import uuid
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.periodic import PeriodicTask
+from app.core.signing import upload_path
+from app.utils.storage import UPLOAD_ROOT, check_file_size, check_file_type, new_product_file
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_DIR = UPLOAD_ROOT / "partial"
+
+DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+UPLOAD_SESSION_TTL = getattr(settings, "UPLOAD_SESSION_TTL", 24 * 60 * 60)  # Since the last chunk
+UPLOAD_GC_INTERVAL = getattr(settings, "UPLOAD_GC_INTERVAL", 60 * 60)
+
+# tus reports checksum mismatches with this non-standard status
+HTTP_460_CHECKSUM_MISMATCH = 460
+
+UPLOADING = "uploading"
+COMPLETE = "complete"
+
+
+def _upload_dir(upload_id: str):
+    try:
+        upload_id = uuid.UUID(upload_id).hex
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    return PARTIAL_DIR / upload_id
+
+
+def _write_atomic(path, content: str):
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    temp_path.write_text(content)
+    os.replace(temp_path, path)
+
+
+def _save(upload: dict):
+    _write_atomic(_upload_dir(upload["id"]) / "upload.json", json.dumps(upload))
+
+
+def chunk_count(upload: dict) -> int:
+    return math.ceil(upload["file_size"] / upload["chunk_size"])
+
+
+def create_upload(user_id: int, file_name: str, file_type: str, file_size: int, chunk_size: int = None) -> dict:
+    """Start an upload: reserve the temp file and write the descriptor"""
+    check_file_type(file_type)
+    check_file_size(file_size)
+
+    upload = {
+        "id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "file_name": file_name,
+        "file_type": file_type,
+        "file_size": file_size,
+        "chunk_size": chunk_size or DEFAULT_CHUNK_SIZE,
+        "status": UPLOADING,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "result": None,
+    }
+    directory = _upload_dir(upload["id"])
+    (directory / "chunks").mkdir(parents=True)
+    with open(directory / "data", "wb") as f:
+        f.truncate(file_size)  # Sparse on most filesystems
+    _save(upload)
+    return upload
+
+
+def load_upload(upload_id: str, user_id: int) -> dict:
+    """Descriptor of one of the user's uploads (404 for unknown or foreign ids)"""
+    try:
+        upload = json.loads((_upload_dir(upload_id) / "upload.json").read_text())
+    except FileNotFoundError:
+        upload = None
+    if upload is None or upload["user_id"] != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    return upload
+
+
+def chunk_length(upload: dict, offset: int) -> int:
+    """Expected length of the chunk starting at ``offset``; 409 for an invalid offset"""
+    if offset < 0 or offset >= upload["file_size"] or offset % upload["chunk_size"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload-Offset must be a multiple of the chunk size ({upload['chunk_size']}) below the file size"
+        )
+    return min(upload["chunk_size"], upload["file_size"] - offset)
+
+
+def write_chunk(upload: dict, offset: int, data: bytes, checksum: str = None):
+    """Store one chunk at its offset, then record its receipt"""
+    if upload["status"] != UPLOADING:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload is already complete")
+    expected = chunk_length(upload, offset)
+    if len(data) != expected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk at offset {offset} must be {expected} bytes, got {len(data)}"
+        )
+
+    digest = hashlib.sha256(data).hexdigest()
+    if checksum is not None and checksum != digest:
+        raise HTTPException(status_code=HTTP_460_CHECKSUM_MISMATCH, detail="Chunk checksum mismatch")
+
+    directory = _upload_dir(upload["id"])
+    try:
+        fd = os.open(directory / "data", os.O_WRONLY)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    try:
+        os.pwrite(fd, data, offset)
+    finally:
+        os.close(fd)
+    _write_atomic(directory / "chunks" / str(offset // upload["chunk_size"]), digest)
+
+
+def received_chunks(upload: dict) -> set:
+    try:
+        names = os.listdir(_upload_dir(upload["id"]) / "chunks")
+    except FileNotFoundError:
+        return set(range(chunk_count(upload))) if upload["status"] == COMPLETE else set()
+    return {int(name) for name in names if name.isdigit()}
+
+
+def last_activity(directory) -> float:
+    times = []
+    for name in ("upload.json", "data"):
+        try:
+            times.append(os.stat(directory / name).st_mtime)
+        except FileNotFoundError:
+            pass
+    return max(times, default=0.0)
+
+
+def upload_status(upload: dict) -> dict:
+    """Descriptor plus progress: contiguous offset and missing chunks"""
+    received = received_chunks(upload)
+    missing = [index for index in range(chunk_count(upload)) if index not in received]
+    contiguous = missing[0] if missing else chunk_count(upload)
+    expires = last_activity(_upload_dir(upload["id"])) + UPLOAD_SESSION_TTL
+    return {
+        **upload,
+        "chunk_count": chunk_count(upload),
+        "offset": min(contiguous * upload["chunk_size"], upload["file_size"]),
+        "missing_chunks": missing,
+        "expires_at": datetime.fromtimestamp(expires, tz=timezone.utc),
+        "file_url": (upload["result"] or {}).get("file_url"),
+    }
+
+
+def finalize_upload(upload: dict) -> dict:
+    """Move the assembled file into the product upload directory (idempotent)"""
+    if upload["status"] == COMPLETE:
+        return upload["result"]
+
+    received = received_chunks(upload)
+    missing = [index for index in range(chunk_count(upload)) if index not in received]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Upload is incomplete", "missing_chunks": missing}
+        )
+
+    directory = _upload_dir(upload["id"])
+    path, file_url = new_product_file(upload["file_name"])
+    try:
+        os.replace(directory / "data", path)
+    except FileNotFoundError:
+        # Another request finalized it first
+        current = load_upload(upload["id"], upload["user_id"])
+        if current["status"] != COMPLETE:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload is being finalized")
+        return current["result"]
+
+    upload["status"] = COMPLETE
+    upload["result"] = {
+        "file_url": file_url,
+        "file_name": upload["file_name"],
+        "file_size": upload["file_size"],
+        "file_type": upload["file_type"],
+    }
+    _save(upload)
+    shutil.rmtree(directory / "chunks", ignore_errors=True)
+    return upload["result"]
+
+
+def claim_upload(upload_id: str, user_id: int) -> dict:
+    """Finalize an upload for a product and return its file.
+
+    The finalized upload is kept (and can be claimed again) until the caller
+    deletes it once the product is committed, so a request that fails after
+    this point can be retried with the same upload id.
+    """
+    upload = load_upload(upload_id, user_id)
+    return finalize_upload(upload)
+
+
+def delete_upload(upload_id: str):
+    shutil.rmtree(_upload_dir(upload_id), ignore_errors=True)
+
+
+def finished_upload_urls():
+    """File URLs of finalized uploads not yet claimed by a product"""
+    try:
+        directories = list(PARTIAL_DIR.iterdir())
+    except FileNotFoundError:
+        return
+    for directory in directories:
+        try:
+            upload = json.loads((directory / "upload.json").read_text())
+            if upload["status"] == COMPLETE:
+                yield upload["result"]["file_url"]
+        except (FileNotFoundError, NotADirectoryError, ValueError, KeyError, TypeError):
+            continue
+
+
+def sweep_expired_uploads(now: float = None) -> int:
+    """Remove uploads idle for longer than ``UPLOAD_SESSION_TTL``; returns how many"""
+    now = time.time() if now is None else now
+    removed = 0
+    try:
+        directories = list(PARTIAL_DIR.iterdir())
+    except FileNotFoundError:
+        return 0
+
+    for directory in directories:
+        if not directory.is_dir() or now - last_activity(directory) < UPLOAD_SESSION_TTL:
+            continue
+        # A finalized but never claimed file is not referenced by any product
+        try:
+            upload = json.loads((directory / "upload.json").read_text())
+            if upload["status"] == COMPLETE:
+                (UPLOAD_ROOT / upload_path(upload["result"]["file_url"])).unlink(missing_ok=True)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            pass
+        shutil.rmtree(directory, ignore_errors=True)
+        removed += 1
+
+    if removed:
+        logger.info("Removed %d expired uploads", removed)
+    return removed
+
+
+upload_gc_task = PeriodicTask("upload-gc", UPLOAD_GC_INTERVAL, sweep_expired_uploads)
@@ -1,17 +1,92 @@
+from contextlib import asynccontextmanager
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.core.database import engine
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.database import engine, SessionLocal
+from app.core.catalog_index import catalog_index, catalog_refresh_task
+from app.core.counters import counters
+from app.core.ranking import ranking_task
+from app.core.recommendations import recommendations_task, rebuild_recommendations
+from app.core.suggest import rebuild_suggest_index
+from app.core.uploads import upload_gc_task
+from app.core.orphan_files import orphan_sweep_task
+from app.core.jobs import job_runner
+from app.core.change_feed import change_feed
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.replicas import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware, replica_router
+from app.core.media import MediaFiles
+from app.core.responses import FastJSONResponse
+from app.core.signing import FILES_URL_PREFIX, DOWNLOAD_URL_TTL
+from app.utils.storage import MEDIA_DIR, MEDIA_URL_PREFIX, UPLOAD_ROOT
 from app.models import base
+from app.models.product import Product
 from app.api.router import api_router
 from app.config import settings
 
-app = FastAPI(title="Multi-Role E-Commerce API")
+def load_catalog_index():
+    """Fill the in-memory catalog snapshot from the active products"""
+    db = SessionLocal()
+    try:
+        products = db.query(Product).options(
+            joinedload(Product.category),
+            selectinload(Product.reviews)
+        ).filter(
+            Product.is_active == True,
+            Product.status == "active"
+        ).yield_per(1000)
+        catalog_index.build(products)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Changes committed while the caches load are replayed by the first poll
+    change_feed.start()
+    replica_router.start()
+    if getattr(settings, "CATALOG_INDEX_ENABLED", False):
+        load_catalog_index()
+        catalog_refresh_task.start()
+    if getattr(settings, "SUGGEST_INDEX_ENABLED", False):
+        rebuild_suggest_index()
+    if getattr(settings, "RECOMMENDATIONS_ENABLED", False):
+        rebuild_recommendations()
+        recommendations_task.start()
+    counters.start()
+    ranking_task.start()
+    upload_gc_task.start()
+    orphan_sweep_task.start()
+    await job_runner.start()
+    yield
+    await job_runner.stop()
+    orphan_sweep_task.stop()
+    upload_gc_task.stop()
+    ranking_task.stop()
+    catalog_refresh_task.stop()
+    recommendations_task.stop()
+    change_feed.stop()
+    counters.stop()
+    replica_router.stop()
+
+app = FastAPI(
+    title="Multi-Role E-Commerce API",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
 
 # Create all tables
 base.Base.metadata.create_all(bind=engine)
 
+# Replay responses of retried POSTs carrying an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
+# Pin a client's reads to the primary for a moment after it writes
+app.add_middleware(ReadYourWritesMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -19,13 +94,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PRIMARY_UNTIL_HEADER],
 )
 
 # Include routes
 app.include_router(api_router)
 
+# Public images (thumbnails), immutable and cached long-term.  Paid product
+# files live outside MEDIA_DIR and are only served by the signed mount below
+app.mount(
+    MEDIA_URL_PREFIX,
+    MediaFiles(
+        directory=MEDIA_DIR,
+        accel_redirect_prefix=getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", None)
+    ),
+    name="media"
+)
+
 # Static folder (only if exists)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+if os.path.isdir("static"):
+    app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# Product files, only reachable through signed download URLs
+app.mount(
+    FILES_URL_PREFIX,
+    MediaFiles(
+        directory=UPLOAD_ROOT,
+        signed=True,
+        max_age=DOWNLOAD_URL_TTL,
+        accel_redirect_prefix=getattr(settings, "FILES_ACCEL_REDIRECT_PREFIX", None)
+    ),
+    name="files"
+)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ChangeLog(Base):
+    """One row per changed entity, written in the transaction that changed it"""
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)  # Feed position
+    entity = Column(String(50), nullable=False)  # product, user, wishlist
+    entity_id = Column(Integer, nullable=False)
+    origin = Column(String(100), nullable=True)  # Worker that made the change
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claim query: next ready jobs of a queue by priority
+        Index("ix_jobs_claim", "queue", "status", "priority", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    queue = Column(String(50), nullable=False)
+    name = Column(String(100), nullable=False)  # Registered handler
+    payload = Column(Text, nullable=False, default="{}")  # JSON keyword arguments
+    priority = Column(Integer, nullable=False, default=0, server_default="0")  # Higher runs first
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED, server_default=JobStatus.QUEUED)
+
+    # Retries
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=5, server_default="5")
+    last_error = Column(Text, nullable=True)
+
+    # Scheduling and lease of the worker running it
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
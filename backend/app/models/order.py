@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
@@ -25,7 +25,34 @@ class Order(Base):
     
     # Relationships
     user = relationship("User", back_populates="orders")
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+class OrderItem(Base):
+    __tablename__ = "order_items"
+    __table_args__ = (
+        # Seller order feed: a seller's orders newest first (also serves seller_id lookups)
+        Index("ix_order_items_seller_created", "seller_id", "created_at", "order_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Snapshot of the product at purchase time
+    product_name = Column(String(200), nullable=False)
+    product_price = Column(Float, nullable=False)
+    quantity = Column(Integer, nullable=False, default=1)
+    subtotal = Column(Float, nullable=False)
+    total = Column(Float, nullable=False)
+    
+    # Relationships
+    order = relationship("Order", back_populates="items")
+    product = relationship("Product", back_populates="order_items")
+    
+    # Timestamps (the order's creation time, so a seller's feed pages by order)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,8 +1,9 @@
 # app/models/product.py
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Text, DateTime, Enum
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Text, DateTime, Enum, select
+from sqlalchemy.orm import relationship, backref, deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.review import Review
 import enum
 
 
@@ -19,9 +20,12 @@ class Product(Base):
     # === Primary Key ===
     id = Column(Integer, primary_key=True, index=True)
     
+    # Large text columns are deferred in groups ("content", "seo") and
+    # loaded per endpoint, see app.core.load_profiles
+    
     # === Basic Information ===
     title = Column(String(200), index=True, nullable=False)
-    description = Column(Text, nullable=False)
+    description = deferred(Column(Text, nullable=False), group="content")
     short_description = Column(String(500), nullable=True)  # For listings
     price = Column(Float, nullable=False)
     compare_at_price = Column(Float, nullable=True)  # Original price for "sale" tag
@@ -37,18 +41,22 @@ class Product(Base):
     
     # === Media ===
     thumbnail_url = Column(String, nullable=True)
-    gallery_images = Column(Text, nullable=True)  # JSON array of image URLs
+    gallery_images = deferred(Column(Text, nullable=True), group="content")  # JSON array of image URLs
     video_url = Column(String, nullable=True)  # Product video
     
     # === Status & Visibility ===
     status = Column(Enum(ProductStatus), default=ProductStatus.DRAFT)
     is_active = Column(Boolean, default=True)  # Quick toggle
     is_featured = Column(Boolean, default=False)  # Show on homepage
-    is_bestseller = Column(Boolean, default=False)
+    is_bestseller = Column(Boolean, default=False)  # Top trending per category (app.core.ranking)
     
     # === Inventory (Even for digital, you might want limits) ===
     stock_quantity = Column(Integer, default=-1)  # -1 = unlimited
-    sold_count = Column(Integer, default=0)  # Total sales
+    sold_count = Column(Integer, default=0)  # Total sales, written behind (app.core.counters)
+    wishlist_count = Column(Integer, default=0, server_default="0")  # Maintained on wishlist add/remove
+    view_count = Column(Integer, default=0, server_default="0")  # Written behind (app.core.counters)
+    download_count = Column(Integer, default=0, server_default="0")  # Written behind (app.core.counters)
+    trending_score = Column(Float, default=0.0, server_default="0", index=True)  # Epoch-scaled, see app.core.ranking
     
     # === Categorization ===
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
@@ -59,13 +67,13 @@ class Product(Base):
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # === SEO & Metadata ===
-    meta_title = Column(String, nullable=True)
-    meta_description = Column(String, nullable=True)
+    meta_title = deferred(Column(String, nullable=True), group="seo")
+    meta_description = deferred(Column(String, nullable=True), group="seo")
     slug = Column(String, unique=True, index=True)  # URL-friendly name
     
     # === Timestamps ===
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     published_at = Column(DateTime(timezone=True), nullable=True)
     
     # === Relationships ===
@@ -81,6 +89,13 @@ class Product(Base):
             return sum(r.rating for r in self.reviews) / len(self.reviews)
         return 0.0
     
+    @classmethod
+    def average_rating_sql(cls):
+        """``average_rating`` as a correlated subquery, for ordering in SQL"""
+        return select(func.coalesce(func.avg(Review.rating), 0.0)).where(
+            Review.product_id == cls.id
+        ).correlate(cls).scalar_subquery()
+    
     @property
     def review_count(self):
         return len(self.reviews)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Float, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Float, Text, Index, text
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
 from app.core.database import Base
@@ -9,12 +9,34 @@ class UserRole(PyEnum):
     SELLER = "seller"
     ADMIN = "admin"
 
+class SellerApplicationStatus(PyEnum):
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin review queue, oldest application first: only pending rows are indexed
+        Index(
+            "ix_users_seller_pending", "seller_applied_at", "id",
+            postgresql_where=text("seller_application_status = 'PENDING'"),
+            sqlite_where=text("seller_application_status = 'PENDING'")
+        ),
+        # Decided applications by status, newest decision first; buyers who never applied are left out
+        Index(
+            "ix_users_seller_decided", "seller_application_status", "seller_decided_at",
+            postgresql_where=text("seller_application_status IS NOT NULL"),
+            sqlite_where=text("seller_application_status IS NOT NULL")
+        ),
+    )
 
     # === Primary Key ===
     id = Column(Integer, primary_key=True, index=True)
     
+    # Bulky or rarely read columns are deferred in groups ("profile",
+    # "address") and loaded per endpoint, see app.core.load_profiles
+    
     # === Authentication & Identity ===
     email = Column(String(255), unique=True, index=True, nullable=False)
     username = Column(String(50), unique=True, index=True, nullable=True)
@@ -24,7 +46,7 @@ class User(Base):
     # === Personal Information ===
     full_name = Column(String(255), nullable=True)
     avatar_url = Column(String(512), nullable=True)  # Profile picture
-    bio = Column(Text, nullable=True)  # For seller profiles
+    bio = deferred(Column(Text, nullable=True), group="profile")  # For seller profiles
     
     # === Role & Permissions ===
     role = Column(Enum(UserRole), nullable=False, default=UserRole.BUYER)
@@ -41,31 +63,35 @@ class User(Base):
     locked_until = Column(DateTime(timezone=True), nullable=True)  # Account lock
     
     # === Seller Specific (if role is seller) ===
+    # Application: NULL until the user applies; rejected applications keep their details
+    seller_application_status = Column(Enum(SellerApplicationStatus), nullable=True)
+    seller_applied_at = Column(DateTime(timezone=True), nullable=True)
+    seller_decided_at = Column(DateTime(timezone=True), nullable=True)
     store_name = Column(String(255), nullable=True)
-    seller_bio = Column(String(1024), nullable=True)
+    seller_bio = deferred(Column(String(1024), nullable=True), group="profile")
     seller_name = Column(String, nullable=True)  # Business/store name
-    seller_description = Column(Text, nullable=True)
-    seller_address = Column(String, nullable=True)
-    seller_tax_id = Column(String, nullable=True)  # VAT/EIN number
-    stripe_account_id = Column(String, nullable=True)  # For payments
+    seller_description = deferred(Column(Text, nullable=True), group="profile")
+    seller_address = deferred(Column(String, nullable=True), group="profile")
+    seller_tax_id = deferred(Column(String, nullable=True), group="profile")  # VAT/EIN number
+    stripe_account_id = deferred(Column(String, nullable=True), group="profile")  # For payments
     total_sales = Column(Float, default=0.0)  # Total revenue
     total_products = Column(Integer, default=0)  # Products count
     seller_rating = Column(Float, default=0.0)  # Average rating
     seller_verified = Column(Boolean, default=False)  # Identity verified
     
     # === Customer Specific ===
-    default_shipping_address = Column(String, nullable=True)
-    default_payment_method = Column(String, nullable=True)  # Last 4 digits
+    default_shipping_address = deferred(Column(String, nullable=True), group="address")
+    default_payment_method = deferred(Column(String, nullable=True), group="address")  # Last 4 digits
     total_spent = Column(Float, default=0.0)
     loyalty_points = Column(Integer, default=0)
     
     # === Address Information ===
-    address_line1 = Column(String(255), nullable=True)
-    address_line2 = Column(String(255), nullable=True)
-    city = Column(String(100), nullable=True)
-    state = Column(String(100), nullable=True)
-    country = Column(String(100), nullable=True)
-    postal_code = Column(String(20), nullable=True)
+    address_line1 = deferred(Column(String(255), nullable=True), group="address")
+    address_line2 = deferred(Column(String(255), nullable=True), group="address")
+    city = deferred(Column(String(100), nullable=True), group="address")
+    state = deferred(Column(String(100), nullable=True), group="address")
+    country = deferred(Column(String(100), nullable=True), group="address")
+    postal_code = deferred(Column(String(20), nullable=True), group="address")
     
     # === Preferences ===
     newsletter_subscribed = Column(Boolean, default=True)
@@ -85,7 +111,7 @@ class User(Base):
     products = relationship("Product", back_populates="seller", cascade="all, delete-orphan")
     
     # Orders they made (if customer)
-    orders = relationship("Order", back_populates="customer", cascade="all, delete-orphan")
+    orders = relationship("Order", back_populates="user", cascade="all, delete-orphan")
     
     # Reviews they wrote
     reviews = relationship("Review", back_populates="user", cascade="all, delete-orphan")
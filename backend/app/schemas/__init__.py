@@ -3,7 +3,7 @@ from .user import (
     UserLogin, UserRegister, Token
 )
 from .product import (
-    ProductBase, ProductCreate, ProductUpdate, ProductResponse
+    ProductBase, ProductCreate, ProductUpdate, ProductResponse, SellerProductResponse
 )
 from .order import (
     OrderBase, OrderItemBase, OrderItemCreate, OrderItemResponse,
@@ -13,7 +13,7 @@ from .order import (
 __all__ = [
     "UserBase", "UserCreate", "UserUpdate", "UserResponse", 
     "UserLogin", "UserRegister", "Token",
-    "ProductBase", "ProductCreate", "ProductUpdate", "ProductResponse",
+    "ProductBase", "ProductCreate", "ProductUpdate", "ProductResponse", "SellerProductResponse",
     "OrderBase", "OrderItemBase", "OrderItemCreate", "OrderItemResponse",
     "OrderCreate", "OrderUpdate", "OrderResponse"
 ]
\ No newline at end of file
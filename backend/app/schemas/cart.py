@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+MAX_ITEM_QUANTITY = 1000
+
+class CartItemAdd(BaseModel):
+    product_id: int
+    quantity: int = Field(1, gt=0, le=MAX_ITEM_QUANTITY)
+
+class CartItemUpdate(BaseModel):
+    quantity: int = Field(..., ge=0, le=MAX_ITEM_QUANTITY)  # 0 = remove
+
+class CartItemResponse(BaseModel):
+    """Cart line repriced from the current catalog"""
+    product_id: int
+    quantity: int
+    title: Optional[str]
+    thumbnail_url: Optional[str]
+    unit_price: Optional[float]
+    subtotal: float
+    available: bool  # Product still active
+    in_stock: bool
+
+class CartResponse(BaseModel):
+    items: List[CartItemResponse]
+    item_count: int
+    total: float
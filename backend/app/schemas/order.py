@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -42,4 +42,59 @@ class OrderResponse(OrderBase):
     user_id: int
     created_at: datetime
     updated_at: datetime
-    items: List[OrderItemResponse]
\ No newline at end of file
+    items: List[OrderItemResponse]
+
+class SellerOrderItem(BaseModel):
+    id: int
+    product_id: int
+    product_name: str
+    product_price: float
+    quantity: int
+    total: float
+
+class SellerOrderResponse(BaseModel):
+    """An order as one seller sees it: only that seller's items"""
+    id: int
+    status: OrderStatus
+    buyer_id: int
+    buyer_name: Optional[str] = None
+    shipping_address: Optional[str] = None
+    tracking_number: Optional[str] = None
+    created_at: datetime
+    seller_total: float
+    items: List[SellerOrderItem]
+
+class SellerOrderPage(BaseModel):
+    orders: List[SellerOrderResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
+
+class SellerOrderStatusCount(BaseModel):
+    orders: int = 0
+    revenue: float = 0.0
+
+class SellerOrderCounts(BaseModel):
+    total: int
+    by_status: Dict[OrderStatus, SellerOrderStatusCount]
+
+MAX_FULFILLMENT_ROWS = 5000
+
+class SellerFulfillmentUpdate(BaseModel):
+    """One row of a bulk fulfillment: new status and/or tracking number of an order"""
+    order_id: int
+    status: Optional[OrderStatus] = None
+    tracking_number: Optional[str] = Field(None, max_length=100)
+
+class SellerFulfillmentRequest(BaseModel):
+    updates: List[SellerFulfillmentUpdate] = Field(..., min_length=1, max_length=MAX_FULFILLMENT_ROWS)
+
+class SellerFulfillmentResult(BaseModel):
+    row: int  # 1-based position in the request (data rows of a CSV)
+    order_id: Optional[int] = None
+    updated: bool  # False for failed rows and rows already in the requested state
+    status: Optional[OrderStatus] = None  # Status of the order after the batch
+    error: Optional[str] = None
+
+class SellerFulfillmentReport(BaseModel):
+    updated: int
+    failed: int
+    results: List[SellerFulfillmentResult]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -45,9 +45,9 @@ class ProductUpdate(BaseModel):
     download_limit: Optional[int] = Field(None, ge=0)
 
 class ProductResponse(ProductBase):
+    """Public product details; the paid file is only reachable through signed links"""
     id: int
     seller_id: int
-    file_url: Optional[str]
     file_name: Optional[str]
     file_size: Optional[int]
     file_type: Optional[str]
@@ -55,12 +55,22 @@ class ProductResponse(ProductBase):
     preview_url: Optional[str]
     sample_file_url: Optional[str]
     sold_count: int
+    wishlist_count: int = 0
     average_rating: float
     review_count: int
     created_at: datetime
     updated_at: datetime
     published_at: Optional[datetime]
 
+class SellerProductResponse(ProductResponse):
+    """Product details for its seller, including the stored file location"""
+    file_url: Optional[str]
+
+class ProductBatchResponse(BaseModel):
+    """Schema for fetching several products by id"""
+    products: List[ProductResponse]
+    missing: List[int]
+
 class ProductList(BaseModel):
     """Schema for product listings (public view)"""
     id: int
@@ -72,10 +82,44 @@ class ProductList(BaseModel):
     seller_name: Optional[str]
     seller_rating: float
     sold_count: int
+    wishlist_count: int = 0
     average_rating: float
     review_count: int
     is_featured: bool
     created_at: datetime
+    is_wishlisted: Optional[bool] = None  # Only set for logged-in users
+
+class Suggestion(BaseModel):
+    """Typeahead suggestion: a product, a tag or a store"""
+    kind: str  # product, tag or store
+    text: str
+    product_id: Optional[int] = None
+    seller_id: Optional[int] = None
+
+class ProductModerationFilter(BaseModel):
+    """Products matching all given fields"""
+    seller_id: Optional[int] = None
+    category_id: Optional[int] = None
+    status: Optional[ProductStatus] = None
+
+class ProductBulkStatusRequest(BaseModel):
+    """Set the status of products given by id, or matching a filter"""
+    status: ProductStatus
+    product_ids: Optional[List[int]] = Field(None, min_length=1)
+    filter: Optional[ProductModerationFilter] = None
+
+class ProductBulkStatusResult(BaseModel):
+    updated: int
+    product_ids: List[int]  # Products whose status changed
+    skipped: List[int] = []  # Requested ids that do not exist or already have the status
+    has_more: bool = False  # The filter matched more than one batch: send it again
+
+class SignedDownloadURLs(BaseModel):
+    """Short-lived signed links to a product's files"""
+    file_url: Optional[str]  # Only for the seller and buyers of the product
+    preview_url: Optional[str]
+    sample_file_url: Optional[str]
+    expires_at: datetime
 
 class ProductFileUpload(BaseModel):
     """Schema for file upload response"""
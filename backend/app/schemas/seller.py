@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -23,6 +23,8 @@ class SellerApplicationResponse(BaseModel):
     seller_address: str
     seller_tax_id: Optional[str]
     status: SellerApplicationStatus
+    applied_at: Optional[datetime] = None
+    decided_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime]
 
@@ -30,6 +32,23 @@ class SellerApprovalRequest(BaseModel):
     status: SellerApplicationStatus
     rejection_reason: Optional[str] = Field(None, max_length=500)
 
+class SellerApplicationFilter(BaseModel):
+    """Pending applications submitted in a time range ({} for all pending)"""
+    applied_after: Optional[datetime] = None
+    applied_before: Optional[datetime] = None
+
+class SellerBulkDecisionRequest(BaseModel):
+    """Decide pending applications given by id, or matching a filter"""
+    status: SellerApplicationStatus
+    user_ids: Optional[List[int]] = Field(None, min_length=1)
+    filter: Optional[SellerApplicationFilter] = None
+
+class SellerBulkDecisionResult(BaseModel):
+    updated: int
+    user_ids: List[int]  # Applications decided by this batch
+    skipped: List[int] = []  # Requested ids that are not pending applications
+    has_more: bool = False  # The filter matched more than one batch: send it again
+
 class SellerProfile(BaseModel):
     id: int
     email: str
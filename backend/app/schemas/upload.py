@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.core.uploads import MIN_CHUNK_SIZE, MAX_CHUNK_SIZE
+
+class UploadCreate(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255)
+    file_type: str  # MIME type
+    file_size: int = Field(..., gt=0)
+    chunk_size: Optional[int] = Field(None, ge=MIN_CHUNK_SIZE, le=MAX_CHUNK_SIZE)
+
+class UploadResponse(BaseModel):
+    """State of a resumable upload"""
+    id: str
+    file_name: str
+    file_type: str
+    file_size: int
+    chunk_size: int
+    chunk_count: int
+    status: str  # uploading or complete
+    offset: int  # Bytes received contiguously from the start
+    missing_chunks: List[int]  # Chunk i starts at i * chunk_size
+    expires_at: datetime
+    file_url: Optional[str] = None  # Once complete
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class WishlistItemResponse(BaseModel):
+    product_id: int
+    wishlist_count: int
+    created_at: datetime
@@ -0,0 +1,72 @@
+"""
+Sparse fieldsets (``?fields=id,title,price``) for read endpoints.
+
+The requested names are checked against the response schema, used to
+restrict the ORM columns loaded (``load_only``) and to serialize through a
+partial copy of the schema that keeps the original field validation.
+"""
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from app.core.responses import FastJSONResponse, fast_response
+
+FIELDS_DESCRIPTION = "Comma-separated list of fields to return"
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[FrozenSet[str]]:
+    """Validate a ``fields`` query value against a schema; None means all fields"""
+    if not fields:
+        return None
+
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {sorted(unknown)}. Allowed fields: {list(schema.model_fields)}"
+        )
+    if not requested:
+        return None
+    return requested
+
+
+def load_only_options(model, fields: Optional[Iterable[str]], always: Iterable[str] = ()) -> list:
+    """``load_only`` option for the requested fields that are plain columns of ``model``"""
+    if fields is None:
+        return []
+
+    mapper = inspect(model)
+    names = set(fields) | set(always) | {column.key for column in mapper.primary_key}
+    columns = [
+        getattr(model, name) for name in names
+        if name in mapper.column_attrs
+    ]
+    return [load_only(*columns)]
+
+
+@lru_cache(maxsize=256)
+def partial_schema(schema: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    """Copy of ``schema`` restricted to ``fields``, keeping each field's validation"""
+    definitions = {
+        name: (field.annotation, field)
+        for name, field in schema.model_fields.items()
+        if name in fields
+    }
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions
+    )
+
+
+def sparse_response(data, schema: Type[BaseModel], fields: FrozenSet[str]) -> FastJSONResponse:
+    """Serialize an object (or list of objects) with only the requested fields"""
+    model = partial_schema(schema, fields)
+    if isinstance(data, list):
+        return fast_response(data, List[model])
+    return fast_response(data, model)
@@ -0,0 +1,104 @@
+"""
+File storage for product uploads.
+
+Uploaded files live under ``uploads/`` and are stored as
+``/static/uploads/<path>`` URLs.  Paid product files go to ``products/`` and
+are only served through signed ``/files/`` URLs; thumbnails and other public
+images go to ``media/``, the only directory mounted publicly.  Names are
+unique and files are never rewritten in place.  Files are spread over two
+levels of sharded subdirectories taken from their name
+(``products/3f/a2/3fa2....pdf``) so no single directory grows to millions of
+entries; files nothing refers to are removed by ``app.core.orphan_files``.
+"""
+import os
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+
+UPLOAD_ROOT = Path("uploads")
+UPLOAD_URL_PREFIX = "/static/uploads"  # Stored URLs: UPLOAD_URL_PREFIX + path under UPLOAD_ROOT
+UPLOAD_DIR = UPLOAD_ROOT / "products"  # Paid files, never served publicly
+MEDIA_DIR = UPLOAD_ROOT / "media"  # Public images
+MEDIA_URL_PREFIX = f"{UPLOAD_URL_PREFIX}/media"  # Where MEDIA_DIR is mounted
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+
+ALLOWED_FILE_TYPES = {
+    "application/pdf": "pdf",
+    "application/zip": "zip", 
+    "video/mp4": "mp4",
+    "image/jpeg": "jpg",
+    "image/png": "png"
+}
+
+MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+
+
+def check_file_type(content_type: str):
+    if content_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type {content_type} not allowed. Allowed types: {list(ALLOWED_FILE_TYPES.keys())}"
+        )
+
+
+def check_file_size(size: int):
+    if size and size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File size exceeds 100MB limit"
+        )
+
+
+def validate_file(file: UploadFile) -> bool:
+    """Validate file type and size"""
+    check_file_size(file.size)
+    check_file_type(file.content_type)
+    return True
+
+
+def generate_unique_filename(original_filename: str) -> str:
+    """Generate unique filename using UUID"""
+    file_extension = os.path.splitext(original_filename)[1]
+    return f"{uuid.uuid4()}{file_extension}"
+
+
+def shard_path(filename: str) -> str:
+    """``3fa2....pdf`` -> ``3f/a2/3fa2....pdf``: 65536 directories of uniformly spread names"""
+    return f"{filename[:2]}/{filename[2:4]}/{filename}"
+
+
+def upload_url(path: Path) -> str:
+    """Stored URL of a file under ``UPLOAD_ROOT``"""
+    return f"{UPLOAD_URL_PREFIX}/{path.relative_to(UPLOAD_ROOT).as_posix()}"
+
+
+def _new_file(directory: Path, original_filename: str) -> tuple:
+    path = directory / shard_path(generate_unique_filename(original_filename))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path, upload_url(path)
+
+
+def _write(path: Path, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def new_product_file(original_filename: str) -> tuple:
+    """Path and URL for a new paid file in ``UPLOAD_DIR``, shard directory created"""
+    return _new_file(UPLOAD_DIR, original_filename)
+
+
+def save_product_file(original_filename: str, content: bytes) -> str:
+    """Write a new paid product file; returns its URL (to be signed for downloads)"""
+    path, url = new_product_file(original_filename)
+    _write(path, content)
+    return url
+
+
+def save_media_file(original_filename: str, content: bytes) -> str:
+    """Write a new public image (thumbnail) to ``MEDIA_DIR``; returns its public URL"""
+    path, url = _new_file(MEDIA_DIR, original_filename)
+    _write(path, content)
+    return url
@@ -0,0 +1,66 @@
+"""
+Microbenchmark: encode time for a 100-row product listing page.
+
+Compares the per-row ``ProductList`` + ``response_model`` re-validation +
+stdlib ``json`` path with the cached ``TypeAdapter`` fast path.
+
+    cd backend && python -m benchmarks.serialization
+"""
+from datetime import datetime, timezone
+import json
+import timeit
+from typing import List
+
+from app.core.responses import encode, orjson, type_adapter
+from app.schemas.product import ProductList
+
+ROWS = 100
+REPEAT = 200
+
+
+def make_rows(count: int = ROWS) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Product {i}",
+            "short_description": "A short description used on listing tiles",
+            "price": 19.99 + i,
+            "compare_at_price": 29.99 + i,
+            "thumbnail_url": f"/static/uploads/products/{i:08x}.png",
+            "seller_name": "Example Store",
+            "seller_rating": 4.5,
+            "sold_count": i * 3,
+            "average_rating": 4.2,
+            "review_count": i,
+            "is_featured": i % 7 == 0,
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def encode_stdlib(rows: List[dict]) -> bytes:
+    """What the endpoint did before: model per row, re-validation, stdlib json"""
+    models = [ProductList(**row) for row in rows]
+    adapter = type_adapter(List[ProductList])
+    content = adapter.dump_python(adapter.validate_python(models), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_fast(rows: List[dict]) -> bytes:
+    return encode(rows, List[ProductList])
+
+
+def main():
+    rows = make_rows()
+    assert json.loads(encode_stdlib(rows)) == json.loads(encode_fast(rows))
+
+    print(f"orjson installed: {orjson is not None}")
+    for name, func in (("stdlib", encode_stdlib), ("fast", encode_fast)):
+        seconds = min(timeit.repeat(lambda: func(rows), number=REPEAT, repeat=5)) / REPEAT
+        print(f"{name:>8}: {seconds * 1e6:8.1f} us per {ROWS} rows")
+
+
+if __name__ == "__main__":
+    main()
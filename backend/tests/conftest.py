@@ -0,0 +1,48 @@
+import os
+
+# Settings are read on import; tests build their own engines
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+import app.models.change_log  # noqa: F401 - register every table on Base.metadata
+import app.models.job  # noqa: F401
+import app.models.order  # noqa: F401
+import app.models.product  # noqa: F401
+import app.models.review  # noqa: F401
+import app.models.user  # noqa: F401
+import app.models.wishlist  # noqa: F401
+
+
+def sqlite_engine(url: str = "sqlite://"):
+    """Engine with the full schema; in-memory databases share one connection"""
+    options = {"connect_args": {"check_same_thread": False}}
+    if url == "sqlite://":
+        options["poolclass"] = StaticPool
+    engine = create_engine(url, **options)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def engine():
+    engine = sqlite_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
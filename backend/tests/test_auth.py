@@ -0,0 +1,94 @@
+"""Authentication: optional auth and login throttling"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import auth, cart, products
+from app.core.database import get_db
+from app.core.kvstore import MemoryStore
+from app.core.rate_limit import limiters
+from app.core.replicas import get_read_db
+from app.models.user import User
+
+
+@pytest.fixture
+def users(db):
+    db.add(User(id=1, email="buyer@example.com", username="buyer", hashed_password=auth.get_password_hash("secret")))
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def client(users, session_factory, monkeypatch):
+    monkeypatch.setattr(auth, "unknown_login_failures", MemoryStore())
+    monkeypatch.setattr(limiters["auth"], "_buckets", OrderedDict())
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(products.router)
+    app.include_router(cart.router)
+
+    def session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_read_db] = session
+    return TestClient(app)
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("token", [
+    auth.create_access_token({"sub": "1"}, timedelta(minutes=-5)),  # Expired
+    auth.create_access_token({"sub": "404"}),  # Unknown user
+    "not-a-jwt",
+])
+def test_optional_user_ignores_stale_tokens(users, token):
+    assert auth.get_optional_user(token, users) is None
+
+
+def test_optional_user_reads_a_valid_token(users):
+    assert auth.get_optional_user(auth.create_access_token({"sub": "1"}), users).id == 1
+
+
+def test_public_endpoints_accept_an_expired_token(client):
+    expired = bearer(auth.create_access_token({"sub": "1"}, timedelta(minutes=-5)))
+
+    assert client.get("/products/", headers=expired).status_code == 200
+    assert client.get("/cart/", headers={**expired, "X-Cart-Token": "anonymous-cart"}).status_code == 200
+
+
+@pytest.mark.parametrize("email", ["buyer@example.com", "nobody@example.com"])
+def test_lockout_looks_the_same_for_unknown_emails(client, email):
+    attempt = {"email": email, "password": "wrong-password"}
+    for _ in range(auth.MAX_LOGIN_ATTEMPTS):
+        response = client.post("/auth/login", json=attempt)
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Incorrect email or password"}
+
+    response = client.post("/auth/login", json=attempt)
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Account temporarily locked after too many failed login attempts"}
+    assert int(response.headers["Retry-After"]) == auth.LOCKOUT_MINUTES * 60
+
+
+def test_concurrent_failed_logins_are_all_counted(users, session_factory):
+    sessions = [session_factory() for _ in range(auth.MAX_LOGIN_ATTEMPTS)]
+    loaded = [session.get(User, 1) for session in sessions]  # All read login_attempts == 0
+    now = datetime.now(timezone.utc)
+    for session, user in zip(sessions, loaded):
+        auth.record_failed_login(session, user, user.email, now)
+        session.close()
+
+    user = users.get(User, 1)
+    users.refresh(user)
+    assert user.login_attempts == 0
+    assert auth.as_utc(user.locked_until) == now + timedelta(minutes=auth.LOCKOUT_MINUTES)
@@ -0,0 +1,80 @@
+"""The in-memory catalog index must page exactly like the SQL listing"""
+from datetime import datetime, timedelta, timezone
+import random
+
+import pytest
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.api.products import query_public_products
+from app.core.catalog_index import SORT_KEYS, CatalogIndex, refresh_catalog_counts
+from app.models.product import Category, Product, ProductStatus
+from app.models.review import Review
+from app.models.user import User
+
+CATEGORIES = (None, "books", "music")
+
+
+@pytest.fixture
+def catalog(db):
+    rng = random.Random(26)
+    db.add(User(id=1, email="seller@example.com", username="seller", hashed_password="x"))
+    db.add_all([
+        Category(id=1, name="books", slug="books"),
+        Category(id=2, name="music", slug="music"),
+    ])
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for product_id in range(1, 121):
+        db.add(Product(
+            id=product_id,
+            title=f"Product {product_id}",
+            description="A product description",
+            price=rng.choice((5.0, 10.0, 19.99)),  # Ties exercise the id tie-break
+            seller_id=1,
+            category_id=rng.choice((1, 2, None)),
+            status=ProductStatus.ACTIVE if product_id % 7 else ProductStatus.DRAFT,
+            is_active=product_id % 11 != 0,
+            sold_count=rng.randint(0, 5),
+            trending_score=rng.choice((0.0, 1.5, 3.0)),
+            created_at=start + timedelta(hours=rng.randint(0, 48)),
+        ))
+        for _ in range(rng.randint(0, 3)):
+            db.add(Review(product_id=product_id, user_id=1, rating=rng.randint(1, 5)))
+    db.commit()
+
+    index = CatalogIndex()
+    index.build(db.query(Product).options(
+        joinedload(Product.category),
+        selectinload(Product.reviews)
+    ).all())
+    return index
+
+
+def sql_page(db, category, sort_by, sort_order, skip, limit):
+    products = query_public_products(db, [], category, None, sort_by, sort_order, skip, limit)
+    return [product.id for product in products]
+
+
+@pytest.mark.parametrize("category", CATEGORIES)
+@pytest.mark.parametrize("sort_by", sorted(SORT_KEYS))
+@pytest.mark.parametrize("sort_order", ("asc", "desc"))
+def test_index_pages_match_sql(db, catalog, category, sort_by, sort_order):
+    for skip, limit in ((0, 100), (0, 7), (7, 7), (35, 10), (500, 10)):
+        assert catalog.query(category, sort_by, sort_order, skip, limit) == \
+            sql_page(db, category, sort_by, sort_order, skip, limit)
+
+
+def test_unknown_category_is_empty(db, catalog):
+    assert catalog.query("games") == sql_page(db, "games", "created_at", "desc", 0, 100) == []
+
+
+def test_refresh_picks_up_counts_changed_behind_the_index(db, session_factory, catalog):
+    db.query(Product).update({Product.sold_count: Product.sold_count + Product.id % 4}, synchronize_session=False)
+    db.add_all([Review(product_id=product_id, user_id=1, rating=5) for product_id in range(1, 121, 3)])
+    db.commit()
+
+    refresh_catalog_counts(catalog, session_factory)
+
+    for sort_by in ("sold_count", "rating"):
+        for sort_order in ("asc", "desc"):
+            assert catalog.query(None, sort_by, sort_order, 0, 100) == \
+                sql_page(db, None, sort_by, sort_order, 0, 100)
@@ -0,0 +1,126 @@
+"""Hot paths must not select the deferred (large text) columns"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, inspect
+
+from app.api import orders, products
+from app.api.auth import create_access_token, get_current_user, get_optional_user, load_current_user
+from app.core.cache import product_cache
+from app.core.database import get_db
+from app.core.replicas import get_read_db
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, ProductStatus
+from app.models.review import Review
+from app.models.user import User, UserRole
+
+
+def deferred_labels(model) -> set:
+    """``<table>_<column>`` labels of the deferred columns, as they appear in SELECTs"""
+    table = model.__table__.name
+    return {f"{table}_{prop.key}" for prop in inspect(model).column_attrs if prop.deferred}
+
+
+PRODUCT_DEFERRED = deferred_labels(Product)
+USER_DEFERRED = deferred_labels(User)
+
+
+def selected(statements, labels: set) -> set:
+    return {label for label in labels for statement in statements if f"AS {label}" in statement}
+
+
+@pytest.fixture
+def shop(db):
+    db.add_all([
+        User(id=1, email="buyer@example.com", username="buyer", hashed_password="x", bio="A long bio"),
+        User(
+            id=2, email="seller@example.com", username="seller", hashed_password="x",
+            role=UserRole.SELLER, store_name="Store", seller_description="About the store"
+        ),
+    ])
+    for product_id in range(1, 11):
+        db.add(Product(
+            id=product_id, title=f"Product {product_id}", description="A long description " * 50,
+            price=10.0, seller_id=2, status=ProductStatus.ACTIVE, meta_description="SEO text"
+        ))
+        db.add_all([Review(product_id=product_id, user_id=1, rating=rating) for rating in (3, 5)])
+    order = Order(user_id=1, total_amount=10.0, status=OrderStatus.PENDING)
+    order.items = [OrderItem(
+        product_id=1, seller_id=2, product_name="Product 1",
+        product_price=10.0, quantity=1, subtotal=10.0, total=10.0
+    )]
+    db.add(order)
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def client(shop, session_factory):
+    app = FastAPI()
+    app.include_router(products.router)
+    app.include_router(orders.router)
+
+    def session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    buyer = shop.get(User, 1)
+    shop.expunge(buyer)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_read_db] = session
+    app.dependency_overrides[get_optional_user] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: buyer
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_listing_skips_deferred_columns_and_loads_ratings_per_page(client, statements):
+    rows = client.get("/products/").json()
+
+    assert len(rows) == 10
+    assert rows[0]["average_rating"] == 4.0 and rows[0]["review_count"] == 2
+    assert selected(statements, PRODUCT_DEFERRED | USER_DEFERRED) == set()
+    assert len(statements) == 2  # Products with their sellers, then the page's reviews
+
+
+def test_sparse_detail_skips_deferred_columns(client, statements):
+    assert client.get("/products/1", params={"fields": "id,title,price"}).status_code == 200
+
+    assert selected(statements, PRODUCT_DEFERRED) == set()
+
+
+def test_full_detail_loads_deferred_columns_with_the_product(client, statements):
+    product_cache.delete(1)
+    product = client.get("/products/1").json()
+
+    assert product["description"].startswith("A long description")
+    # In the product query itself, not one lazy load per deferred group
+    assert selected(statements[:1], PRODUCT_DEFERRED) == PRODUCT_DEFERRED
+
+
+def test_order_history_skips_products_and_users(client, statements):
+    assert len(client.get("/orders/").json()) == 1
+
+    assert not any("FROM products" in statement or "FROM users" in statement for statement in statements)
+
+
+def test_auth_lookup_skips_profile_and_address(shop, statements):
+    user = load_current_user(create_access_token({"sub": "1"}), shop)
+
+    assert user.id == 1
+    assert len(statements) == 1
+    assert selected(statements, USER_DEFERRED) == set()
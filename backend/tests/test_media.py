@@ -0,0 +1,50 @@
+"""Paid product files are only served through signed links; thumbnails are public"""
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.signing import download_expiry, sign_url, upload_path
+from app.main import app
+from app.utils.storage import UPLOAD_ROOT, save_media_file, save_product_file
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def stored():
+    urls = []
+
+    def store(save, content: bytes) -> str:
+        urls.append(save("file.png", content))
+        return urls[-1]
+
+    yield store
+    for url in urls:
+        os.unlink(UPLOAD_ROOT / upload_path(url))
+
+
+def test_product_file_is_not_public(client, stored):
+    url = stored(save_product_file, b"paid content")
+
+    assert client.get(url).status_code == 404
+
+
+def test_product_file_needs_a_valid_signature(client, stored):
+    url = stored(save_product_file, b"paid content")
+    signed = sign_url(url, 1, 1, download_expiry())
+
+    assert client.get(signed).content == b"paid content"
+    assert client.get(signed.split("?", 1)[0]).status_code == 403
+    assert client.get(signed.replace("pid=1", "pid=2")).status_code == 403
+
+
+def test_thumbnail_is_public(client, stored):
+    url = stored(save_media_file, b"thumbnail")
+
+    response = client.get(url)
+    assert response.content == b"thumbnail"
+    assert "public" in response.headers["cache-control"]
@@ -0,0 +1,119 @@
+"""Order history costs a fixed number of queries, however many orders and items"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.auth import get_current_user
+from app.api.orders import router as orders_router
+from app.core.database import get_db
+from app.core.replicas import get_read_db
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, ProductStatus
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def shop(db):
+    db.add_all([
+        User(id=1, email="buyer@example.com", username="buyer", hashed_password="x"),
+        User(id=2, email="seller@example.com", username="seller", hashed_password="x", role=UserRole.SELLER),
+    ])
+    db.add_all([
+        Product(
+            id=product_id, title=f"Product {product_id}", description="A product description",
+            price=10.0, seller_id=2, status=ProductStatus.ACTIVE
+        )
+        for product_id in range(1, 4)
+    ])
+    db.commit()
+    return db
+
+
+def add_orders(db, count: int, items_per_order: int):
+    for _ in range(count):
+        order = Order(user_id=1, total_amount=10.0 * items_per_order, status=OrderStatus.PENDING)
+        order.items = [
+            OrderItem(
+                product_id=product_id, seller_id=2, product_name=f"Product {product_id}",
+                product_price=10.0, quantity=1, subtotal=10.0, total=10.0
+            )
+            for product_id in range(1, items_per_order + 1)
+        ]
+        db.add(order)
+    db.commit()
+
+
+@pytest.fixture
+def client(shop, session_factory):
+    app = FastAPI()
+    app.include_router(orders_router)
+
+    def session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_read_db] = session
+    buyer = shop.get(User, 1)
+    shop.expunge(buyer)  # Loaded once, so requests only query orders
+    app.dependency_overrides[get_current_user] = lambda: buyer
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def history_queries(client, statements, **params) -> tuple:
+    statements.clear()
+    response = client.get("/orders/", params=params)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+def test_order_history_query_count_is_constant(client, shop, statements):
+    add_orders(shop, count=1, items_per_order=1)
+    one, orders = history_queries(client, statements)
+    assert len(orders) == 1
+
+    add_orders(shop, count=20, items_per_order=3)
+    many, orders = history_queries(client, statements)
+    assert len(orders) == 21
+    assert sum(len(order["items"]) for order in orders) == 61
+
+    assert one == many == 2
+
+
+def test_order_history_without_items_skips_them(client, shop, statements):
+    add_orders(shop, count=5, items_per_order=2)
+    count, orders = history_queries(client, statements, fields="id,total_amount")
+
+    assert count == 1
+    assert orders[0] == {"id": 1, "total_amount": 20.0}
+
+
+def test_create_order_returns_its_items(client):
+    response = client.post("/orders/", json={
+        "total_amount": 30.0,
+        "items": [
+            {"product_id": 1, "quantity": 1, "price": 10.0},
+            {"product_id": 2, "quantity": 2, "price": 10.0},
+        ],
+    })
+
+    assert response.status_code == 200
+    assert [(item["product_id"], item["price"], item["quantity"]) for item in response.json()["items"]] == [
+        (1, 10.0, 1), (2, 10.0, 2)
+    ]
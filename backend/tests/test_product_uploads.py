@@ -0,0 +1,109 @@
+"""A resumable upload is only used up once the product using it is committed"""
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import products
+from app.core.change_feed import record_change
+from app.core.database import get_db
+from app.core.permissions import get_approved_seller
+from app.core.signing import upload_path
+from app.core.uploads import create_upload, delete_upload, load_upload, write_chunk
+from app.models.product import Product
+from app.models.user import User, UserRole
+from app.utils.storage import UPLOAD_ROOT
+
+CONTENT = b"%PDF-1.7 product file"
+
+
+@pytest.fixture
+def seller(db):
+    user = User(
+        id=1, email="seller@example.com", username="seller", hashed_password="x",
+        role=UserRole.SELLER, is_seller_approved=True
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    return user
+
+
+@pytest.fixture
+def client(seller, session_factory):
+    app = FastAPI()
+    app.include_router(products.router)
+
+    def session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_approved_seller] = lambda: seller
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+def upload(seller):
+    upload = create_upload(seller.id, "book.pdf", "application/pdf", len(CONTENT))
+    write_chunk(upload, 0, CONTENT)
+    yield upload
+    delete_upload(upload["id"])
+
+
+@pytest.fixture
+def created_files(monkeypatch):
+    """Files the test moves out of uploads, removed afterwards"""
+    urls = []
+    original = products.claim_upload
+
+    def claim_upload(*args):
+        result = original(*args)
+        urls.append(result["file_url"])
+        return result
+
+    monkeypatch.setattr(products, "claim_upload", claim_upload)
+    yield
+    for url in urls:
+        (UPLOAD_ROOT / upload_path(url)).unlink(missing_ok=True)
+
+
+def create(client, upload_id, **files):
+    return client.post("/products/", data={
+        "title": "Book",
+        "description": "A long enough description",
+        "price": "9.5",
+        "upload_id": upload_id,
+    }, files=files)
+
+
+def test_invalid_thumbnail_keeps_the_upload(client, seller, upload, created_files):
+    response = create(client, upload["id"], thumbnail=("thumb.gif", b"GIF89a", "image/gif"))
+
+    assert response.status_code == 400
+    assert load_upload(upload["id"], seller.id)["status"] == "uploading"
+
+
+def test_failed_commit_keeps_the_upload(client, seller, upload, created_files, monkeypatch, db):
+    def fail(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(products, "record_change", fail)
+    assert create(client, upload["id"]).status_code == 500
+    assert db.query(Product).count() == 0
+
+    monkeypatch.setattr(products, "record_change", record_change)
+    response = create(client, upload["id"])
+    assert response.status_code == 200
+    assert (UPLOAD_ROOT / upload_path(response.json()["file_url"])).read_bytes() == CONTENT
+
+
+def test_committed_product_uses_up_the_upload(client, seller, upload, created_files):
+    assert create(client, upload["id"]).status_code == 200
+
+    with pytest.raises(HTTPException):
+        load_upload(upload["id"], seller.id)
+    assert create(client, upload["id"]).status_code == 404
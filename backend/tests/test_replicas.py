@@ -0,0 +1,127 @@
+"""Read sessions go to healthy replicas, except right after the client wrote"""
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from conftest import sqlite_engine
+from app.core.database import SessionLocal
+from app.core.replicas import (
+    PRIMARY_STICKY_SECONDS, PRIMARY_UNTIL_HEADER,
+    ReadOnlySessionError, ReadYourWritesMiddleware, ReplicaRouter
+)
+from app.models.product import Category
+
+
+def database_file(tmp_path, name: str) -> str:
+    """SQLite file with the schema and one category naming the database"""
+    url = f"sqlite:///{tmp_path / name}.db"
+    engine = sqlite_engine(url)
+    with engine.begin() as connection:
+        connection.execute(Category.__table__.insert(), {"id": 1, "name": name, "slug": name})
+    engine.dispose()
+    return url
+
+
+def served_by(session) -> str:
+    return session.get(Category, 1).name
+
+
+@pytest.fixture
+def primary(tmp_path, monkeypatch):
+    engine = sqlite_engine(database_file(tmp_path, "primary"))
+    monkeypatch.setitem(SessionLocal.kw, "bind", engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def router(tmp_path, primary):
+    router = ReplicaRouter([database_file(tmp_path, "replica-1"), database_file(tmp_path, "replica-2")])
+    yield router
+    router.stop()
+
+
+def test_reads_alternate_between_replicas(router):
+    names = []
+    for _ in range(4):
+        session = router.read_session()
+        names.append(served_by(session))
+        session.close()
+
+    assert names == ["replica-1", "replica-2", "replica-1", "replica-2"]
+    assert [replica.sessions for replica in router.replicas] == [2, 2]
+
+
+def test_unhealthy_replicas_fall_back_to_primary(tmp_path, primary):
+    missing = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    router = ReplicaRouter([database_file(tmp_path, "replica-1"), missing])
+    router.check()
+    assert [replica.healthy for replica in router.replicas] == [True, False]
+
+    for _ in range(2):
+        session = router.read_session()
+        assert served_by(session) == "replica-1"
+        session.close()
+
+    router.replicas[0].healthy = False
+    session = router.read_session()
+    assert served_by(session) == "primary"
+    session.close()
+    assert router.primary_reads == 1
+    router.stop()
+
+
+def test_replica_sessions_refuse_writes(router):
+    session = router.read_session()
+    session.add(Category(id=2, name="new", slug="new"))
+    with pytest.raises(ReadOnlySessionError):
+        session.flush()
+    session.rollback()
+
+    with pytest.raises(ReadOnlySessionError):
+        session.query(Category).update({"name": "renamed"})
+    session.close()
+
+
+@pytest.fixture
+def client(router):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/categories/{name}")
+    def write(name: str):
+        session = SessionLocal()
+        session.get(Category, 1).name = name
+        session.commit()
+        session.close()
+        return {}
+
+    @app.get("/categories")
+    def read():
+        session = router.read_session()
+        try:
+            return {"name": served_by(session)}
+        finally:
+            session.close()
+
+    return TestClient(app)
+
+
+def test_reads_after_a_write_use_the_primary(client):
+    assert PRIMARY_UNTIL_HEADER not in client.get("/categories").headers
+
+    response = client.post("/categories/written")
+    until = float(response.headers[PRIMARY_UNTIL_HEADER])
+    assert time.time() < until <= time.time() + PRIMARY_STICKY_SECONDS
+
+    echoed = {PRIMARY_UNTIL_HEADER: response.headers[PRIMARY_UNTIL_HEADER]}
+    assert client.get("/categories", headers=echoed).json() == {"name": "written"}
+    assert client.get("/categories").json()["name"].startswith("replica-")
+
+
+@pytest.mark.parametrize("until", ["1", "not-a-time", str(time.time() + 365 * 24 * 3600)])
+def test_expired_or_forged_header_reads_from_replicas(client, until):
+    response = client.get("/categories", headers={PRIMARY_UNTIL_HEADER: until})
+    assert response.json()["name"].startswith("replica-")
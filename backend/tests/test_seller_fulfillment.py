@@ -0,0 +1,100 @@
+"""Bulk fulfillment reports only the orders it actually changed"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api import sellers
+from app.core.database import get_db
+from app.core.permissions import get_approved_seller
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, ProductStatus
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def shop(db):
+    seller = User(
+        id=2, email="seller@example.com", username="seller", hashed_password="x",
+        role=UserRole.SELLER, is_seller_approved=True
+    )
+    db.add_all([User(id=1, email="buyer@example.com", username="buyer", hashed_password="x"), seller])
+    db.add(Product(id=1, title="Product 1", description="A product description", price=10.0, seller_id=2,
+                   status=ProductStatus.ACTIVE))
+    for order_id, (order_status, tracking_number) in enumerate([
+        (OrderStatus.CONFIRMED, None),
+        (OrderStatus.SHIPPED, "TRACK-2"),
+        (OrderStatus.CONFIRMED, "TRACK-3"),
+    ], 1):
+        order = Order(
+            id=order_id, user_id=1, total_amount=10.0, status=order_status, tracking_number=tracking_number
+        )
+        order.items = [OrderItem(
+            product_id=1, seller_id=2, product_name="Product 1",
+            product_price=10.0, quantity=1, subtotal=10.0, total=10.0
+        )]
+        db.add(order)
+    db.commit()
+    db.refresh(seller)
+    db.expunge(seller)
+    return seller
+
+
+@pytest.fixture
+def client(shop, session_factory):
+    app = FastAPI()
+    app.include_router(sellers.router)
+
+    def session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_approved_seller] = lambda: shop
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_rows_already_in_the_requested_state_are_not_updated(client, db, statements):
+    report = client.post("/sellers/orders/fulfillment", json={"updates": [
+        {"order_id": 1, "status": "shipped", "tracking_number": "TRACK-1"},
+        {"order_id": 2, "status": "shipped", "tracking_number": "TRACK-2"},  # Already so
+        {"order_id": 3, "tracking_number": "TRACK-3"},  # Already so
+        {"order_id": 404, "status": "shipped"},
+    ]}).json()
+
+    assert (report["updated"], report["failed"]) == (1, 1)
+    assert [result["updated"] for result in report["results"]] == [True, False, False, False]
+    assert [result.get("error") for result in report["results"]][:3] == [None, None, None]
+    assert [result["status"] for result in report["results"]][:3] == ["shipped", "shipped", "confirmed"]
+
+    updates = [statement for statement in statements if statement.startswith("UPDATE")]
+    assert len(updates) == 2  # Order 1's status and its tracking number
+    assert all("orders.id IN (?)" in statement for statement in updates)
+    assert [(order.status, order.tracking_number) for order in db.query(Order).order_by(Order.id)] == [
+        (OrderStatus.SHIPPED, "TRACK-1"), (OrderStatus.SHIPPED, "TRACK-2"), (OrderStatus.CONFIRMED, "TRACK-3")
+    ]
+
+
+def test_repeating_a_batch_updates_nothing(client, statements):
+    batch = {"updates": [{"order_id": 1, "status": "shipped", "tracking_number": "TRACK-1"}]}
+    assert client.post("/sellers/orders/fulfillment", json=batch).json()["updated"] == 1
+
+    statements.clear()
+    report = client.post("/sellers/orders/fulfillment", json=batch).json()
+    assert (report["updated"], report["failed"]) == (0, 0)
+    assert not any(statement.startswith("UPDATE") for statement in statements)
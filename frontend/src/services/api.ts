@@ -14,6 +14,11 @@ export const api: AxiosInstance = axios.create({
   },
 })
 
+// After a write the API returns X-Primary-Until; echoing it until then keeps
+// our reads on the primary database, so they see that write
+const PRIMARY_UNTIL_HEADER = 'X-Primary-Until'
+const PRIMARY_UNTIL_KEY = 'primary_until'
+
 // Add auth token to requests
 api.interceptors.request.use(
   (config: InternalAxiosRequestConfig) => {
@@ -23,13 +28,24 @@ api.interceptors.request.use(
       config.headers.Authorization = `Bearer ${token}`
     }
 
+    const primaryUntil = Number(localStorage.getItem(PRIMARY_UNTIL_KEY))
+    if (primaryUntil * 1000 > Date.now()) {
+      config.headers[PRIMARY_UNTIL_HEADER] = primaryUntil.toString()
+    }
+
     return config
   }
 )
 
 // Handle auth errors
 api.interceptors.response.use(
-  (response: AxiosResponse) => response,
+  (response: AxiosResponse) => {
+    const primaryUntil = response.headers[PRIMARY_UNTIL_HEADER.toLowerCase()]
+    if (primaryUntil) {
+      localStorage.setItem(PRIMARY_UNTIL_KEY, primaryUntil)
+    }
+    return response
+  },
   (error: any) => {
     if (error.response?.status === 401) {
       localStorage.removeItem('access_token')
@@ -1,4 +1,5 @@
 import api from './api'
+import { getCartToken } from './cartService'
 
 export interface LoginCredentials {
   email: string
@@ -25,7 +26,9 @@ export interface AuthResponse {
 
 export const authService = {
   async login(credentials: LoginCredentials): Promise<AuthResponse> {
-    const response = await api.post('/api/v1/auth/login', credentials)
+    const response = await api.post('/api/v1/auth/login', credentials, {
+      headers: { 'X-Cart-Token': getCartToken() },
+    })
     const data = response.data
     
     // Store token
@@ -1 +1,67 @@
-export {}
+import api from './api'
+
+export interface CartItem {
+  product_id: number
+  quantity: number
+  title?: string
+  thumbnail_url?: string
+  unit_price?: number
+  subtotal: number
+  available: boolean
+  in_stock: boolean
+}
+
+export interface Cart {
+  items: CartItem[]
+  item_count: number
+  total: number
+}
+
+const CART_TOKEN_KEY = 'cart_token'
+
+// Anonymous carts are identified by a random token kept in the browser;
+// it is sent on login so the server can merge the cart into the account
+export function getCartToken(): string {
+  let token = localStorage.getItem(CART_TOKEN_KEY)
+  if (!token) {
+    token = crypto.randomUUID()
+    localStorage.setItem(CART_TOKEN_KEY, token)
+  }
+  return token
+}
+
+const cartHeaders = () => ({ 'X-Cart-Token': getCartToken() })
+
+export const cartService = {
+  async getCart(): Promise<Cart> {
+    const response = await api.get('/api/v1/cart/', { headers: cartHeaders() })
+    return response.data
+  },
+
+  async addItem(productId: number, quantity = 1): Promise<Cart> {
+    const response = await api.post(
+      '/api/v1/cart/items',
+      { product_id: productId, quantity },
+      { headers: cartHeaders() }
+    )
+    return response.data
+  },
+
+  async updateItem(productId: number, quantity: number): Promise<Cart> {
+    const response = await api.put(
+      `/api/v1/cart/items/${productId}`,
+      { quantity },
+      { headers: cartHeaders() }
+    )
+    return response.data
+  },
+
+  async removeItem(productId: number): Promise<Cart> {
+    const response = await api.delete(`/api/v1/cart/items/${productId}`, { headers: cartHeaders() })
+    return response.data
+  },
+
+  async clearCart(): Promise<void> {
+    await api.delete('/api/v1/cart/', { headers: cartHeaders() })
+  }
+}
@@ -46,6 +46,8 @@ export interface ProductList {
   review_count: number
   is_featured: boolean
   created_at: string
+  wishlist_count: number
+  is_wishlisted?: boolean | null
 }
 
 export interface ProductCreate {
@@ -87,13 +89,33 @@ export interface ProductFileUpload {
   file_type: string
 }
 
+export interface ProductBatch {
+  products: Product[]
+  missing: number[]
+}
+
+export interface SignedDownloadURLs {
+  file_url?: string | null
+  preview_url?: string | null
+  sample_file_url?: string | null
+  expires_at: string
+}
+
+export interface Suggestion {
+  kind: 'product' | 'tag' | 'store'
+  text: string
+  product_id: number | null
+  seller_id: number | null
+}
+
 export interface ProductFilters {
   category?: string
   search?: string
-  sort_by?: 'created_at' | 'price' | 'sold_count' | 'rating'
+  sort_by?: 'created_at' | 'price' | 'sold_count' | 'rating' | 'trending'
   sort_order?: 'asc' | 'desc'
   skip?: number
   limit?: number
+  fields?: string[]
 }
 
 export const productService = {
@@ -102,6 +124,7 @@ export const productService = {
     
     if (filters?.skip) params.append('skip', filters.skip.toString())
     if (filters?.limit) params.append('limit', filters.limit.toString())
+    if (filters?.fields) params.append('fields', filters.fields.join(','))
     
     const response = await api.get(`/api/v1/products/me?${params}`)
     return response.data
@@ -116,16 +139,37 @@ export const productService = {
     if (filters?.sort_order) params.append('sort_order', filters.sort_order)
     if (filters?.skip) params.append('skip', filters.skip.toString())
     if (filters?.limit) params.append('limit', filters.limit.toString())
+    if (filters?.fields) params.append('fields', filters.fields.join(','))
     
     const response = await api.get(`/api/v1/products?${params}`)
     return response.data
   },
 
+  async suggest(q: string, limit = 10): Promise<Suggestion[]> {
+    const response = await api.get(`/api/v1/products/suggest?q=${encodeURIComponent(q)}&limit=${limit}`)
+    return response.data
+  },
+
   async getProduct(id: number): Promise<Product> {
     const response = await api.get(`/api/v1/products/${id}`)
     return response.data
   },
 
+  async getProductsBatch(ids: number[]): Promise<ProductBatch> {
+    const response = await api.get(`/api/v1/products/batch?ids=${ids.join(',')}`)
+    return response.data
+  },
+
+  async getRelatedProducts(id: number, limit = 10): Promise<ProductList[]> {
+    const response = await api.get(`/api/v1/products/${id}/related?limit=${limit}`)
+    return response.data
+  },
+
+  async getDownloadUrls(id: number): Promise<SignedDownloadURLs> {
+    const response = await api.get(`/api/v1/products/${id}/download-urls`)
+    return response.data
+  },
+
   async createProduct(
     productData: ProductCreate,
     file: File,
@@ -16,6 +16,8 @@ export interface SellerApplicationResponse {
   seller_address: string
   seller_tax_id?: string
   status: 'pending' | 'approved' | 'rejected'
+  applied_at?: string
+  decided_at?: string
   created_at: string
   updated_at?: string
 }
@@ -37,6 +39,57 @@ export interface SellerProfile {
   created_at: string
 }
 
+export type OrderStatus = 'pending' | 'confirmed' | 'shipped' | 'delivered' | 'cancelled'
+
+export interface SellerOrderItem {
+  id: number
+  product_id: number
+  product_name: string
+  product_price: number
+  quantity: number
+  total: number
+}
+
+export interface SellerOrder {
+  id: number
+  status: OrderStatus
+  buyer_id: number
+  buyer_name?: string
+  shipping_address?: string
+  tracking_number?: string
+  created_at: string
+  seller_total: number
+  items: SellerOrderItem[]
+}
+
+export interface SellerOrderPage {
+  orders: SellerOrder[]
+  next_cursor: string | null
+}
+
+export interface SellerOrderCounts {
+  total: number
+  by_status: Record<OrderStatus, { orders: number; revenue: number }>
+}
+
+export interface FulfillmentUpdate {
+  order_id: number
+  status?: OrderStatus
+  tracking_number?: string
+}
+
+export interface FulfillmentReport {
+  updated: number
+  failed: number
+  results: {
+    row: number
+    order_id: number | null
+    updated: boolean
+    status: OrderStatus | null
+    error: string | null
+  }[]
+}
+
 export const sellerService = {
   async applyAsSeller(application: SellerApplication): Promise<SellerApplicationResponse> {
     const response = await api.post('/api/v1/sellers/apply', application)
@@ -51,5 +104,43 @@ export const sellerService = {
   async getSellerProfile(): Promise<SellerProfile> {
     const response = await api.get('/api/v1/sellers/profile')
     return response.data
+  },
+
+  // Newest first; pass next_cursor back to load the following page
+  async getSellerOrders(params?: {
+    status?: OrderStatus
+    cursor?: string
+    limit?: number
+  }): Promise<SellerOrderPage> {
+    const response = await api.get('/api/v1/sellers/orders', { params })
+    return response.data
+  },
+
+  async getSellerOrderCounts(): Promise<SellerOrderCounts> {
+    const response = await api.get('/api/v1/sellers/orders/counts')
+    return response.data
+  },
+
+  async getSellerOrder(orderId: number): Promise<SellerOrder> {
+    const response = await api.get(`/api/v1/sellers/orders/${orderId}`)
+    return response.data
+  },
+
+  async bulkUpdateOrders(updates: FulfillmentUpdate[]): Promise<FulfillmentReport> {
+    const response = await api.post('/api/v1/sellers/orders/fulfillment', { updates })
+    return response.data
+  },
+
+  // CSV with an order_id column and status and/or tracking_number columns
+  async importFulfillmentCsv(file: File): Promise<FulfillmentReport> {
+    const formData = new FormData()
+    formData.append('file', file)
+    
+    const response = await api.post('/api/v1/sellers/orders/fulfillment/csv', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    })
+    return response.data
   }
 }
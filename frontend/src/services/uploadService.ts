@@ -0,0 +1,105 @@
+import api from './api'
+
+export interface UploadSession {
+  id: string
+  file_name: string
+  file_type: string
+  file_size: number
+  chunk_size: number
+  chunk_count: number
+  status: 'uploading' | 'complete'
+  offset: number
+  missing_chunks: number[]
+  expires_at: string
+  file_url: string | null
+}
+
+const PARALLEL_CHUNKS = 3
+const MAX_ATTEMPTS = 5
+const UPLOAD_ID_PREFIX = 'upload:'
+
+// Resumed uploads are found again by file identity
+function uploadKey(file: File): string {
+  return `${UPLOAD_ID_PREFIX}${file.name}:${file.size}:${file.lastModified}`
+}
+
+async function sha256Base64(data: ArrayBuffer): Promise<string> {
+  const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', data))
+  return btoa(String.fromCharCode(...digest))
+}
+
+export const uploadService = {
+  async startUpload(file: File): Promise<UploadSession> {
+    const savedId = localStorage.getItem(uploadKey(file))
+    if (savedId) {
+      try {
+        return await this.getUpload(savedId)
+      } catch {
+        localStorage.removeItem(uploadKey(file))
+      }
+    }
+
+    const response = await api.post('/api/v1/uploads/', {
+      file_name: file.name,
+      file_type: file.type,
+      file_size: file.size,
+    })
+    localStorage.setItem(uploadKey(file), response.data.id)
+    return response.data
+  },
+
+  async getUpload(id: string): Promise<UploadSession> {
+    const response = await api.get(`/api/v1/uploads/${id}`)
+    return response.data
+  },
+
+  async uploadChunk(session: UploadSession, file: File, index: number): Promise<void> {
+    const offset = index * session.chunk_size
+    const chunk = await file.slice(offset, offset + session.chunk_size).arrayBuffer()
+    const checksum = await sha256Base64(chunk)
+
+    for (let attempt = 1; ; attempt++) {
+      try {
+        await api.patch(`/api/v1/uploads/${session.id}`, chunk, {
+          headers: {
+            'Content-Type': 'application/offset+octet-stream',
+            'Upload-Offset': offset.toString(),
+            'Upload-Checksum': `sha256 ${checksum}`,
+          },
+        })
+        return
+      } catch (error) {
+        if (attempt >= MAX_ATTEMPTS) throw error
+        await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** attempt))
+      }
+    }
+  },
+
+  // Sends only the chunks the server is missing, a few at a time, then
+  // finalizes; pass the returned id as upload_id when creating the product
+  async uploadFile(
+    file: File,
+    onProgress?: (progress: number) => void
+  ): Promise<UploadSession> {
+    const session = await this.startUpload(file)
+    const pending = [...session.missing_chunks]
+    let done = session.chunk_count - pending.length
+
+    const worker = async () => {
+      for (let index = pending.shift(); index !== undefined; index = pending.shift()) {
+        await this.uploadChunk(session, file, index)
+        done++
+        onProgress?.(Math.round((done * 100) / session.chunk_count))
+      }
+    }
+    await Promise.all(Array.from({ length: PARALLEL_CHUNKS }, worker))
+
+    const response = await api.post(`/api/v1/uploads/${session.id}/finalize`)
+    localStorage.removeItem(uploadKey(file))
+    return response.data
+  },
+
+  async cancelUpload(id: string): Promise<void> {
+    await api.delete(`/api/v1/uploads/${id}`)
+  },
+}